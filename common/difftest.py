@@ -0,0 +1,84 @@
+import random
+import time
+
+# Differential testing shared by the game projects: the same cases are driven
+# through a reference engine and a candidate (faster) engine, any difference is
+# shrunk to a minimal repro. A case is a list of steps, check(case) returns None
+# when both engines agree or a description of the first difference.
+# Each project keeps its own generators, checkers and engines next to its game.
+
+class Report:
+    def __init__(self, cases, case=None, failure=None, seed=None):
+        self.cases = cases      # Number of cases tried
+        self.case = case        # Minimal failing case, None if every case agreed
+        self.failure = failure
+        self.seed = seed
+
+    def __bool__(self):
+        return self.case is None
+
+    def __repr__(self):
+        if self.case is None: return f"Report(passed {self.cases} cases, seed={self.seed})"
+        return f"Report(failed after {self.cases} cases, seed={self.seed}, case={self.case!r}, failure={self.failure!r})"
+
+def shrink(case, fails):
+    # Delta debugging: a smallest sublist of case for which fails() is still true,
+    # removing any single remaining step makes it pass
+    n = 2
+    while len(case) >= 2:
+        size = -(-len(case) // n)
+        chunks = [case[i:i + size] for i in range(0, len(case), size)]
+        for i in range(len(chunks)):
+            complement = [step for j, chunk in enumerate(chunks) if j != i for step in chunk]
+            if fails(complement):
+                case = complement
+                n = max(n - 1, 2)
+                break
+        else:
+            if n >= len(case): break
+            n = min(len(case), n * 2)
+    return case
+
+def fuzz(generate, check, budget=5.0, seed=None, max_cases=None, minimize=shrink):
+    # Runs generate(rng) -> case through check until the time budget (seconds)
+    # runs out or a case fails, the failing case is shrunk with minimize(case, fails)
+    # before it is reported
+    seed = seed if seed is not None else random.randrange(1 << 32)
+    rng = random.Random(seed)
+    deadline = time.monotonic() + budget
+    cases = 0
+    while time.monotonic() < deadline and (max_cases is None or cases < max_cases):
+        case = generate(rng)
+        cases += 1
+        if check(case) is not None:
+            case = minimize(case, lambda c: check(c) is not None)
+            return Report(cases, case, check(case), seed)
+    return Report(cases, seed=seed)
+
+def trace(engine, moves, observe):
+    # What an engine does with each move: legality (or the exception raised) and
+    # the observation after it
+    steps = []
+    for move in moves:
+        try:
+            legal = bool(engine.is_legal(move))
+        except Exception as e:
+            legal = type(e).__name__
+        if legal is True:
+            engine.move(move)
+        steps.append((move, legal, observe(engine)))
+    return steps
+
+def compare(reference, candidate):
+    # None if two traces agree, otherwise the first difference. An observation
+    # only one side makes is a difference too
+    for i, (ref, cand) in enumerate(zip(reference, candidate)):
+        if ref[1] != cand[1]:
+            return f"step {i} {ref[0]!r}: reference legal={ref[1]}, candidate legal={cand[1]}"
+        for key in sorted(ref[2].keys() ^ cand[2].keys()):
+            side = "candidate" if key in ref[2] else "reference"
+            return f"step {i} {ref[0]!r}: {side} has no {key}"
+        for key in ref[2].keys():
+            if ref[2][key] != cand[2][key]:
+                return f"step {i} {ref[0]!r}: reference {key}={ref[2][key]!r}, candidate {key}={cand[2][key]!r}"
+    return None
@@ -0,0 +1,43 @@
+import json
+import os
+
+# Helpers shared by the LLM graders of the game projects (sticks/game/grade.py,
+# connect-four/game/src/grade.py)
+
+def iter_json_array(path, chunk_size=1 << 16):
+    # Yields the items of a JSON array file one at a time without loading the whole file
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as file:
+        buffer = file.read(chunk_size).lstrip()
+        if not buffer.startswith("["): raise ValueError(f"{path} is not a JSON array")
+        buffer = buffer[1:]
+        eof = False
+        while True:
+            buffer = buffer.lstrip()
+            if buffer.startswith(","): buffer = buffer[1:].lstrip()
+            if buffer.startswith("]"): return
+            try:
+                (item, end) = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                end = None
+            # A value touching the end of the buffer may continue in the next chunk
+            if end is not None and (end < len(buffer) or eof):
+                yield item
+                buffer = buffer[end:]
+                continue
+            if eof: raise ValueError(f"{path} is not a complete JSON array")
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+
+def save_reports(reports, output, root, error_classes):
+    # Writes the grade_file reports to output and prints one summary line per file
+    with open(output, "w") as file:
+        json.dump(reports, file, indent=2)
+
+    print(f"{'File':<45} {'N':>4} {'Acc':>6} {'Illegal':>8}  " + " ".join(f"{name[:9]:>9}" for name in error_classes))
+    for report in reports:
+        name = os.path.relpath(report["file"], root)
+        print(f"{name:<45} {report['responses']:>4} {report['accuracy']:>6.1%} {report['illegal_rate']:>8.1%}  " +
+              " ".join(f"{report['classes'][c]:>9}" for c in error_classes))
+    print(f"\nSaved {len(reports)} reports to {output}")
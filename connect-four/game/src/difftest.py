@@ -0,0 +1,164 @@
+import argparse
+import os
+import sys
+from game import Connect_Four_Game
+from solver import Connect_Four_Solver
+from vec_env import Connect_Four_Vec_Env
+# Code shared by the game projects lives in common/ at the root of the repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from common.difftest import compare, fuzz, trace
+
+# Fuzzes the fast Connect Four engines against Connect_Four_Game, see common/difftest.py
+
+# ==== Connect Four engines ====
+
+def format_state(pieces, num_rows, num_cols):
+    # Connect_Four_Game.state() from the bitboards {player: pieces} (columns of num_rows + 1 bits)
+    rows = []
+    for r in reversed(range(num_rows)):
+        row = ""
+        for c in range(num_cols):
+            bit = 1 << (c * (num_rows + 1) + r)
+            row += next((str(player) for player, board in pieces.items() if board & bit), "0")
+        rows.append(row)
+    return f"[{';'.join(rows)}]"
+
+def record(game, col):
+    # Connect_Four_Game's history lines for the move just played
+    game.history.append(f"{game.turn}) P{2 - game.turn % 2}: {col} -> {game.state()}")
+    if game.is_over(): game.history.append(f"Game over, {game.result}")
+
+class Solver_Connect_Four_Game:
+    # Connect_Four_Game played on the solver's bitboards
+    def __init__(self, num_rows=6, num_cols=7):
+        self.solver = Connect_Four_Solver(num_rows, num_cols)
+        self.position = 0  # Pieces of the player to move
+        self.mask = 0
+        self.turn = 0
+        self.result = None
+        self.history = ["Game start"]
+
+    def state(self):
+        (to_move, other) = (1, 2) if self.turn % 2 == 0 else (2, 1)
+        pieces = {to_move: self.position, other: self.position ^ self.mask}
+        return format_state(pieces, self.solver.ROW_COUNT, self.solver.COLUMN_COUNT)
+
+    def is_over(self):
+        return self.result is not None
+
+    def is_legal(self, col):
+        return 0 <= col < self.solver.COLUMN_COUNT and self.solver.can_play(self.mask, col)
+
+    def move(self, col):
+        won = self.solver.is_winning_move(self.position, self.mask, col)
+        (self.position, self.mask) = self.solver.play(self.position, self.mask, col)
+        self.turn += 1
+        if won:
+            self.result = f"Player {2 - self.turn % 2} Wins"
+        elif self.turn == self.solver.ROW_COUNT * self.solver.COLUMN_COUNT:
+            self.result = "Draw"
+        record(self, col)
+
+class Vec_Connect_Four_Game:
+    # One lane of Connect_Four_Vec_Env behind the Connect_Four_Game interface
+    def __init__(self, num_rows=6, num_cols=7):
+        self.env = Connect_Four_Vec_Env(1, num_rows, num_cols)
+        self.env.reset()
+        self.turn = 0
+        self.final = None  # The env restarts finished games, their last state is kept here
+        self.result = None
+        self.history = ["Game start"]
+
+    def state(self):
+        return self.final or self.env.states()[0]
+
+    def is_over(self):
+        return self.result is not None
+
+    def is_legal(self, col):
+        return 0 <= col < self.env.COLUMN_COUNT and bool(self.env.action_mask()[0, col])
+
+    def move(self, col):
+        (_, rewards, terminated, _, info) = self.env.step([col])
+        self.turn += 1
+        if terminated[0]: self.finish(rewards, info)
+        record(self, col)
+
+    def finish(self, rewards, info):
+        # Planes of the player to move next and of the player that just moved
+        mover = 2 - self.turn % 2
+        (own, other) = info["final_observations"][0]
+        rows = ["".join(str(3 - mover) if own[r, c] else str(mover) if other[r, c] else "0"
+                        for c in range(self.env.COLUMN_COUNT)) for r in reversed(range(self.env.ROW_COUNT))]
+        self.final = f"[{';'.join(rows)}]"
+        self.result = f"Player {mover} Wins" if rewards[0] > 0 else "Draw"
+
+def result(game):
+    if not game.is_over(): return None
+    # Connect_Four_Game only writes the result to its history, Ex. "Game over, Player 1 Wins"
+    if hasattr(game, "result"): return game.result
+    return game.history[-1].removeprefix("Game over, ")
+
+def observe_connect_four(game):
+    observation = {"state": game.state(), "over": bool(game.is_over()), "result": result(game)}
+    if hasattr(game, "history"): observation["history"] = list(game.history)
+    return observation
+
+def connect_four_generator(num_rows=6, num_cols=7, length=None):
+    # Random games, biased towards the edges of the rules: long games that fill
+    # columns and the board, full columns and columns off the board
+    length = length or num_rows * num_cols
+    def generate(rng):
+        game = Connect_Four_Game(num_rows, num_cols)
+        moves = []
+        # Some games stack a few columns first to reach full columns sooner
+        favorites = rng.sample(range(num_cols), rng.randrange(1, num_cols + 1))
+        while len(moves) < length and not game.is_over():
+            roll = rng.random()
+            if roll < 0.1:
+                col = rng.choice([-1, num_cols, num_cols + 5, -num_cols])
+            elif roll < 0.5:
+                col = rng.choice(favorites)
+            else:
+                col = rng.randrange(num_cols)
+            moves.append(col)
+            if game.is_legal(col): game.move(col)
+        return moves
+    return generate
+
+def connect_four_checker(candidate, num_rows=6, num_cols=7):
+    # Cases are lists of 0 indexed columns from an empty board
+    # Connect_Four_Game does not stop taking moves once the game is over, so
+    # moves after the end of the game are not compared
+    def check(moves):
+        reference = trace(Connect_Four_Game(num_rows, num_cols), moves, observe_connect_four)
+        end = next((i + 1 for i, step in enumerate(reference) if step[2]["over"]), len(moves))
+        return compare(reference[:end], trace(candidate(num_rows, num_cols), moves[:end], observe_connect_four))
+    return check
+
+def fuzz_connect_four(candidate, num_rows=6, num_cols=7, budget=5.0, seed=None):
+    return fuzz(connect_four_generator(num_rows, num_cols), connect_four_checker(candidate, num_rows, num_cols), budget, seed)
+
+ENGINES = {
+    "solver": Solver_Connect_Four_Game,
+    "vec": Vec_Connect_Four_Game,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Fuzz fast Connect Four engines against Connect_Four_Game")
+    parser.add_argument("--engine", choices=ENGINES.keys(), nargs="*", default=list(ENGINES.keys()))
+    parser.add_argument("--rows", type=int, default=6)
+    parser.add_argument("--cols", type=int, default=7)
+    parser.add_argument("--budget", type=float, default=5.0, help="Seconds per engine")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    failed = False
+    for name in args.engine:
+        report = fuzz_connect_four(ENGINES[name], args.rows, args.cols, args.budget, args.seed)
+        print(f"{name}: {report}")
+        failed = failed or not report
+    exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -38,7 +38,7 @@ class Connect_Four_Game:
     def is_legal(self, col):
         #if this condition is true we will let the use drop piece here.
         #if not true that means the col is not vacant
-        return col < self.COLUMN_COUNT and self.board[5][col] == 0
+        return 0 <= col < self.COLUMN_COUNT and self.board[self.ROW_COUNT - 1][col] == 0
     
     def get_next_open_row(self, col):
         for r in range(self.ROW_COUNT):
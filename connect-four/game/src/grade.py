@@ -0,0 +1,90 @@
+import argparse
+import glob
+import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import solver
+# Code shared by the game projects lives in common/ at the root of the repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from common.grading import iter_json_array, save_reports
+
+# Game state and player to move given in the prompt of each llm-tests folder, see ../../README.md
+STATES = {
+    "one-step": ("[0202200;0101100;0101100;0201100;0122202;2211202]", 1),
+}
+
+# Error classes, in the order they are reported
+OPTIMAL = "optimal"        # One of the solver's best moves
+SLOWER = "slower"          # Keeps the outcome but takes longer to win (or loses sooner)
+BLUNDER = "blunder"        # Legal, but gives away a win or a draw
+ILLEGAL = "illegal"        # A column that is full or off the board
+UNPARSABLE = "unparsable"  # No column found in the response
+ERROR_CLASSES = [OPTIMAL, SLOWER, BLUNDER, ILLEGAL, UNPARSABLE]
+
+MOVE_PATTERN = re.compile(r"\d+")
+
+def parse_move(text):
+    # Extracts a column (1-7, as written in the prompt) from a response, Ex. "Column 3" -> 3
+    if isinstance(text, int): return text
+    if not isinstance(text, str): return None
+    match = MOVE_PATTERN.search(text)
+    return int(match.group()) if match else None
+
+def classify(state, player, column):
+    if column is None: return UNPARSABLE
+    scores = solver.move_scores(state, player)
+    col = column - 1
+    if col not in scores: return ILLEGAL
+    best = max(scores.values())
+    if scores[col] == best: return OPTIMAL
+    # Same sign means the same outcome, only slower
+    if (scores[col] > 0) - (scores[col] < 0) == (best > 0) - (best < 0): return SLOWER
+    return BLUNDER
+
+def grade_file(path, state, player):
+    classes = Counter()
+    moves = Counter()
+    for response in iter_json_array(path):
+        column = parse_move(response.get("primary_move") if isinstance(response, dict) else None)
+        classes[classify(state, player, column)] += 1
+        moves[str(column) if column is not None else "(none)"] += 1
+
+    total = sum(classes.values())
+    return {
+        "file": path,
+        "state": state,
+        "player": player,
+        "responses": total,
+        "accuracy": classes[OPTIMAL] / total if total else 0,
+        "illegal_rate": classes[ILLEGAL] / total if total else 0,
+        "classes": {name: classes[name] for name in ERROR_CLASSES},
+        "best_moves": [col + 1 for col in solver.best_moves(state, player)],
+        "moves": dict(moves.most_common()),
+    }
+
+def find_files(root):
+    # (path, state, player) for every results file under root/<test folder>/
+    files = []
+    for folder, (state, player) in STATES.items():
+        for path in sorted(glob.glob(os.path.join(root, folder, "*.json"))):
+            files.append((path, state, player))
+    return files
+
+def main():
+    parser = argparse.ArgumentParser(description="Grade LLM results against the Connect Four solver")
+    parser.add_argument("root", nargs="?", default=os.path.join(os.path.dirname(__file__), "..", "..", "llm-tests"))
+    parser.add_argument("--output", default="grades.json")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    files = find_files(args.root)
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(grade_file, path, state, player) for path, state, player in files]
+        reports = [future.result() for future in futures]
+
+    save_reports(reports, args.output, args.root, ERROR_CLASSES)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import argparse
+from functools import lru_cache
+
+# Negamax Connect Four solver on bitboards, adapted from Pascal Pons' solver:
+# http://blog.gamesolver.org
+# Each column takes ROW_COUNT + 1 bits, the extra bit stays empty so shifts
+# never carry a line from one column into the next.
+# Scores are from the point of view of the player to move: positive wins,
+# negative loses and 0 draws. The sooner the win the bigger the score.
+class Connect_Four_Solver:
+    def __init__(self, num_rows=6, num_cols=7):
+        self.ROW_COUNT = num_rows
+        self.COLUMN_COUNT = num_cols
+        self.H1 = num_rows + 1
+        # Explore center columns first, they are most often best
+        center = num_cols // 2
+        self.order = sorted(range(num_cols), key=lambda c: abs(c - center))
+        self.table = {}
+
+    def parse(self, state, to_move=None):
+        # "[row;row;...]" top row first, as written by Connect_Four_Game.state()
+        # Returns (position, mask, moves) where position holds the pieces of the player to move
+        rows = [row for row in state.strip().strip("[]").split(";") if row]
+        if len(rows) != self.ROW_COUNT or any(len(row) != self.COLUMN_COUNT for row in rows):
+            raise ValueError(f"Invalid Connect Four state: {state}")
+        counts = {"1": 0, "2": 0}
+        pieces = {"1": 0, "2": 0}
+        for r, row in enumerate(reversed(rows)):
+            for c, cell in enumerate(row):
+                if cell in pieces:
+                    pieces[cell] |= 1 << (c * self.H1 + r)
+                    counts[cell] += 1
+        if to_move is None:
+            to_move = 1 if counts["1"] <= counts["2"] else 2
+        position = pieces[str(to_move)]
+        mask = pieces["1"] | pieces["2"]
+        return (position, mask, counts["1"] + counts["2"])
+
+    def top_mask(self, col):
+        return 1 << (self.ROW_COUNT - 1 + col * self.H1)
+
+    def bottom_mask_col(self, col):
+        return 1 << (col * self.H1)
+
+    def column_mask(self, col):
+        return ((1 << self.ROW_COUNT) - 1) << (col * self.H1)
+
+    def can_play(self, mask, col):
+        return (mask & self.top_mask(col)) == 0
+
+    def play(self, position, mask, col):
+        # Returns the new (position, mask), position now belongs to the other player
+        return (position ^ mask, mask | (mask + self.bottom_mask_col(col)))
+
+    def is_win(self, position):
+        H1 = self.H1
+        # Horizontal, vertical and both diagonals
+        for shift in (H1, 1, H1 - 1, H1 + 1):
+            m = position & (position >> shift)
+            if m & (m >> (2 * shift)):
+                return True
+        return False
+
+    def is_winning_move(self, position, mask, col):
+        # Adding the bottom bit carries up to the first empty cell of the column
+        pos = position | ((mask + self.bottom_mask_col(col)) & self.column_mask(col))
+        return self.is_win(pos)
+
+    def negamax(self, position, mask, moves, alpha, beta):
+        size = self.ROW_COUNT * self.COLUMN_COUNT
+        if moves == size:
+            return 0
+
+        for col in range(self.COLUMN_COUNT):
+            if self.can_play(mask, col) and self.is_winning_move(position, mask, col):
+                return (size + 1 - moves) // 2
+
+        # Can not win next move, so the best possible score is a win one move later
+        max_score = (size - 1 - moves) // 2
+        key = position + mask
+        if key in self.table:
+            max_score = self.table[key]
+        if beta > max_score:
+            beta = max_score
+            if alpha >= beta:
+                return beta
+
+        for col in self.order:
+            if self.can_play(mask, col):
+                (new_position, new_mask) = self.play(position, mask, col)
+                score = -self.negamax(new_position, new_mask, moves + 1, -beta, -alpha)
+                if score >= beta:
+                    return score
+                if score > alpha:
+                    alpha = score
+
+        # alpha is an upper bound of the score of this position
+        self.table[key] = alpha
+        return alpha
+
+    def solve(self, position, mask, moves, weak=False):
+        # Exact score, or only its sign (-1, 0, 1) with weak
+        size = self.ROW_COUNT * self.COLUMN_COUNT
+        if weak:
+            (low, high) = (-1, 1)
+        else:
+            (low, high) = (-(size - moves) // 2, (size + 1 - moves) // 2)
+        # Null window searches, narrowing [low, high] until it holds one score
+        while low < high:
+            middle = low + (high - low) // 2
+            if middle <= 0 and int(low / 2) < middle:
+                middle = int(low / 2)
+            elif middle >= 0 and int(high / 2) > middle:
+                middle = int(high / 2)
+            score = self.negamax(position, mask, moves, middle, middle + 1)
+            if score <= middle:
+                high = score
+            else:
+                low = score
+        return low
+
+    def move_scores(self, state, to_move=None, weak=False):
+        # {column: score} for every legal column (0 indexed), from the mover's point of view
+        (position, mask, moves) = self.parse(state, to_move)
+        size = self.ROW_COUNT * self.COLUMN_COUNT
+        scores = {}
+        for col in range(self.COLUMN_COUNT):
+            if not self.can_play(mask, col):
+                continue
+            if self.is_winning_move(position, mask, col):
+                score = (size + 1 - moves) // 2
+            else:
+                (new_position, new_mask) = self.play(position, mask, col)
+                score = -self.solve(new_position, new_mask, moves + 1, weak)
+            scores[col] = max(-1, min(1, score)) if weak else score
+        return scores
+
+@lru_cache(maxsize=None)
+def move_scores(state, to_move=None, weak=False):
+    return Connect_Four_Solver().move_scores(state, to_move, weak)
+
+def best_moves(state, to_move=None):
+    # Columns (0 indexed) with the best score
+    # Ex. best_moves("[0202200;0101100;0101100;0201100;0122202;2211202]") -> [2]
+    scores = move_scores(state, to_move)
+    if not scores: return []
+    best = max(scores.values())
+    return [col for col, score in scores.items() if score == best]
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve a Connect Four state")
+    parser.add_argument("state", help="Game state as [row;row;...], top row first")
+    parser.add_argument("--player", type=int, choices=[1, 2], help="Player to move, counted from the pieces if not given")
+    parser.add_argument("--weak", action="store_true", help="Only find win/draw/loss")
+    args = parser.parse_args()
+
+    scores = move_scores(args.state, args.player, args.weak)
+    best = max(scores.values()) if scores else None
+    for col, score in scores.items():
+        result = "Win" if score > 0 else "Loss" if score < 0 else "Draw"
+        print(f"{col + 1}: {result} ({score})" + (" (best)" if score == best else ""))
+
+if __name__ == "__main__":
+    main()
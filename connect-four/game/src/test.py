@@ -0,0 +1,195 @@
+import random
+import unittest
+from functools import lru_cache
+import numpy as np
+import difftest
+from game import Connect_Four_Game
+import solver
+from solver import Connect_Four_Solver
+from vec_env import Connect_Four_Vec_Env
+
+def play(moves, num_rows=6, num_cols=7):
+    # Connect_Four_Game.state() after 0 indexed columns from an empty board
+    game = Connect_Four_Game(num_rows, num_cols)
+    for col in moves:
+        game.move(col)
+    return game.state()
+
+def brute_force_score(moves, num_rows, num_cols):
+    # The solver's score of a position by plain minimax over the columns as lists,
+    # without bitboards, pruning or the transposition table
+    size = num_rows * num_cols
+
+    def wins(columns, col):
+        # Does the piece just dropped in col connect four
+        (row, piece) = (len(columns[col]) - 1, columns[col][-1])
+        def cell(c, r):
+            return columns[c][r] if 0 <= c < num_cols and 0 <= r < len(columns[c]) else None
+        for (dc, dr) in ((1, 0), (0, 1), (1, 1), (1, -1)):
+            count = 1
+            for sign in (1, -1):
+                (c, r) = (col + sign * dc, row + sign * dr)
+                while cell(c, r) == piece:
+                    count += 1
+                    (c, r) = (c + sign * dc, r + sign * dr)
+            if count >= 4: return True
+        return False
+
+    @lru_cache(maxsize=None)
+    def score(columns, played):
+        if played == size: return 0
+        best = -size
+        for col in range(num_cols):
+            if len(columns[col]) == num_rows: continue
+            child = tuple(column + (played % 2,) if c == col else column for c, column in enumerate(columns))
+            if wins(child, col): return (size + 1 - played) // 2
+            best = max(best, -score(child, played + 1))
+        return best
+
+    columns = [()] * num_cols
+    for i, col in enumerate(moves):
+        columns[col] += (i % 2,)
+    return score(tuple(columns), len(moves))
+
+class Test_Connect_Four_Solver(unittest.TestCase):
+    def test_immediate_win(self):
+        # Player 1 has three in column 0
+        (position, mask, moves) = Connect_Four_Solver().parse(play([0, 1, 0, 1, 0, 2]))
+        self.assertEqual(moves, 6)
+        s = Connect_Four_Solver()
+        self.assertTrue(s.is_winning_move(position, mask, 0))
+        self.assertFalse(s.is_winning_move(position, mask, 3))
+        # Winning with the 4th piece of 42: (42 + 1 - 6) // 2
+        self.assertEqual(s.solve(position, mask, moves), 18)
+
+    def test_forced_block(self):
+        # Player 2 must block column 0, anything else loses to the 4th piece there
+        scores = Connect_Four_Solver(4, 5).move_scores(play([0, 1, 0, 1, 0], 4, 5))
+        self.assertGreater(scores[0], -7)
+        for col in (1, 2, 3, 4):
+            self.assertEqual(scores[col], -7)
+
+    def test_full_column(self):
+        scores = Connect_Four_Solver(4, 4).move_scores(play([0, 0, 0, 0], 4, 4))
+        self.assertNotIn(0, scores)
+
+    def test_empty_board(self):
+        # 4x4 and 5 rows by 4 columns are draws with best play
+        self.assertEqual(Connect_Four_Solver(4, 4).move_scores(play([], 4, 4)), {0: 0, 1: 0, 2: 0, 3: 0})
+        self.assertEqual(max(Connect_Four_Solver(5, 4).move_scores(play([], 5, 4)).values()), 0)
+
+    def test_grader_position(self):
+        # The one-step position of llm-tests, only column 3 (0 indexed 2) wins
+        state = "[0202200;0101100;0101100;0201100;0122202;2211202]"
+        self.assertEqual(solver.best_moves(state, 1), [2])
+        self.assertGreater(solver.move_scores(state, 1)[2], 0)
+
+    def test_matches_brute_force(self):
+        rng = random.Random(0)
+        for _ in range(20):
+            game = Connect_Four_Game(4, 4)
+            moves = []
+            while len(moves) < 6:
+                col = rng.randrange(4)
+                if not game.is_legal(col): continue
+                game.move(col)
+                moves.append(col)
+                if game.is_over(): break
+            if game.is_over(): continue
+            s = Connect_Four_Solver(4, 4)
+            (position, mask, played) = s.parse(game.state())
+            self.assertEqual(s.solve(position, mask, played), brute_force_score(moves, 4, 4), moves)
+
+class Test_Connect_Four_Vec_Env(unittest.TestCase):
+    def test_reset(self):
+        env = Connect_Four_Vec_Env(3)
+        observations = env.reset()
+        self.assertEqual(observations.shape, (3, 2, 6, 7))
+        self.assertFalse(observations.any())
+        self.assertTrue(env.action_mask().all())
+        self.assertEqual(list(env.players()), [1, 1, 1])
+
+    def test_step(self):
+        env = Connect_Four_Vec_Env(2)
+        env.reset()
+        (observations, rewards, terminated, _, _) = env.step([3, 0])
+        self.assertEqual(list(rewards), [0, 0])
+        self.assertFalse(terminated.any())
+        # The piece just played belongs to the opponent of the player to move, bottom row first
+        self.assertEqual(observations[0, 1, 0, 3], 1)
+        self.assertEqual(observations[1, 1, 0, 0], 1)
+        self.assertFalse(observations[:, 0].any())
+        self.assertEqual(list(env.players()), [2, 2])
+        self.assertEqual(env.states(), [play([3]), play([0])])
+
+    def test_win(self):
+        # Player 1 stacks column 0, player 2 column 1, both lanes see the same game
+        env = Connect_Four_Vec_Env(2)
+        env.reset()
+        for col in [0, 1, 0, 1, 0, 1]:
+            (_, rewards, terminated, _, _) = env.step([col, col])
+            self.assertFalse(terminated.any())
+        (observations, rewards, terminated, _, info) = env.step([0, 2])
+        self.assertEqual(list(rewards), [1, 0])
+        self.assertEqual(list(terminated), [True, False])
+        # The finished game restarts, its last board is kept in info
+        self.assertEqual(info["final_observations"].shape, (1, 2, 6, 7))
+        self.assertEqual(info["final_observations"][0, 1, :4, 0].tolist(), [1, 1, 1, 1])
+        self.assertFalse(observations[0].any())
+        self.assertEqual(env.states()[1], play([0, 1, 0, 1, 0, 1, 2]))
+
+    def test_draw(self):
+        # A 4x4 board filled without four in a row
+        moves = [1, 2, 0, 1, 2, 2, 0, 1, 1, 2, 3, 3, 3, 0, 0, 3]
+        game = Connect_Four_Game(4, 4)
+        for col in moves: game.move(col)
+        self.assertEqual(game.history[-1], "Game over, Draw")
+        env = Connect_Four_Vec_Env(1, 4, 4)
+        env.reset()
+        for col in moves[:-1]:
+            self.assertFalse(env.step([col])[2][0])
+        (_, rewards, terminated, _, info) = env.step([moves[-1]])
+        self.assertTrue(terminated[0] and info["draw"][0])
+        self.assertEqual(rewards[0], 0)
+
+    def test_illegal_columns(self):
+        env = Connect_Four_Vec_Env(4, 4, 4)
+        env.reset()
+        for _ in range(4):
+            env.step([0, 1, 2, 3])
+        self.assertEqual(env.action_mask().tolist(), [[False, True, True, True], [True, False, True, True],
+                                                      [True, True, False, True], [True, True, True, False]])
+        # A full column, off the board on both sides and a legal column
+        (_, rewards, terminated, _, info) = env.step([0, -1, 4, 0])
+        self.assertEqual(rewards.tolist(), [-1, -1, -1, 0])
+        self.assertEqual(terminated.tolist(), [True, True, True, False])
+        self.assertEqual(info["illegal"].tolist(), [True, True, True, False])
+        self.assertEqual(env.turns.tolist(), [0, 0, 0, 5])
+
+    def test_sample_actions(self):
+        env = Connect_Four_Vec_Env(200, seed=0)
+        env.reset()
+        for _ in range(60):
+            actions = env.sample_actions()
+            self.assertTrue(env.action_mask()[np.arange(200), actions].all())
+            self.assertFalse(env.step(actions)[4]["illegal"].any())
+
+class Test_Difftest(unittest.TestCase):
+    def test_fast_engines_match(self):
+        for engine in difftest.ENGINES.values():
+            report = difftest.fuzz_connect_four(engine, 4, 5, budget=0.5, seed=0)
+            self.assertTrue(report, report)
+
+    def test_history_is_compared(self):
+        class Broken(difftest.Solver_Connect_Four_Game):
+            # Plays right but its history has no "Game start"
+            def __init__(self, num_rows=6, num_cols=7):
+                super().__init__(num_rows, num_cols)
+                self.history = []
+        report = difftest.fuzz_connect_four(Broken, 4, 5, budget=5, seed=0)
+        self.assertFalse(report)
+        self.assertEqual(len(report.case), 1)
+        self.assertIn("history", report.failure)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import time
+import numpy as np
+
+class Connect_Four_Vec_Env:
+    # K Connect Four games stepped together, Gym style, with the rules of Connect_Four_Game
+    # Boards are bitboards like solver.py, one uint64 per game for the pieces of
+    # the player to move and one for all pieces, so every game steps in the same
+    # few array operations. Observations are (K, 2, rows, cols) planes, the
+    # first for the player to move and the second for the opponent, bottom row first
+    # Actions are 0 indexed columns
+    def __init__(self, num_envs, num_rows=6, num_cols=7, seed=None):
+        if num_cols * (num_rows + 1) > 64:
+            raise ValueError("Board does not fit in 64 bits")
+        self.num_envs = num_envs
+        self.ROW_COUNT = num_rows
+        self.COLUMN_COUNT = num_cols
+        self.H1 = np.uint64(num_rows + 1)
+        self.rng = np.random.default_rng(seed)
+
+        self.positions = np.zeros(num_envs, dtype=np.uint64)
+        self.masks = np.zeros(num_envs, dtype=np.uint64)
+        self.heights = np.zeros((num_envs, num_cols), dtype=np.int64)
+        self.turns = np.zeros(num_envs, dtype=np.int64)
+        # Bit of every cell, in observation order
+        self.cell_bits = np.array([[1 << (c * (num_rows + 1) + r) for c in range(num_cols)]
+                                   for r in range(num_rows)], dtype=np.uint64)
+        self.shifts = [np.uint64(s) for s in (num_rows + 1, 1, num_rows, num_rows + 2)]
+
+    def reset(self):
+        self.positions[:] = 0
+        self.masks[:] = 0
+        self.heights[:] = 0
+        self.turns[:] = 0
+        return self.observe()
+
+    def observe(self):
+        own = (self.positions[:, None, None] & self.cell_bits) != 0
+        other = ((self.positions ^ self.masks)[:, None, None] & self.cell_bits) != 0
+        return np.stack([own, other], axis=1).astype(np.int8)
+
+    def players(self):
+        # 1 or 2, the Connect_Four_Game player to move in each game
+        return (self.turns % 2 + 1).astype(np.int8)
+
+    def action_mask(self):
+        # (K, cols) bool, True where the column is not full
+        return self.heights < self.ROW_COUNT
+
+    def is_win(self, pieces):
+        won = np.zeros(pieces.shape, dtype=bool)
+        for shift in self.shifts:
+            m = pieces & (pieces >> shift)
+            won |= (m & (m >> (shift * np.uint64(2)))) != 0
+        return won
+
+    def step(self, actions):
+        # Plays actions[i] in game i
+        # Returns (observations, rewards, terminated, truncated, info) where
+        # rewards are for the player that just moved: 1 for connecting four,
+        # -1 for a full or missing column (which also ends the game) and 0 otherwise.
+        # Finished games are reset, info["final_observations"] holds their last board
+        actions = np.asarray(actions, dtype=np.int64)
+        rows = np.arange(self.num_envs)
+        in_range = (actions >= 0) & (actions < self.COLUMN_COUNT)
+        columns = np.where(in_range, actions, 0)
+        heights = self.heights[rows, columns]
+        illegal = ~in_range | (heights >= self.ROW_COUNT)
+
+        bits = np.where(illegal, 0, self.cell_bits[np.minimum(heights, self.ROW_COUNT - 1), columns])
+        pieces = self.positions | bits
+        self.masks |= bits
+        self.heights[rows, columns] += ~illegal
+        self.turns += ~illegal
+
+        won = self.is_win(pieces) & ~illegal
+        draw = (self.turns == self.ROW_COUNT * self.COLUMN_COUNT) & ~won & ~illegal
+        rewards = won.astype(np.float32) - illegal.astype(np.float32)
+        terminated = won | illegal | draw
+        truncated = np.zeros(self.num_envs, dtype=bool)
+
+        # The other player moves next, from their side the board is flipped
+        self.positions = np.where(illegal, self.positions, pieces ^ self.masks)
+        info = {"illegal": illegal, "draw": draw}
+        if terminated.any():
+            info["final_observations"] = self.observe()[terminated]
+            self.positions[terminated] = 0
+            self.masks[terminated] = 0
+            self.heights[terminated] = 0
+            self.turns[terminated] = 0
+        return (self.observe(), rewards, terminated, truncated, info)
+
+    def states(self):
+        # Connect_Four_Game.state() of every game, for debugging
+        states = []
+        players = self.players()
+        for i in range(self.num_envs):
+            own = (int(self.positions[i]), players[i])
+            other = (int(self.positions[i] ^ self.masks[i]), 3 - players[i])
+            rows = []
+            for r in reversed(range(self.ROW_COUNT)):
+                row = ""
+                for c in range(self.COLUMN_COUNT):
+                    bit = int(self.cell_bits[r, c])
+                    row += str(own[1]) if own[0] & bit else str(other[1]) if other[0] & bit else "0"
+                rows.append(row)
+            states.append(f"[{';'.join(rows)}]")
+        return states
+
+    def sample_actions(self):
+        # A uniformly random legal column for every game
+        mask = self.action_mask()
+        scores = self.rng.random(mask.shape) * mask
+        return scores.argmax(axis=1)
+
+def benchmark(num_envs=100000, steps=100):
+    env = Connect_Four_Vec_Env(num_envs, seed=0)
+    env.reset()
+    start = time.perf_counter()
+    for _ in range(steps):
+        env.step(env.sample_actions())
+    elapsed = time.perf_counter() - start
+    print(f"{num_envs * steps / elapsed:,.0f} steps per second ({num_envs} games)")
+
+if __name__ == "__main__":
+    benchmark()
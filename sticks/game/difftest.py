@@ -0,0 +1,162 @@
+import argparse
+import os
+import sys
+from sticks import Sticks_Game, transition_table
+from variants import DEFAULT_VARIANT, VARIANTS, to_index
+# Code shared by the game projects lives in common/ at the root of the repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from common.difftest import compare, fuzz, shrink, trace
+
+# Fuzzes the fast Sticks engines against Sticks_Game, see common/difftest.py
+
+# ==== Sticks engines ====
+
+class Table_Sticks_Game:
+    # Sticks_Game played only through transition_table lookups
+    def __init__(self, pos="1111", variant=DEFAULT_VARIANT):
+        self.variant = variant
+        self.table = transition_table(variant)
+        self.index = variant.encode(pos)
+        self.turn = 0
+        self.history = ["Game start"]
+
+    def state(self):
+        return self.variant.decode(self.index)
+
+    def normalize(self, move):
+        # The table's name for a move, read the way Sticks_Game reads it
+        # Ex. "A:C A" -> "A:A C", None if there is no such move
+        (type, tail) = move.split(":", maxsplit=1)
+        if not type or not tail: return None
+        match type:
+            case 'A':
+                splits = tail.split(maxsplit=1)
+                if len(splits) < 2: return None
+                (source_i, target_i) = (to_index(splits[0]), to_index(splits[1]))
+                if not 0 <= source_i <= 1 or not 0 <= target_i <= 1: return None
+                return f"A:{'AB'[source_i]} {'CD'[target_i]}"
+            case 'S':
+                own = [int(c) for c in self.state()[:2]]
+                split = self.variant.parse_split(tail, own)
+                if split is None: return None
+                for name in self.table[self.index]:
+                    if name.startswith("S:") and self.variant.parse_split(name[2:], own) == split: return name
+        return None
+
+    def is_over(self):
+        state = self.state()
+        return state[:2] == "00" or state[2:] == "00"
+
+    def is_legal(self, move):
+        if self.is_over(): return False
+        if not move or not isinstance(move, str): return False
+        return self.normalize(move) in self.table[self.index]
+
+    def move(self, move):
+        prev = self.state()
+        self.index = self.table[self.index][self.normalize(move)]
+        self.turn += 1
+        self.history.append(f'{self.turn}) [{prev}] {move} -> [{self.state()}]')
+        if self.is_over(): self.history.append(f"Game over, Player {"1" if self.turn % 2 == 1 else "2"} Wins")
+
+class Vec_Sticks_Game:
+    # One lane of Sticks_Vec_Env behind the Sticks_Game interface
+    def __init__(self, pos="1111", variant=DEFAULT_VARIANT):
+        from vec_env import Sticks_Vec_Env
+        self.env = Sticks_Vec_Env(1, variant, start=pos, max_moves=1 << 30)
+        self.env.reset()
+        self.over = False
+        self.turn = 0
+        self.history = ["Game start"]
+
+    def state(self):
+        return ''.join(str(h) for h in self.env.observe()[0])
+
+    def is_over(self):
+        state = self.state()
+        return self.over or state[:2] == "00" or state[2:] == "00"
+
+    def is_legal(self, move):
+        if self.is_over() or move not in self.env.moves: return False
+        return bool(self.env.action_mask()[0, self.env.moves.index(move)])
+
+    def move(self, move):
+        prev = self.state()
+        (_, _, terminated, _, info) = self.env.step([self.env.moves.index(move)])
+        self.turn += 1
+        if terminated[0]:
+            # The env restarts finished games, keep showing the final state
+            self.over = True
+            self.env.states[0] = info["final_states"][0]
+        self.history.append(f'{self.turn}) [{prev}] {move} -> [{self.state()}]')
+        if self.is_over(): self.history.append(f"Game over, Player {"1" if self.turn % 2 == 1 else "2"} Wins")
+
+def observe_sticks(game):
+    observation = {"state": game.state(), "over": bool(game.is_over())}
+    if hasattr(game, "history"): observation["history"] = list(game.history)
+    return observation
+
+def sticks_generator(variant=DEFAULT_VARIANT, length=30, malformed=True):
+    # Random cases, biased towards the edges of the rules: starts near the end of
+    # the game, illegal moves mixed with legal ones and (with malformed) strings
+    # that only look like moves
+    moves = variant.all_moves()
+    odd = ["A:C A", "A:B", "A:A C D", "S:", "S:C", "S:A 9", "S:A x", "X:A C", ":A", "A:  A  D"]
+    def generate(rng):
+        start = variant.decode(rng.randrange(variant.num_states())) if rng.random() < 0.7 else "1111"
+        game = Sticks_Game(start, variant)
+        steps = [start]
+        for _ in range(rng.randrange(1, length)):
+            legal = [m for m in moves if game.is_legal(m)]
+            roll = rng.random()
+            if legal and roll < 0.7:
+                move = rng.choice(legal)
+            elif malformed and roll < 0.85:
+                move = rng.choice(odd)
+            else:
+                move = rng.choice(moves)
+            steps.append(move)
+            if game.is_legal(move): game.move(move)
+        return steps
+    return generate
+
+def sticks_checker(candidate, variant=DEFAULT_VARIANT):
+    # Cases are [start state, move, move, ...]
+    def check(case):
+        (start, moves) = (case[0], case[1:])
+        reference = trace(Sticks_Game(start, variant), moves, observe_sticks)
+        return compare(reference, trace(candidate(start, variant), moves, observe_sticks))
+    return check
+
+def shrink_moves(case, fails):
+    # Shrinks the moves of a case, keeping its start state
+    return [case[0]] + shrink(case[1:], lambda moves: fails([case[0]] + moves))
+
+def fuzz_sticks(candidate, variant=DEFAULT_VARIANT, budget=5.0, seed=None, malformed=True):
+    generate = sticks_generator(variant, malformed=malformed)
+    return fuzz(generate, sticks_checker(candidate, variant), budget, seed, minimize=shrink_moves)
+
+ENGINES = {
+    "table": (Table_Sticks_Game, True),
+    "vec": (Vec_Sticks_Game, False),  # Only knows well formed moves
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Fuzz fast Sticks engines against Sticks_Game")
+    parser.add_argument("--engine", choices=ENGINES.keys(), nargs="*", default=list(ENGINES.keys()))
+    parser.add_argument("--variant", choices=VARIANTS.keys(), nargs="*", default=list(VARIANTS.keys()))
+    parser.add_argument("--budget", type=float, default=2.0, help="Seconds per engine and variant")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    failed = False
+    for name in args.engine:
+        (candidate, malformed) = ENGINES[name]
+        for variant_name in args.variant:
+            report = fuzz_sticks(candidate, VARIANTS[variant_name], args.budget, args.seed, malformed)
+            print(f"{name} {variant_name}: {report}")
+            failed = failed or not report
+    exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import argparse
+import glob
+import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import solver
+from sticks import Sticks_Game
+from variants import VARIANTS
+# Code shared by the game projects lives in common/ at the root of the repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from common.grading import iter_json_array, save_reports
+
+# Game state given in the prompt of each llm-tests folder, see ../README.md
+STATES = {
+    "one-step": "3401",
+    "two-step": "3321",
+}
+
+# Error classes, in the order they are reported
+OPTIMAL = "optimal"        # One of the solver's best moves
+SLOWER = "slower"          # Keeps the outcome but takes longer to win (or loses sooner)
+BLUNDER = "blunder"        # Legal, but gives away a win or a draw
+ILLEGAL = "illegal"        # Well formed, but not allowed in the state (Ex. attacking a 0 hand)
+MALFORMED = "malformed"    # Looks like a move but is not one (Ex. "A:D", "A:C B")
+UNPARSABLE = "unparsable"  # No move found in the response
+ERROR_CLASSES = [OPTIMAL, SLOWER, BLUNDER, ILLEGAL, MALFORMED, UNPARSABLE]
+
+MOVE_PATTERN = re.compile(r"\b([AS])\s*:\s*([A-D](?:\s*[A-D])?)(?:\s+(\d))?")
+
+def parse_move(text):
+    # Extracts a move from a response, Ex. "[2342] A:A D -> [2431]" -> "A:A D"
+    # Returns None when nothing resembling a move is found
+    if not isinstance(text, str): return None
+    match = MOVE_PATTERN.search(text.upper())
+    if not match: return None
+    (type, hands, amount) = match.groups()
+    hands = hands.replace(" ", "")
+    if type == "A":
+        return f"A:{' '.join(hands)}"
+    return f"S:{hands}" + (f" {amount}" if amount else "")
+
+def is_well_formed(move, variant):
+    # The move's syntax under the variant's split rule, Ex. "S:A" only in the even
+    # variant and "S:A 2" only in the others
+    if move.startswith("A:"):
+        hands = move[2:].split()
+        return len(hands) == 2 and hands[0] in "AB" and hands[1] in "CD"
+    return variant.parse_split(move[2:], [0, 0]) is not None
+
+def classify(state, move, variant):
+    if move is None: return UNPARSABLE
+    if not is_well_formed(move, variant): return MALFORMED
+    if not Sticks_Game(state, variant).is_legal(move): return ILLEGAL
+    # Moves equivalent under hand symmetry have the same value, so they grade the same
+    values = solver.move_values(state, variant)
+    if move in solver.best_moves(state, variant): return OPTIMAL
+    if values[move][0] == solver.outcome(state, variant)[0]: return SLOWER
+    return BLUNDER
+
+def grade_file(path, state, variant_name):
+    variant = VARIANTS[variant_name]
+    classes = Counter()
+    moves = Counter()
+    for response in iter_json_array(path):
+        move = parse_move(response.get("primary_move") if isinstance(response, dict) else None)
+        classes[classify(state, move, variant)] += 1
+        moves[move or "(none)"] += 1
+
+    total = sum(classes.values())
+    return {
+        "file": path,
+        "state": state,
+        "variant": variant_name,
+        "responses": total,
+        "accuracy": classes[OPTIMAL] / total if total else 0,
+        "illegal_rate": (classes[ILLEGAL] + classes[MALFORMED]) / total if total else 0,
+        "classes": {name: classes[name] for name in ERROR_CLASSES},
+        "best_moves": solver.best_moves(state, variant),
+        "moves": dict(moves.most_common()),
+    }
+
+def find_files(root):
+    # (path, state) for every results file under root/<test folder>/
+    files = []
+    for folder, state in STATES.items():
+        for path in sorted(glob.glob(os.path.join(root, folder, "*.json"))):
+            files.append((path, state))
+    return files
+
+def main():
+    parser = argparse.ArgumentParser(description="Grade LLM results against the Sticks solver")
+    parser.add_argument("root", nargs="?", default=os.path.join(os.path.dirname(__file__), "..", "llm-tests"))
+    parser.add_argument("--variant", choices=VARIANTS.keys(), default="cutoff")
+    parser.add_argument("--output", default="grades.json")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    files = find_files(args.root)
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(grade_file, path, state, args.variant) for path, state in files]
+        reports = [future.result() for future in futures]
+
+    save_reports(reports, args.output, args.root, ERROR_CLASSES)
+
+if __name__ == "__main__":
+    main()
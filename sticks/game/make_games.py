@@ -1,28 +1,36 @@
+import argparse
 import itertools
 import random
 import copy
 from sticks import Sticks_Game
+from variants import DEFAULT_VARIANT, VARIANTS
 import csv
 
-def generate_moves():
-    all_moves = ["A:A C", "A:A D", "A:B C", "A:B D", "S:A", "S:B"]
+def generate_moves(variant=DEFAULT_VARIANT, max_moves=9, symmetric=False):
+    # With symmetric, states are written with sorted hands and moves that only
+    # differ by hand symmetry (Ex. "A:A C" and "A:B C" from [1111]) are played once
+    all_moves = variant.all_moves()
 
     histories = []
 
     def play_game(current_game):
-        if current_game.is_over() or len(current_game.history) > 9:
+        if current_game.is_over() or len(current_game.history) > max_moves:
             if not current_game.is_over():
                 current_game.history.append("Game Over, Revisitation.")
-            # Longest possible game is 9 moves, with revisitation it is infinite
+            # Longest possible game is 9 moves in the default variant, with revisitation it is infinite
             histories.append(current_game.history)
             return
+        reached = set()
         for move in all_moves:
             new_game = copy.deepcopy(current_game)
             if new_game.is_legal(move):
                 new_game.move(move)
+                if symmetric:
+                    if new_game.state() in reached: continue
+                    reached.add(new_game.state())
                 play_game(new_game)
 
-    game = Sticks_Game()
+    game = Sticks_Game(variant=variant, symmetric=symmetric)
     play_game(game)
 
     num_games = len(histories)
@@ -44,4 +52,9 @@ def generate_moves():
     print(f"Saved {num_games} games to the games.txt")
 
 if __name__ == "__main__":
-    generate_moves()
+    parser = argparse.ArgumentParser(description="Enumerate Sticks games into games.txt")
+    parser.add_argument("--variant", choices=VARIANTS.keys(), default="cutoff")
+    parser.add_argument("--max-moves", type=int, default=9)
+    parser.add_argument("--symmetric", action="store_true", help="Merge states that only differ by swapped hands")
+    args = parser.parse_args()
+    generate_moves(VARIANTS[args.variant], args.max_moves, args.symmetric)
@@ -0,0 +1,107 @@
+import argparse
+from collections import deque
+from functools import lru_cache
+from sticks import canonical, remap_move, transition_table
+from variants import DEFAULT_VARIANT, VARIANTS
+
+# Outcomes are from the point of view of the player about to move
+WIN = 1
+DRAW = 0
+LOSS = -1
+
+@lru_cache(maxsize=None)
+def outcome_table(variant=DEFAULT_VARIANT, symmetric=False):
+    # Solves every state of a variant by retrograde analysis
+    # Returns (outcomes, depths), indexed like transition_table(variant)
+    # depths is the number of moves left with perfect play, the winner
+    # finishes as fast as possible and the loser holds out as long as possible
+    # With symmetric, only canonical states are solved (about 4x fewer)
+    table = transition_table(variant, symmetric)
+    num_states = len(table)
+    outcomes = [DRAW] * num_states
+    depths = [0] * num_states
+    solved = [False] * num_states
+    remaining = [len(row) if row is not None else 0 for row in table]
+    predecessors = [[] for _ in range(num_states)]
+    for index, row in enumerate(table):
+        if row is None: continue
+        for post in row.values():
+            predecessors[post].append(index)
+
+    queue = deque()
+    for index in range(num_states):
+        if table[index] is None or remaining[index] > 0: continue
+        state = variant.decode(index)
+        # Game over, the player to move is the one with no fingers left
+        # Ex. "0012" is lost, "1200" can only be reached by an illegal move
+        outcomes[index] = LOSS if state[:2] == "00" else WIN
+        solved[index] = True
+        queue.append(index)
+
+    # States come off the queue in order of depth, so the first win found for
+    # a state is the fastest and the last reply to fail is the longest loss
+    while queue:
+        post = queue.popleft()
+        for index in predecessors[post]:
+            if solved[index]: continue
+            if outcomes[post] == LOSS:
+                outcomes[index] = WIN
+                depths[index] = depths[post] + 1
+                solved[index] = True
+                queue.append(index)
+            else:
+                remaining[index] -= 1
+                if remaining[index] == 0:
+                    outcomes[index] = LOSS
+                    depths[index] = depths[post] + 1
+                    solved[index] = True
+                    queue.append(index)
+
+    return (outcomes, depths)
+
+def outcome(state, variant=DEFAULT_VARIANT, symmetric=False):
+    # (outcome, depth) of a state, Ex. outcome("3401") -> (WIN, 1)
+    if symmetric: state = canonical(state)[0]
+    (outcomes, depths) = outcome_table(variant, symmetric)
+    index = variant.encode(state)
+    return (outcomes[index], depths[index])
+
+def move_values(state, variant=DEFAULT_VARIANT, symmetric=False):
+    # {move: (outcome, depth)} for every legal move, from the mover's point of view
+    # With symmetric, moves reaching the same position up to hand symmetry are
+    # listed once, Ex. "3321" has "A:A C" but not "A:B C"
+    (swap_own, swap_opp) = (False, False)
+    if symmetric: (state, swap_own, swap_opp) = canonical(state)
+    (outcomes, depths) = outcome_table(variant, symmetric)
+    row = transition_table(variant, symmetric)[variant.encode(state)]
+    return {remap_move(move, swap_own, swap_opp): (-outcomes[post], depths[post] + 1)
+            for move, post in row.items()}
+
+def best_moves(state, variant=DEFAULT_VARIANT, symmetric=False):
+    # All moves that keep the best outcome, winning fastest or losing slowest
+    # Ex. best_moves("3321") -> ["A:A C", "A:B C"]
+    values = move_values(state, variant, symmetric)
+    if not values: return []
+    (result, depth) = outcome(state, variant, symmetric)
+    if result == DRAW:
+        return [move for move, value in values.items() if value[0] == DRAW]
+    return [move for move, value in values.items() if value == (result, depth)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve a Sticks state")
+    parser.add_argument("state", help="Game state as ABCD, Ex. 3321")
+    parser.add_argument("--variant", choices=VARIANTS.keys(), default="cutoff")
+    parser.add_argument("--symmetric", action="store_true", help="List moves once up to hand symmetry")
+    args = parser.parse_args()
+
+    variant = VARIANTS[args.variant]
+    names = {WIN: "Win", DRAW: "Draw", LOSS: "Loss"}
+    (result, depth) = outcome(args.state, variant)
+    optimal = best_moves(args.state, variant, args.symmetric)
+    print(f"State: [{args.state}] -> {names[result]}" + (f" in {depth}" if result != DRAW else ""))
+    for move, (value, moves_left) in move_values(args.state, variant, args.symmetric).items():
+        best = " (best)" if move in optimal else ""
+        print(f"{move}: {names[value]}" + (f" in {moves_left}" if value != DRAW else "") + best)
+
+if __name__ == "__main__":
+    main()
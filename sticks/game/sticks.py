@@ -1,11 +1,20 @@
 import random
+from functools import lru_cache
+from variants import DEFAULT_VARIANT, to_index
 
 class Sticks_Game:
-    def __init__(self, pos="1111"):
+    def __init__(self, pos="1111", variant=DEFAULT_VARIANT, symmetric=False):
+        self.variant = variant
+        # Keep both players' hands sorted so symmetric states are written the same way
+        # Ex. "4310" is played and recorded as "3401"
+        self.symmetric = symmetric
         self.turn = 0
         # Ex. "3124" -> p1 = [3, 1], p2 = [2, 4]
         self.p1 = [int(c) for c in pos[:2]]
         self.p2 = [int(c) for c in pos[2:]]
+        if self.symmetric:
+            self.p1.sort()
+            self.p2.sort()
         self.history = ["Game start"]
 
     def state(self):
@@ -19,12 +28,7 @@ class Sticks_Game:
         return p1 + p2 if self.is_p1() else p2 + p1
 
     def to_index(self, char):
-        match char:
-            case 'A': return 0
-            case 'B': return 1
-            case 'C': return 0
-            case 'D': return 1
-            case _: return 99
+        return to_index(char)
 
     def is_p1(self):
         return self.turn % 2 == 0
@@ -53,15 +57,11 @@ class Sticks_Game:
                     if self.p2[source_i] <= 0: return False
                     if self.p1[target_i] <= 0: return False
             case 'S':
-                source_i = self.to_index(tail)
-                if source_i < 0 or source_i > 1: return False
-                target_i = 1 if source_i == 0 else 0
-                if self.is_p1():
-                    if self.p1[source_i] % 2 != 0: return False
-                    if self.p1[target_i] != 0: return False
-                else:
-                    if self.p2[source_i] % 2 != 0: return False
-                    if self.p2[target_i] != 0: return False
+                own = self.p1 if self.is_p1() else self.p2
+                split = self.variant.parse_split(tail, own)
+                if split is None: return False
+                (source_i, amount) = split
+                if not self.variant.can_split(own, source_i, amount): return False
             case _:
                 return False
 
@@ -76,21 +76,20 @@ class Sticks_Game:
                 source_i = self.to_index(source)
                 target_i = self.to_index(target)
                 if self.is_p1():
-                    sum = self.p2[target_i] + self.p1[source_i]
-                    self.p2[target_i] = sum if sum < 5 else 0
+                    self.p2[target_i] = self.variant.attack(self.p1[source_i], self.p2[target_i])
                 else:
-                    sum = self.p1[target_i] + self.p2[source_i]
-                    self.p1[target_i] = sum if sum < 5 else 0
+                    self.p1[target_i] = self.variant.attack(self.p2[source_i], self.p1[target_i])
 
             case 'S': # Split
-                source_i = self.to_index(tail)
+                own = self.p1 if self.is_p1() else self.p2
+                (source_i, amount) = self.variant.parse_split(tail, own)
                 target_i = 1 if source_i == 0 else 0
-                if self.is_p1():
-                    self.p1[source_i] //= 2
-                    self.p1[target_i] += self.p1[source_i]
-                else:
-                    self.p2[source_i] //= 2
-                    self.p2[target_i] += self.p2[source_i]
+                own[source_i] -= amount
+                own[target_i] += amount
+
+        if self.symmetric:
+            self.p1.sort()
+            self.p2.sort()
 
         # Update history
         self.turn += 1
@@ -98,6 +97,59 @@ class Sticks_Game:
         self.history.append(f'{self.turn}) [{prev}] {move} -> [{post}]')
         if self.is_over(): self.history.append(f"Game over, Player {"2" if self.is_p1() else "1"} Wins") # Game ends on losers turn, flip P1 and P2
 
+def canonical(state):
+    # Swapping a player's hands (A<->B or C<->D) does not change the position
+    # Returns the state with both pairs of hands sorted, and which pairs were swapped
+    # Ex. "4310" -> ("3401", True, True)
+    swap_own = state[0] > state[1]
+    swap_opp = state[2] > state[3]
+    own = state[1] + state[0] if swap_own else state[:2]
+    opp = state[3] + state[2] if swap_opp else state[2:]
+    return (own + opp, swap_own, swap_opp)
+
+def remap_move(move, swap_own, swap_opp):
+    # Rewrites a move for a state with swapped hands, use canonical() to get the swaps
+    # Ex. remap_move("A:A D", True, True) -> "A:B C"
+    if ":" not in move: return move
+    (type, tail) = move.split(":", maxsplit=1)
+    swaps = {}
+    if swap_own: swaps.update({'A': 'B', 'B': 'A'})
+    if swap_opp: swaps.update({'C': 'D', 'D': 'C'})
+    return f"{type}:{''.join(swaps.get(c, c) for c in tail)}"
+
+def equivalent_moves(state, move, variant=DEFAULT_VARIANT):
+    # Legal moves of state that reach the same position as move up to hand symmetry
+    # Ex. equivalent_moves("3321", "A:A C") -> ["A:A C", "A:B C"]
+    row = transition_table(variant)[variant.encode(state)]
+    if move not in row: return []
+    target = canonical(variant.decode(row[move]))[0]
+    return [m for m, post in row.items() if canonical(variant.decode(post))[0] == target]
+
+@lru_cache(maxsize=None)
+def transition_table(variant=DEFAULT_VARIANT, symmetric=False):
+    # Table of {move: next state index} for every state index of a variant
+    # Built on first use by playing every move from every state, so it always
+    # agrees with Sticks_Game. Next states are seen by the player to move next
+    # With symmetric, only canonical states have a row (others are None), next
+    # states are canonical and moves reaching the same canonical state are merged
+    table = []
+    all_moves = variant.all_moves()
+    for index in range(variant.num_states()):
+        state = variant.decode(index)
+        if symmetric and canonical(state)[0] != state:
+            table.append(None)
+            continue
+        row = {}
+        for move in all_moves:
+            game = Sticks_Game(state, variant, symmetric)
+            if game.is_legal(move):
+                game.move(move)
+                post = variant.encode(game.state())
+                if symmetric and post in row.values(): continue
+                row[move] = post
+        table.append(row)
+    return table
+
 def main():
     print(" ==== Sticks/Chopsticks Game ==== ")
     tutorial = input("Would you like a tutorial (y/n): ")
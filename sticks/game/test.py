@@ -1,5 +1,11 @@
 import unittest
-from sticks import Sticks_Game
+from sticks import Sticks_Game, transition_table, canonical, remap_move, equivalent_moves
+from variants import Sticks_Variant, VARIANTS, SPLIT_FREE, SPLIT_TRANSFER
+import solver
+import grade
+import numpy as np
+from vec_env import Sticks_Vec_Env
+import difftest
 
 class Test_Sticks_Game(unittest.TestCase):
     def test_new_game(self):
@@ -90,9 +96,230 @@ class Test_Sticks_Game(unittest.TestCase):
         game = Sticks_Game("4000")
         self.assertFalse(game.is_legal("S:A"))
 
+    def test_default_variant_table(self):
+        table = transition_table()
+        variant = VARIANTS["cutoff"]
+        row = table[variant.encode("3401")]
+        self.assertEqual(sorted(row.keys()), ["A:A D", "A:B D"])
+        self.assertEqual(variant.decode(row["A:B D"]), "0034")
+
     def test_sanity(self):
         self.assertTrue(True)
         self.assertFalse(False)
 
+class Test_Sticks_Variants(unittest.TestCase):
+    def test_rollover_attack(self):
+        game = Sticks_Game("3414", Sticks_Variant(rollover=True))
+        game.move("A:B D") # 4 + 4 = 8 -> 3
+        self.assertEqual(game.p2, [1, 3])
+        game = Sticks_Game("1411", Sticks_Variant(rollover=True))
+        game.move("A:B D") # 4 + 1 = 5 -> 0
+        self.assertEqual(game.p2, [1, 0])
+
+    def test_fingers(self):
+        game = Sticks_Game("3131", Sticks_Variant(fingers=7))
+        game.move("A:A C")
+        self.assertEqual(game.p2, [6, 1])
+        game.move("A:A C")
+        self.assertEqual(game.p1, [0, 1])
+        self.assertRaises(ValueError, Sticks_Variant, fingers=11)
+
+    def test_free_split(self):
+        game = Sticks_Game("0311", Sticks_Variant(split=SPLIT_FREE))
+        self.assertFalse(game.is_legal("S:B"))
+        self.assertFalse(game.is_legal("S:B 3")) # Would only mirror the hands
+        self.assertTrue(game.is_legal("S:B 1"))
+        game.move("S:B 1")
+        self.assertEqual(game.p1, [1, 2])
+
+    def test_transfer(self):
+        variant = Sticks_Variant(split=SPLIT_TRANSFER)
+        game = Sticks_Game("1311", variant)
+        self.assertTrue(game.is_legal("S:B 1"))
+        self.assertFalse(game.is_legal("S:B 2")) # Mirror of 13
+        self.assertFalse(game.is_legal("S:A 1")) # Suicide
+        self.assertFalse(Sticks_Game("3411", variant).is_legal("S:A 1")) # Overflow
+        game.move("S:B 1")
+        self.assertEqual(game.p1, [2, 2])
+
+        game = Sticks_Game("1311", Sticks_Variant(split=SPLIT_TRANSFER, suicide=True))
+        self.assertTrue(game.is_legal("S:A 1"))
+        game.move("S:A 1")
+        self.assertEqual(game.p1, [0, 4])
+
+    def test_tables(self):
+        for variant in VARIANTS.values():
+            table = transition_table(variant)
+            self.assertEqual(len(table), variant.num_states())
+            for index in [variant.encode("1111"), variant.encode("2403")]:
+                state = variant.decode(index)
+                for move, post in table[index].items():
+                    game = Sticks_Game(state, variant)
+                    game.move(move)
+                    self.assertEqual(variant.decode(post), game.state())
+
+class Test_Sticks_Symmetry(unittest.TestCase):
+    def test_canonical(self):
+        self.assertEqual(canonical("3401"), ("3401", False, False))
+        self.assertEqual(canonical("4310"), ("3401", True, True))
+        self.assertEqual(canonical("3410"), ("3401", False, True))
+
+    def test_remap_move(self):
+        self.assertEqual(remap_move("A:A D", True, True), "A:B C")
+        self.assertEqual(remap_move("A:A D", False, True), "A:A C")
+        self.assertEqual(remap_move("S:B", True, False), "S:A")
+        self.assertEqual(remap_move("S:B 2", True, True), "S:A 2")
+
+    def test_remapped_move_is_same_position(self):
+        game = Sticks_Game("4310")
+        game.move("A:A D")
+        (state, swap_own, swap_opp) = canonical("4310")
+        canonical_game = Sticks_Game(state)
+        canonical_game.move(remap_move("A:A D", swap_own, swap_opp))
+        self.assertEqual(canonical(game.state())[0], canonical(canonical_game.state())[0])
+
+    def test_symmetric_game(self):
+        game = Sticks_Game("2113", symmetric=True)
+        self.assertEqual(game.state(), "1213")
+        game.move("A:B C") # 2 + 1 = 3
+        self.assertEqual(game.state(), "3312")
+
+    def test_equivalent_moves(self):
+        self.assertEqual(equivalent_moves("3321", "A:B C"), ["A:A C", "A:B C"])
+        self.assertEqual(equivalent_moves("3321", "A:B D"), ["A:A D", "A:B D"])
+        self.assertEqual(equivalent_moves("3401", "A:B D"), ["A:B D"])
+        self.assertEqual(equivalent_moves("3401", "A:B C"), [])
+
+    def test_symmetric_table(self):
+        full = transition_table()
+        table = transition_table(symmetric=True)
+        self.assertEqual(sum(row is not None for row in table), 225)
+        self.assertIsNone(table[VARIANTS["cutoff"].encode("2111")])
+        self.assertEqual(len(full[VARIANTS["cutoff"].encode("1111")]), 4)
+        self.assertEqual(len(table[VARIANTS["cutoff"].encode("1111")]), 1)
+
+class Test_Sticks_Solver(unittest.TestCase):
+    def test_one_step(self):
+        self.assertEqual(solver.outcome("3401"), (solver.WIN, 1))
+        self.assertEqual(solver.best_moves("3401"), ["A:B D"])
+
+    def test_two_step(self):
+        self.assertEqual(solver.best_moves("3321"), ["A:A C", "A:B C"])
+
+    def test_symmetric(self):
+        self.assertEqual(solver.outcome("4321", symmetric=True), solver.outcome("3412"))
+        self.assertEqual(solver.best_moves("3321", symmetric=True), ["A:A C"])
+        self.assertEqual(solver.best_moves("3312", symmetric=True), ["A:A D"])
+
+    def test_game_over(self):
+        self.assertEqual(solver.outcome("0012"), (solver.LOSS, 0))
+        self.assertEqual(solver.best_moves("0012"), [])
+
+    def test_variants(self):
+        self.assertEqual(solver.outcome("1111", VARIANTS["cutoff"])[0], solver.DRAW)
+        for variant in VARIANTS.values():
+            (result, depth) = solver.outcome("4401", variant)
+            self.assertEqual(result, solver.WIN)
+            self.assertEqual(depth, 1)
+
+class Test_Sticks_Vec_Env(unittest.TestCase):
+    def test_matches_game(self):
+        env = Sticks_Vec_Env(50, seed=0)
+        env.reset()
+        games = [Sticks_Game() for _ in range(50)]
+        for _ in range(40):
+            mask = env.action_mask()
+            for i, game in enumerate(games):
+                self.assertEqual(list(env.observe()[i]), [int(c) for c in game.state()])
+                self.assertEqual([game.is_legal(m) for m in env.moves], list(mask[i]))
+            actions = env.sample_actions()
+            (_, rewards, terminated, truncated, _) = env.step(actions)
+            for i, game in enumerate(games):
+                game.move(env.moves[actions[i]])
+                self.assertEqual(terminated[i], game.is_over())
+                self.assertEqual(rewards[i], 1 if game.is_over() else 0)
+                if terminated[i] or truncated[i]:
+                    games[i] = Sticks_Game()
+
+    def test_illegal_and_reset(self):
+        env = Sticks_Vec_Env(2, start="3401")
+        env.reset()
+        moves = [env.moves.index("A:B D"), env.moves.index("A:A C")]
+        (observations, rewards, terminated, _, info) = env.step(moves)
+        self.assertEqual(list(rewards), [1, -1])
+        self.assertEqual(list(terminated), [True, True])
+        self.assertEqual(list(info["illegal"]), [False, True])
+        self.assertEqual(env.variant.decode(info["final_states"][0]), "0034")
+        self.assertTrue(np.array_equal(observations, [[3, 4, 0, 1], [3, 4, 0, 1]]))
+
+    def test_truncation(self):
+        env = Sticks_Vec_Env(1, max_moves=2)
+        env.reset()
+        attack = env.moves.index("A:A C")
+        self.assertFalse(env.step([attack])[3][0])
+        self.assertTrue(env.step([attack])[3][0])
+        self.assertEqual(env.turns[0], 0)
+
+class Test_Grader(unittest.TestCase):
+    def test_parse_move(self):
+        self.assertEqual(grade.parse_move("A:B D"), "A:B D")
+        self.assertEqual(grade.parse_move("A:AD"), "A:A D")
+        self.assertEqual(grade.parse_move("[2342] A:A D -> [2431]"), "A:A D")
+        self.assertEqual(grade.parse_move("s:b"), "S:B")
+        self.assertIsNone(grade.parse_move("Attack"))
+
+    def test_classify(self):
+        variant = VARIANTS["cutoff"]
+        self.assertEqual(grade.classify("3401", "A:B D", variant), grade.OPTIMAL)
+        self.assertEqual(grade.classify("3401", "A:A D", variant), grade.BLUNDER)
+        self.assertEqual(grade.classify("3401", "A:A C", variant), grade.ILLEGAL)
+        self.assertEqual(grade.classify("3401", "A:C B", variant), grade.MALFORMED)
+        self.assertEqual(grade.classify("3401", "A:D", variant), grade.MALFORMED)
+        self.assertEqual(grade.classify("3401", None, variant), grade.UNPARSABLE)
+        # Equivalent under hand symmetry
+        self.assertEqual(grade.classify("3321", "A:A C", variant), grade.OPTIMAL)
+        self.assertEqual(grade.classify("3321", "A:B C", variant), grade.OPTIMAL)
+
+    def test_classify_split_syntax(self):
+        # Split moves are checked against the variant's split rule before legality
+        transfer = VARIANTS["cutoff-transfer"]
+        self.assertEqual(grade.classify("3401", "S:A", transfer), grade.MALFORMED)
+        self.assertEqual(grade.classify("3401", "S:A 1", transfer), grade.ILLEGAL)
+        self.assertEqual(grade.classify("3401", "S:A 2", VARIANTS["cutoff"]), grade.MALFORMED)
+        self.assertEqual(grade.classify("3401", "S:A", VARIANTS["cutoff"]), grade.ILLEGAL)
+
+class Test_Difftest(unittest.TestCase):
+    def test_shrink(self):
+        # Smallest sublist still containing both 3 and 7
+        case = list(range(20))
+        self.assertEqual(difftest.shrink(case, lambda c: 3 in c and 7 in c), [3, 7])
+
+    def test_compare_missing_observation(self):
+        # An observation only one engine makes is a difference, not skipped
+        reference = [("A:A C", True, {"state": "1121", "history": ["Game start", "1) [1111] A:A C -> [1121]"]})]
+        candidate = [("A:A C", True, {"state": "1121"})]
+        self.assertEqual(difftest.compare(reference, candidate), "step 0 'A:A C': candidate has no history")
+        self.assertEqual(difftest.compare(candidate, reference), "step 0 'A:A C': reference has no history")
+        self.assertIsNone(difftest.compare(reference, reference))
+
+    def test_fast_engines_match(self):
+        for name in ["cutoff", "rollover-transfer-suicide"]:
+            variant = VARIANTS[name]
+            report = difftest.fuzz_sticks(difftest.Table_Sticks_Game, variant, budget=0.5, seed=0)
+            self.assertTrue(report, report)
+            report = difftest.fuzz_sticks(difftest.Vec_Sticks_Game, variant, budget=0.5, seed=0, malformed=False)
+            self.assertTrue(report, report)
+
+    def test_finds_mismatch(self):
+        class Broken(difftest.Table_Sticks_Game):
+            # Restarts from 1111 where the game should end
+            def move(self, move):
+                super().move(move)
+                if self.state() in ("0011", "1100"): self.index = self.variant.encode("1111")
+        report = difftest.fuzz_sticks(Broken, VARIANTS["cutoff"], budget=5, seed=0)
+        self.assertFalse(report)
+        # Shrunk to the start state and the one move that differs
+        self.assertEqual(len(report.case), 2)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,112 @@
+SPLIT_EVEN = "even"          # Revive a dead hand by halving an even hand (Ex. 04 -> 22)
+SPLIT_FREE = "free"          # Revive a dead hand with any number of fingers (Ex. 04 -> 13)
+SPLIT_TRANSFER = "transfer"  # Move any number of fingers between hands at any time (Ex. 13 -> 22)
+SPLIT_RULES = [SPLIT_EVEN, SPLIT_FREE, SPLIT_TRANSFER]
+
+class Sticks_Variant:
+    # A rule set for Sticks, every rule decision of Sticks_Game is made here
+    # Ex. Sticks_Variant() is the "cutoff and splits" game described in the README
+    def __init__(self, fingers=5, rollover=False, split=SPLIT_EVEN, suicide=False):
+        # States are written one digit per hand, so a hand can hold at most 9
+        if fingers < 2 or fingers > 10:
+            raise ValueError(f"fingers must be between 2 and 10, got {fingers}")
+        if split not in SPLIT_RULES:
+            raise ValueError(f"Unknown split rule '{split}', expected one of {SPLIT_RULES}")
+        self.fingers = fingers    # A hand reaching this many fingers is dead (cutoff) or wraps (rollover)
+        self.rollover = rollover
+        self.split = split
+        self.suicide = suicide    # Transfers may empty the giving hand
+
+    def key(self):
+        return (self.fingers, self.rollover, self.split, self.suicide)
+
+    def __eq__(self, other):
+        return isinstance(other, Sticks_Variant) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return (f"Sticks_Variant(fingers={self.fingers}, rollover={self.rollover}, "
+                f"split='{self.split}', suicide={self.suicide})")
+
+    def attack(self, source, target):
+        # Value of the target hand after being tapped by source
+        total = source + target
+        if self.rollover: return total % self.fingers
+        return total if total < self.fingers else 0
+
+    def parse_split(self, tail, own):
+        # "S:A" halves hand A, "S:A 2" moves 2 fingers from hand A to the other hand
+        # Returns (source index, amount) or None if the tail is malformed
+        splits = tail.split()
+        if not splits: return None
+        source_i = to_index(splits[0])
+        if source_i < 0 or source_i > 1: return None
+        if self.split == SPLIT_EVEN:
+            if len(splits) != 1: return None
+            return (source_i, own[source_i] // 2)
+        if len(splits) != 2 or not splits[1].isdigit(): return None
+        return (source_i, int(splits[1]))
+
+    def can_split(self, own, source_i, amount):
+        target_i = 1 if source_i == 0 else 0
+        source = own[source_i]
+        target = own[target_i]
+        if self.split == SPLIT_EVEN:
+            return source % 2 == 0 and target == 0
+        if self.split == SPLIT_FREE:
+            # Giving everything away would only mirror the hands
+            return target == 0 and 0 < amount < source
+        # SPLIT_TRANSFER
+        if amount <= 0 or amount > source: return False
+        if target + amount >= self.fingers: return False
+        if source - amount == 0 and not self.suicide: return False
+        # Swapping hands is not a move
+        return (source - amount, target + amount) != (target, source)
+
+    def all_moves(self):
+        attacks = ["A:A C", "A:A D", "A:B C", "A:B D"]
+        if self.split == SPLIT_EVEN:
+            return attacks + ["S:A", "S:B"]
+        return attacks + [f"S:{hand} {n}" for hand in "AB" for n in range(1, self.fingers)]
+
+    def num_states(self):
+        return self.fingers ** 4
+
+    def encode(self, state):
+        # "ABCD" -> table index
+        index = 0
+        for c in state:
+            index = index * self.fingers + int(c)
+        return index
+
+    def decode(self, index):
+        # table index -> "ABCD"
+        digits = []
+        for _ in range(4):
+            digits.append(str(index % self.fingers))
+            index //= self.fingers
+        return ''.join(reversed(digits))
+
+def to_index(char):
+    match char:
+        case 'A': return 0
+        case 'B': return 1
+        case 'C': return 0
+        case 'D': return 1
+        case _: return 99
+
+DEFAULT_VARIANT = Sticks_Variant()
+
+# Named variants used by the generators, solver and benchmarks
+VARIANTS = {
+    "cutoff": DEFAULT_VARIANT,
+    "rollover": Sticks_Variant(rollover=True),
+    "cutoff-free": Sticks_Variant(split=SPLIT_FREE),
+    "rollover-free": Sticks_Variant(rollover=True, split=SPLIT_FREE),
+    "cutoff-transfer": Sticks_Variant(split=SPLIT_TRANSFER),
+    "rollover-transfer": Sticks_Variant(rollover=True, split=SPLIT_TRANSFER),
+    "cutoff-transfer-suicide": Sticks_Variant(split=SPLIT_TRANSFER, suicide=True),
+    "rollover-transfer-suicide": Sticks_Variant(rollover=True, split=SPLIT_TRANSFER, suicide=True),
+}
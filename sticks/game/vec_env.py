@@ -0,0 +1,94 @@
+import time
+import numpy as np
+from sticks import transition_table
+from variants import DEFAULT_VARIANT
+
+class Sticks_Vec_Env:
+    # K Sticks games stepped together, Gym style
+    # Games are held as state indexes into the variant's transition table, so a
+    # step for every game is a single table lookup. Observations are the hands
+    # [A, B, C, D] of the player to move, like Sticks_Game.state()
+    # Actions index variant.all_moves(), Ex. 0 -> "A:A C"
+    def __init__(self, num_envs, variant=DEFAULT_VARIANT, start="1111", max_moves=100, seed=None):
+        self.num_envs = num_envs
+        self.variant = variant
+        self.moves = variant.all_moves()
+        self.max_moves = max_moves  # Games can loop forever, they are truncated after this many moves
+        self.rng = np.random.default_rng(seed)
+
+        table = transition_table(variant)
+        num_states = len(table)
+        self.next_states = np.full((num_states, len(self.moves)), -1, dtype=np.int32)
+        for index, row in enumerate(table):
+            for move, post in row.items():
+                self.next_states[index, self.moves.index(move)] = post
+        self.legal = self.next_states >= 0
+        self.hands = np.array([[int(c) for c in variant.decode(i)] for i in range(num_states)], dtype=np.int8)
+        # The player to move has no fingers left
+        self.lost = (self.hands[:, 0] == 0) & (self.hands[:, 1] == 0)
+
+        self.start = variant.encode(start)
+        self.states = np.full(num_envs, self.start, dtype=np.int32)
+        self.turns = np.zeros(num_envs, dtype=np.int32)
+
+    def reset(self):
+        self.states[:] = self.start
+        self.turns[:] = 0
+        return self.observe()
+
+    def observe(self):
+        return self.hands[self.states]
+
+    def action_mask(self):
+        # (K, number of moves) bool, True where the move is legal
+        return self.legal[self.states]
+
+    def step(self, actions):
+        # Plays actions[i] in game i
+        # Returns (observations, rewards, terminated, truncated, info) where
+        # rewards are for the player that just moved: 1 for winning the game,
+        # -1 for an illegal move (which also ends the game) and 0 otherwise.
+        # Finished games are reset, info["final_states"] holds their last state
+        actions = np.asarray(actions)
+        posts = self.next_states[self.states, actions]
+        illegal = posts < 0
+        posts = np.where(illegal, self.states, posts)
+        won = self.lost[posts] & ~illegal
+
+        rewards = won.astype(np.float32) - illegal.astype(np.float32)
+        terminated = won | illegal
+        self.turns += 1
+        truncated = (self.turns >= self.max_moves) & ~terminated
+        done = terminated | truncated
+
+        final_states = posts.copy()
+        self.states = np.where(done, self.start, posts).astype(np.int32)
+        self.turns[done] = 0
+        info = {"final_states": final_states, "illegal": illegal}
+        return (self.observe(), rewards, terminated, truncated, info)
+
+    def sample_actions(self):
+        # A uniformly random legal action for every game
+        mask = self.action_mask()
+        scores = self.rng.random(mask.shape) * mask
+        return scores.argmax(axis=1)
+
+def benchmark(num_envs=100000, steps=100):
+    env = Sticks_Vec_Env(num_envs, seed=0)
+    env.reset()
+    # Legal actions sampled from the current states every step
+    elapsed = 0.0
+    illegal = 0
+    total_start = time.perf_counter()
+    for _ in range(steps):
+        actions = env.sample_actions()
+        start = time.perf_counter()
+        (_, _, _, _, info) = env.step(actions)
+        elapsed += time.perf_counter() - start
+        illegal += int(info["illegal"].sum())
+    total = time.perf_counter() - total_start
+    print(f"{num_envs * steps / elapsed:,.0f} steps per second, {num_envs * steps / total:,.0f} with sampling "
+          f"({num_envs} games, {illegal} illegal moves)")
+
+if __name__ == "__main__":
+    benchmark()
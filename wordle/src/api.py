@@ -2,7 +2,7 @@ import re
 
 from pygame import time
 
-from assets.valid_words import VALID_WORDS
+from assets.lexicon import VALID_WORDS
 from classes.GameState import GameState, Status
 from constants import ANIMATION_DURATION, FEEDBACK_DIFF_DURATION
 
@@ -26,18 +26,19 @@ def api(game: GameState):
 
                     guess_word = args[0].lower()
                     game.enter_word_from_solver(guess_word)
+                    # feedback comes from the engine right away, the wait only lets the
+                    # window finish animating before the next command
                     delay = FEEDBACK_DIFF_DURATION * 4 + ANIMATION_DURATION + \
                         100 if not game.disable_animations else 0
                     time.delay(delay)
-                    offset = 0 if game.status == Status.end else 1
-                    feedback = game.words[game.current_word_index -
-                                          offset].get_feedback()
+                    engine = game.engine
+                    feedback = engine.feedback[-1]
 
                     # print game status
                     print(
-                        f"status: {'Completed' if game.status == Status.end else 'In progress'}\n"
-                        f"tries: {game.num_of_tries()} / {game.num_guesses}\n"
-                        f"success: {game.success if game.status == Status.end else 'NA'}\n"
+                        f"status: {'Completed' if engine.is_over() else 'In progress'}\n"
+                        f"tries: {engine.num_of_tries()} / {engine.num_guesses}\n"
+                        f"success: {engine.success if engine.is_over() else 'NA'}\n"
                     )
 
                     # print feedback from guess
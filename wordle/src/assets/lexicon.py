@@ -0,0 +1,142 @@
+import argparse
+import hashlib
+import os
+from collections.abc import Sequence
+from functools import lru_cache
+
+import numpy as np
+
+# Word lists are stored as fixed width records, one byte per letter with A = 0,
+# Ex. "cigar" -> 02 08 06 00 11. The files have no header, the length is the file size / 5
+ASSETS_DIR = os.path.dirname(os.path.abspath(__file__))
+RECORD_LENGTH = 5
+# Word lists of other lengths are packed here on first use, next to the pattern matrices
+CACHE_DIR = os.path.join(ASSETS_DIR, "..", "..", "pattern_cache")
+
+
+class Lexicon(Sequence):
+    # A word list memory mapped from a packed file, reads like a list of lowercase words
+    def __init__(self, path: str, length: int = RECORD_LENGTH):
+        self.path = path
+        if os.path.getsize(path) == 0:
+            raise ValueError(f"{path} has no words")
+        # (N, length) uint8 letters 0-25, the letter matrix of utils/patterns.py
+        self.letters = np.memmap(path, dtype=np.uint8, mode="r").reshape(-1, length)
+        self._words: list[str] | None = None
+        self._indexes: dict[str, int] | None = None
+
+    def __len__(self):
+        return self.letters.shape[0]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.words()[index]
+        return (self.letters[index] + ord("a")).tobytes().decode()
+
+    def __iter__(self):
+        return iter(self.words())
+
+    def __contains__(self, word):
+        return word in self.indexes()
+
+    def __repr__(self):
+        return f"Lexicon({os.path.basename(self.path)!r}, {len(self)} words)"
+
+    def attach(self, letters: np.ndarray):
+        # Reads the same words from another copy of the letters, Ex. one in shared memory
+        if letters.shape != self.letters.shape:
+            raise ValueError(f"Expected letters of shape {self.letters.shape}, got {letters.shape}")
+        self.letters = letters
+
+    def words(self):
+        # Every word as a str, decoded once on first use
+        if self._words is None:
+            text = (self.letters + ord("a")).tobytes().decode()
+            size = self.letters.shape[1]
+            self._words = [text[i:i + size] for i in range(0, len(text), size)]
+        return self._words
+
+    def indexes(self):
+        # {word: position}, built on first lookup
+        if self._indexes is None:
+            self._indexes = {}
+            for i, word in enumerate(self.words()):
+                self._indexes.setdefault(word, i)
+        return self._indexes
+
+    def index(self, word, start: int = 0, stop: int | None = None):
+        i = self.indexes().get(word)
+        if i is None or i < start or (stop is not None and i >= stop):
+            # A repeated word past start, or not in the list
+            return self.words().index(word, start, len(self) if stop is None else stop)
+        return i
+
+
+def save_lexicon(words: list[str], path: str, length: int = RECORD_LENGTH):
+    """! Packs a word list for Lexicon
+    @param words  Words of exactly length letters a-z, any case
+    @param path  The file to write
+    """
+    text = "".join(words).lower()
+    if len(text) != len(words) * length or not (text.isascii() and text.isalpha()):
+        raise ValueError(f"Every word must be {length} letters a-z")
+    letters = np.frombuffer(text.encode(), dtype=np.uint8) - ord("a")
+    # Written under another name first so a half written file is never loaded
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(letters.tobytes())
+    os.replace(temp_path, path)
+
+
+def read_word_source(path: str):
+    # Words of every length in a text file, one per line, lowercase
+    with open(path) as file:
+        return [word for word in (line.strip().lower() for line in file) if word.isascii() and word.isalpha()]
+
+
+@lru_cache(maxsize=None)
+def lexicon(name: str, length: int = RECORD_LENGTH, source_dir: str = ASSETS_DIR, cache_dir: str = CACHE_DIR):
+    """! A word list of one word length, Ex. lexicon("valid_words", 6)
+    The packed 5 letter lists ship in assets/. Other lengths come from one text source per list,
+    source_dir/<name>.txt with words of any length, and are packed into cache_dir the first time
+    each length is asked for, so only the lengths played cost anything
+    @param name  "valid_words" or "guess_words"
+    @return  Lexicon
+    """
+    packed = os.path.join(source_dir, f"{name}.bin")
+    if length == RECORD_LENGTH and os.path.exists(packed):
+        return Lexicon(packed)
+
+    source = os.path.join(source_dir, f"{name}.txt")
+    if not os.path.exists(source):
+        raise FileNotFoundError(f"No {length} letter {name}: add the word source {source}")
+    with open(source, "rb") as file:
+        digest = hashlib.sha1(file.read()).hexdigest()[:16]
+    path = os.path.join(cache_dir, f"{name}-{length}-{digest}.bin")
+    if not os.path.exists(path):
+        words = [word for word in read_word_source(source) if len(word) == length]
+        if not words:
+            raise ValueError(f"{source} has no {length} letter words")
+        os.makedirs(cache_dir, exist_ok=True)
+        save_lexicon(words, path, length)
+    return Lexicon(path, length)
+
+
+VALID_WORDS = lexicon("valid_words")
+GUESS_WORDS = lexicon("guess_words")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack a word list, one word per line, into a lexicon file")
+    parser.add_argument("words", help="Text file with one word per line")
+    parser.add_argument("output", help="Ex. assets/valid_words.bin")
+    args = parser.parse_args()
+
+    with open(args.words) as file:
+        words = [line.strip() for line in file if line.strip()]
+    save_lexicon(words, args.output)
+    print(f"Packed {len(words)} words into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
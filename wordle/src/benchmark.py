@@ -0,0 +1,233 @@
+import argparse
+import json
+import os
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+import numpy as np
+
+from assets.lexicon import GUESS_WORDS, VALID_WORDS
+from classes.Engine import Engine
+from classes.Feedback import Feedback
+from classes.SharedTables import SharedTables, attach_tables
+from classes.Solver import GUESS_POOLS, STRATEGIES, Solver
+from constants import SOLVER_GUESS_POOL, SOLVER_LOOKAHEAD, SOLVER_STRATEGY
+from utils.decision_tree import load_tree
+from utils.patterns import pattern_matrix
+from utils.scenarios import load_scenarios, shard, unfinished
+
+# Plays the solver against every answer, for every number of lies and guesses api.py allows
+# Results are saved one file per variant, in the schema of llm_tests.py plus solver timings
+LOG_DIR = Path("benchmarks/solver_logs")
+LIES = range(0, 6)
+GUESSES = range(6, 10)
+SHARDS_PER_WORKER = 4
+
+
+def share_tables(tables: SharedTables):
+    # Puts the word lists and the pattern matrix in shared memory for the workers
+    tables.publish("valid_words", VALID_WORDS.letters)
+    tables.publish("guess_words", GUESS_WORDS.letters)
+    tables.publish("patterns", pattern_matrix())
+
+
+def init_worker(specs: dict | None = None):
+    # Loads the tables once per process. Given the specs of share_tables, the word lists and the
+    # pattern matrix are read from shared memory, so memory does not grow with the worker count
+    if specs:
+        tables = attach_tables(specs)
+        VALID_WORDS.attach(tables["valid_words"])
+        GUESS_WORDS.attach(tables["guess_words"])
+        # Forked workers inherit the parent's matrix, read the shared one instead
+        pattern_matrix.cache_clear()
+    pattern_matrix()
+    load_tree()
+
+
+def completion(feedback: list[Feedback]):
+    # Same scoring as llm_tests.py, Ex. [correct, present, incorrect, ...] -> 1.5
+    return sum({Feedback.incorrect: 0, Feedback.present: 0.5, Feedback.correct: 1}[f] for f in feedback)
+
+
+def play_game(engine: Engine, solver: Solver, answer: str, seed: int, lie_indexes: list[int] | None = None):
+    """! Plays one game of the solver
+    @param engine  Engine with the number of guesses and lies set
+    @param solver  Solver with the strategy and number of lies set
+    @param answer  The word to guess
+    @param seed  Picks the lie positions and the lies, the same seed gives the same game
+    @param lie_indexes  Lie positions of a scenario, picked with seed if None
+    @return  (game stats, seconds of each get_guess call)
+    """
+    engine.rng.seed(seed)
+    engine.reset(answer, lie_indexes)
+    solver.reset()
+    decision_times = []
+    total_completion = 0
+    while not engine.is_over():
+        start = time.perf_counter()
+        guess = solver.get_guess()
+        decision_times.append(time.perf_counter() - start)
+        (shown, _) = engine.guess(guess)
+        total_completion += completion(shown)
+        if not engine.is_over():
+            solver.update_guesses(guess.upper(), shown)
+
+    tries = engine.num_of_tries()
+    return ({
+        "answer": answer,
+        "lie_indexes": engine.lie_indexes,
+        "average_game_completion": total_completion / tries,
+        "tries": tries,
+        "success": engine.success,
+        "latency": sum(decision_times),
+        "bad_guesses": 0,
+    }, decision_times)
+
+
+def run_shard(task: tuple):
+    # One worker task: some games of one variant, each (run_id, answer, lie_indexes, seed, scenario_id)
+    (strategy, guess_pool, lookahead, lies, guesses, shard_games) = task
+    engine = Engine(guesses, lies)
+    solver = Solver(strategy, guess_pool, lies, lookahead, guesses)
+    games = []
+    decision_times = []
+    for (run_id, answer, lie_indexes, seed, scenario_id) in shard_games:
+        (game, times) = play_game(engine, solver, answer, seed, lie_indexes)
+        game["run_id"] = run_id
+        if scenario_id is not None:
+            game["scenario_id"] = scenario_id
+        games.append(game)
+        decision_times.extend(times)
+    return ((lies, guesses), games, decision_times)
+
+
+def summarize(strategy: str, guess_pool: str, lies: int, guesses: int, games: list[dict],
+              decision_times: list[float], wall_time: float):
+    """! Results of one variant, keys of llm_tests.py first
+    @return  dict ready for json.dump
+    """
+    games = sorted(games, key=lambda game: game["run_id"])
+    distribution = {str(n): 0 for n in range(1, guesses + 1)}
+    distribution["failed"] = 0
+    for game in games:
+        distribution[str(game["tries"]) if game["success"] else "failed"] += 1
+    times = np.array(decision_times)
+    return {
+        "num_runs": len(games),
+        "LLM_MODEL": f"solver:{strategy}:{guess_pool}",
+        "MAX_LLM_CONTINUOUS_CALLS": 1,
+        "games": games,
+        "lies": lies,
+        "total_bad_guesses": 0,
+        "win_rate": sum(game["success"] for game in games) / len(games),
+        "avg_tries": sum(game["tries"] for game in games) / len(games),
+        "avg_latency": sum(game["latency"] for game in games) / len(games),
+        "num_guesses": guesses,
+        "guess_distribution": distribution,
+        "decision_time_mean": float(times.mean()),
+        "decision_time_p95": float(np.percentile(times, 95)),
+        "wall_time": wall_time,
+    }
+
+
+def run_benchmark(strategy: str = SOLVER_STRATEGY, guess_pool: str = SOLVER_GUESS_POOL,
+                  lies: list[int] = LIES, guesses: list[int] = GUESSES, num_answers: int | None = None,
+                  workers: int | None = None, seed: int = 0, lookahead: bool = SOLVER_LOOKAHEAD,
+                  scenarios: list[dict] | None = None):
+    """! Plays every variant against the first num_answers of GUESS_WORDS (all by default),
+    or the games of a scenario file
+    @param scenarios  Scenario dicts of utils/scenarios.py, replace lies, guesses, num_answers and seed
+    @return  {(lies, guesses): summarize() dict}
+    """
+    workers = workers or os.cpu_count() or 1
+    if scenarios is None:
+        variant_games = {(num_lies, num_guesses): [(i + 1, GUESS_WORDS[i], None, seed + i, None)
+                                                   for i in range(len(GUESS_WORDS))[:num_answers]]
+                         for num_lies in lies for num_guesses in guesses}
+    else:
+        variant_games = {}
+        for scenario in scenarios:
+            variant_games.setdefault((scenario["lies"], scenario["num_guesses"]), []).append(
+                (scenario["id"], scenario["answer"], scenario["lie_indexes"], scenario["seed"], scenario["id"]))
+
+    largest = max(len(games) for games in variant_games.values())
+    num_shards = max(1, min(largest, workers * SHARDS_PER_WORKER))
+    # Every variant's answers split round robin, so each shard gets easy and hard words
+    tasks = [(strategy, guess_pool, lookahead, num_lies, num_guesses, games[shard::num_shards])
+             for (num_lies, num_guesses), games in variant_games.items() for shard in range(num_shards)
+             if games[shard::num_shards]]
+
+    init_worker()  # Builds the pattern cache once, before it is shared
+    start = time.time()
+    games = {variant: [] for variant in variant_games}
+    decision_times = {variant: [] for variant in games}
+    # The tables are freed once the pool is done with them
+    with SharedTables() as tables:
+        share_tables(tables)
+        with Pool(workers, initializer=init_worker, initargs=(tables.specs,)) as pool:
+            for (variant, shard_games, times) in pool.imap_unordered(run_shard, tasks):
+                games[variant].extend(shard_games)
+                decision_times[variant].extend(times)
+    wall_time = time.time() - start
+
+    return {variant: summarize(strategy, guess_pool, *variant, games[variant], decision_times[variant], wall_time)
+            for variant in games}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the solver against every answer")
+    parser.add_argument("--strategy", choices=STRATEGIES, default=SOLVER_STRATEGY)
+    parser.add_argument("--guess-pool", choices=GUESS_POOLS, default=SOLVER_GUESS_POOL)
+    parser.add_argument("--lookahead", action="store_true", default=SOLVER_LOOKAHEAD,
+                        help="Minimax looks a second guess ahead")
+    parser.add_argument("--lies", type=int, nargs="*", default=list(LIES))
+    parser.add_argument("--guesses", type=int, nargs="*", default=list(GUESSES))
+    parser.add_argument("--answers", type=int, default=None, help="Only the first N answers, for quick runs")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=LOG_DIR)
+    parser.add_argument("--scenarios", type=Path, default=None,
+                        help="Play the games of a scenario file (python -m utils.scenarios) instead")
+    parser.add_argument("--shard", type=int, default=0, help="Which part of the scenarios to play")
+    parser.add_argument("--num-shards", type=int, default=1, help="Parts the scenarios are split into")
+    parser.add_argument("--rerun", type=Path, nargs="*", default=None,
+                        help="Result files of an earlier run, only play the scenarios missing from them")
+    args = parser.parse_args()
+
+    scenarios = None
+    suffix = ""
+    if args.scenarios is not None:
+        scenarios = shard(load_scenarios(args.scenarios), args.shard, args.num_shards)
+        if args.rerun is not None:
+            games = []
+            for path in args.rerun:
+                with open(path) as f:
+                    games.extend(json.load(f)["games"])
+            scenarios = unfinished(scenarios, games)
+            suffix = "_rerun"
+        if args.num_shards > 1:
+            suffix = f"_shard{args.shard}of{args.num_shards}{suffix}"
+        if not scenarios:
+            print("No scenarios to play")
+            return
+
+    results = run_benchmark(args.strategy, args.guess_pool, args.lies, args.guesses, args.answers,
+                            args.workers, args.seed, args.lookahead, scenarios)
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    print(f"{'lies':>4} {'guesses':>7} {'win rate':>9} {'avg tries':>9} {'mean ms':>8} {'p95 ms':>7}")
+    for (lies, guesses), result in sorted(results.items()):
+        log_file = args.output / f"benchmark_solver_{args.strategy}_{args.guess_pool}_fibble{lies}_guesses{guesses}{suffix}.json"
+        with open(log_file, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"{lies:>4} {guesses:>7} {result['win_rate']:>9.2%} {result['avg_tries']:>9.3f} "
+              f"{result['decision_time_mean'] * 1000:>8.2f} {result['decision_time_p95'] * 1000:>7.2f}")
+
+    wall_time = next(iter(results.values()))["wall_time"]
+    print(f"\nPlayed {sum(r['num_runs'] for r in results.values())} games in {wall_time:.1f}s, "
+          f"saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+from functools import lru_cache
+
+import numpy as np
+
+from classes.Feedback import Feedback
+from constants import WORD_LENGTH
+
+KEYBOARD_ORDER = "QWERTYUIOPASDFGHJKLZXCVBNM"
+ALL_LETTERS = (1 << 26) - 1
+# Letter counts are packed 4 bits per letter, the top bit of each field is a guard
+# that survives a subtraction only if the field did not go below zero
+COUNT_BITS = 4
+GUARDS = sum(1 << (COUNT_BITS * letter + COUNT_BITS - 1) for letter in range(26))
+
+
+def letter_bit(letter: str):
+    return 1 << (ord(letter.upper()) - ord("A"))
+
+
+@lru_cache(maxsize=None)
+def word_masks(word: str):
+    """! The packed form of a word that Constraints checks
+    @param word  The word, any case
+    @return  (letters, counts) - letters has bit 26 * i + letter set for the letter at position i,
+             counts holds how many of each letter the word has, COUNT_BITS per letter
+    """
+    letters = 0
+    counts = 0
+    for i, letter in enumerate(word.upper()):
+        index = ord(letter) - ord("A")
+        letters |= 1 << (26 * i + index)
+        counts += 1 << (COUNT_BITS * index)
+    return (letters, counts)
+
+
+# Class to hold what the feedback so far says about the answer
+class Constraints:
+    def __init__(self, word_length: int = WORD_LENGTH):
+        self.word_length = word_length
+        # Letters still allowed at each position, bit 0 is A
+        self.position_masks = [ALL_LETTERS for _ in range(word_length)]
+        # Fewest and most copies of each letter the answer can have
+        self.min_counts = [0] * 26
+        self.max_counts = [word_length] * 26
+        self.pack()
+
+    def pack(self):
+        # Packed forms of the constraints, checked against word_masks() of each word
+        self.allowed = sum(mask << (26 * i) for i, mask in enumerate(self.position_masks))
+        self.packed_min = sum(n << (COUNT_BITS * letter) for letter, n in enumerate(self.min_counts))
+        self.packed_max = sum(n << (COUNT_BITS * letter) for letter, n in enumerate(self.max_counts))
+
+    def update(self, word: str, feedback_list: list[Feedback]):
+        """! Narrows the constraints with the true feedback to a guess
+        @param self   The object self reference of type Constraints
+        @param word   The guessed word
+        @param feedback_list   Feedback for each letter of the word
+        """
+        word = word.upper()
+        marked = [0] * 26   # copies found (correct or present) per letter in this guess
+        capped = [False] * 26
+        for i, (letter, feedback) in enumerate(zip(word, feedback_list)):
+            index = ord(letter) - ord("A")
+            if feedback == Feedback.correct:
+                self.position_masks[i] = 1 << index
+                marked[index] += 1
+            else:
+                self.position_masks[i] &= ~(1 << index)
+                if feedback == Feedback.present:
+                    marked[index] += 1
+                else:
+                    # An incorrect copy means the answer has no more copies than were found
+                    capped[index] = True
+
+        for index in set(ord(letter) - ord("A") for letter in word):
+            self.min_counts[index] = max(self.min_counts[index], marked[index])
+            if capped[index]:
+                self.max_counts[index] = min(self.max_counts[index], marked[index])
+        self.pack()
+
+    def allows(self, word: str):
+        """! Checks a word against the constraints with three integer operations
+        @param self   The object self reference of type Constraints
+        @param word   The word to check
+        @return  boolean - True if the word could still be the answer
+        """
+        (letters, counts) = word_masks(word)
+        if letters & ~self.allowed: return False
+        # Every field of counts - min (and max - counts) must stay at or above zero
+        if ((counts | GUARDS) - self.packed_min) & GUARDS != GUARDS: return False
+        return ((self.packed_max | GUARDS) - counts) & GUARDS == GUARDS
+
+    def allows_all(self, letters: np.ndarray, counts: np.ndarray):
+        """! allows() for many words at once
+        @param letters  (N, length) uint8 letters of the words, see utils.patterns.encode_words
+        @param counts  (N, 26) copies of each letter, see utils.patterns.letter_counts
+        @return  bool array, True where the word could still be the answer
+        """
+        masks = np.array(self.position_masks, dtype=np.int64)
+        allowed = ((masks >> letters.astype(np.int64)) & 1).all(axis=1)
+        return allowed & (counts >= self.min_counts).all(axis=1) & (counts <= self.max_counts).all(axis=1)
+
+    def copy(self):
+        constraints = Constraints(self.word_length)
+        constraints.position_masks = list(self.position_masks)
+        constraints.min_counts = list(self.min_counts)
+        constraints.max_counts = list(self.max_counts)
+        constraints.pack()
+        return constraints
+
+    def possible_letters(self):
+        # Allowed letters of each position as strings, Ex. ["QWERTY...", "A", ...]
+        return ["".join(c for c in KEYBOARD_ORDER if mask & letter_bit(c)) for mask in self.position_masks]
+
+    def present_letters(self):
+        # Letters known to be in the answer somewhere not yet pinned down, Ex. "EA"
+        present = ""
+        for c in KEYBOARD_ORDER:
+            fixed = sum(1 for mask in self.position_masks if mask == letter_bit(c))
+            if self.min_counts[ord(c) - ord("A")] > fixed:
+                present += c
+        return present
@@ -0,0 +1,92 @@
+import random
+
+from assets.lexicon import GUESS_WORDS, VALID_WORDS
+from classes.Feedback import Feedback
+
+
+def score_word(guess: str, answer: str):
+    """! True feedback for a guess: correct letters first, then present letters left to
+    right while the answer has copies that are not already matched
+    @param guess  The guessed word
+    @param answer  The word being guessed
+    @return  list[Feedback] - one per letter
+    """
+    guess = guess.upper()
+    answer = answer.upper()
+    feedback = [Feedback.incorrect for _ in guess]
+    unused: dict[str, int] = {}
+    for i, (g, a) in enumerate(zip(guess, answer)):
+        if g == a:
+            feedback[i] = Feedback.correct
+        else:
+            unused[a] = unused.get(a, 0) + 1
+    for i, g in enumerate(guess):
+        if feedback[i] != Feedback.correct and unused.get(g, 0) > 0:
+            feedback[i] = Feedback.present
+            unused[g] -= 1
+    return feedback
+
+
+def add_lies(feedback: list[Feedback], lie_indexes: list[int], rng: random.Random):
+    """! The feedback shown to the player, every lie position shows one of the two wrong values
+    @return  list[Feedback]
+    """
+    shown = list(feedback)
+    for i in lie_indexes:
+        possible_feedbacks = [Feedback.incorrect, Feedback.present, Feedback.correct]
+        possible_feedbacks.remove(feedback[i])
+        shown[i] = rng.choice(possible_feedbacks)
+    return shown
+
+
+# Synchronous Wordle/Fibble game: a secret word, lie positions and guesses in, feedback out
+# Has no pygame, thread or LLM code so simulations can run many games quickly
+class Engine:
+    def __init__(self, num_guesses: int = 6, num_lies: int = 0, seed: int | None = None):
+        self.num_guesses = num_guesses
+        self.num_lies = num_lies
+        self.rng = random.Random(seed)
+        self.reset()
+
+    def reset(self, answer: str | None = None, lie_indexes: list[int] | None = None):
+        """! Starts a new game, the answer and lie positions are random unless given
+        @param self   The object self reference of type Engine
+        @param answer  The word to guess
+        @param lie_indexes  Positions whose feedback lies in every row
+        """
+        self.answer = (answer or self.rng.choice(GUESS_WORDS)).upper()
+        if lie_indexes is None:
+            lie_indexes = self.rng.sample(range(len(self.answer)), self.num_lies)
+        self.lie_indexes = list(lie_indexes)
+        self.guesses: list[str] = []
+        self.feedback: list[list[Feedback]] = []           # as shown to the player
+        self.internal_feedback: list[list[Feedback]] = []  # without lies
+        self.success = False
+
+    def is_valid(self, word: str):
+        return len(word) == len(self.answer) and word.lower() in VALID_WORDS
+
+    def num_of_tries(self):
+        return len(self.guesses)
+
+    def is_over(self):
+        return self.success or self.num_of_tries() >= self.num_guesses
+
+    def guess(self, word: str):
+        """! Plays a guess
+        @param self   The object self reference of type Engine
+        @param word   The guessed word, must be in VALID_WORDS
+        @return  (shown feedback, true feedback)
+        """
+        if self.is_over():
+            raise ValueError("The game is over")
+        if not self.is_valid(word):
+            raise ValueError(f"Not a valid word: {word}")
+        word = word.upper()
+        internal = score_word(word, self.answer)
+        shown = add_lies(internal, self.lie_indexes, self.rng)
+        self.guesses.append(word)
+        self.feedback.append(shown)
+        self.internal_feedback.append(internal)
+        self.success = word == self.answer
+        return (shown, internal)
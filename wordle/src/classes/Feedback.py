@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+# enum to hold feedback values for LetterCells
+class Feedback(Enum):
+    incorrect = "incorrect"  # letter is not present in word
+    present = "present"  # letter is present in the word, but in different spot
+    correct = "correct"  # letter is in correct spot in the word
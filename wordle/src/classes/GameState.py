@@ -14,15 +14,19 @@ from openai import OpenAI, OpenAIError
 from openai.types.chat import ChatCompletionMessageParam
 from ollama import chat, ChatResponse, Client
 
-from assets.guess_words import GUESS_WORDS
+from assets.lexicon import VALID_WORDS
 from classes.Button import Button
+from classes.Engine import Engine
 from classes.LetterButton import LetterButton
-from classes.LetterCell import Feedback
+from classes.Feedback import Feedback
+from classes.HintEngine import HintEngine
 from classes.Solver import Solver
+from classes.Trie import word_trie
 from classes.Word import Word
 from constants import *
 from firebase import get_db, initialize_firebase, log_game
 from utils.calculate_dynamic_widths import calculate_dynamic_widths
+from utils.patterns import feedback_to_code
 from utils.prompts import generate_guess_reasoning, generate_messages
 from visuals.config_screen import config_screen
 from visuals.end_screen import end_screen
@@ -40,7 +44,8 @@ class Status(Enum):
 
 # class to hold the game state
 class GameState:
-    def __init__(self, show_window: bool = True, disable_animations: bool = False, logging: bool = True):
+    def __init__(self, show_window: bool = True, disable_animations: bool = False, logging: bool = True,
+                 seed: int | None = None):
         self.db: firestore.Client | None = None
 
         self.api_key_valid: bool = True
@@ -64,8 +69,10 @@ class GameState:
         self.ai_strikeout = False
         self.ai_timeout = False
         self.ai_consecutive_invalid_guesses = 0
-        self.lie_indexes: list[int] = []
-        self.actual_word = random.choice(GUESS_WORDS).upper()
+        # game rules and the secret word, everything else here is display and players
+        self.engine = Engine(self.num_guesses, self.num_lies, seed)
+        self.lie_indexes: list[int] = list(self.engine.lie_indexes)
+        self.actual_word = self.engine.answer
         self.word_length = len(self.actual_word)
         self.words = [
             Word(
@@ -160,6 +167,8 @@ class GameState:
 
         self.solver = Solver()
         self.solver_active = False
+        self.hint_engine = HintEngine()
+        self.hint_engine.prepare(self.hint_history(), self.num_lies)
 
         self.keyboard: list[list[LetterButton]] | None = None
         self.solve_button: Button | None = None
@@ -194,7 +203,22 @@ class GameState:
                 (LETTER_GRID_WIDTH - border_offset_x * 2) / 4 - 3, 40
             ), 0, 4, bg, "LLM", 40, tc)
 
-    def reset(self):
+    def reset(self, answer: str | None = None, lie_indexes: list[int] | None = None,
+              num_guesses: int | None = None, seed: int | None = None):
+        """! Starts a new game, random unless a scenario (utils/scenarios.py) fixes it
+        @param self   The object self reference of type GameState
+        @param answer  The word to guess, random if None
+        @param lie_indexes  Positions whose feedback lies, also sets the number of lies
+        @param num_guesses  Guess limit, the current one if None
+        @param seed  Picks the lies, Ex. scenario["seed"]
+        """
+        if num_guesses is not None:
+            self.num_guesses = num_guesses
+        if lie_indexes is not None:
+            self.num_lies = len(lie_indexes)
+        if seed is not None:
+            self.engine.rng.seed(seed)
+
         if self.show_window:
             # make sure buttons are in correct position
             border_offset_x = calculate_dynamic_widths(self.num_guesses)[1]
@@ -220,12 +244,11 @@ class GameState:
                 for button in row:
                     button.feedback = None
 
-        possible_positions = [i for i in range(WORD_LENGTH)]
+        self.engine.num_guesses = self.num_guesses
+        self.engine.num_lies = self.num_lies
+        self.engine.reset(answer, lie_indexes)
         self.lie_indexes.clear()
-        for _ in range(self.num_lies):
-            index = random.choice(possible_positions)
-            self.lie_indexes.append(index)
-            possible_positions.remove(index)
+        self.lie_indexes.extend(self.engine.lie_indexes)
 
         self.status = Status.game
         self.success = False
@@ -233,7 +256,7 @@ class GameState:
         self.was_valid_guess = False
         self.ai_strikeout = False
         self.ai_timeout = False
-        self.actual_word = random.choice(GUESS_WORDS).upper()
+        self.actual_word = self.engine.answer
         self.words = [
             Word(
                 self.actual_word,
@@ -245,7 +268,16 @@ class GameState:
 
         self.total_llm_guesses = []
         self.solver_active = False
+        self.solver.num_lies = self.num_lies
+        self.solver.num_guesses = self.num_guesses
         self.solver.reset()
+        self.hint_engine.clear()
+        self.hint_engine.prepare(self.hint_history(), self.num_lies)
+
+    def hint_history(self):
+        # every row so far as (guess, shown feedback code), the key of the hint engine
+        return tuple((guess, feedback_to_code(feedback))
+                     for guess, feedback in zip(self.engine.guesses, self.engine.feedback))
 
     # helper function to set the correct callback function for each key
 
@@ -280,7 +312,9 @@ class GameState:
             self.handle_check_word()
 
     def enter_single_guess_from_solver(self, overload_guess: str | None = None, check: bool = True):
-        guess = overload_guess or self.solver.get_guess()
+        # the best ranked hint, or any remaining word while the ranking is still being worked out
+        guess = overload_guess or self.hint_engine.best(self.hint_history(), self.num_lies) or \
+            random.choice(self.solver.possible_guesses)
         self.clear_guess()
 
         letters_to_add = (
@@ -445,12 +479,16 @@ class GameState:
 
             response = org_response.replace("Guess: ", "").replace(
                 "My first guess is: ", "").replace("Okay, let's begin!", "")
-            response = re.search(r'\b\w{5}\b', response)
-            if response:
-                completion_message = response.group(0)
+            match = re.search(r'\b\w{5}\b', response)
+            if match:
+                completion_message = match.group(0)
             else:
                 completion_message = ""
 
+            if SNAP_LLM_GUESSES and completion_message.lower() not in VALID_WORDS:
+                snapped = word_trie(VALID_WORDS).snap(response, self.solver.constraints)
+                completion_message = snapped.upper() if snapped else completion_message
+
             if len(completion_message) == WORD_LENGTH:
                 reasons = self.solver.reason_guess(completion_message)
                 messages.append({"role": "assistant", "content": org_response})
@@ -666,7 +704,6 @@ class GameState:
             current_word = self.words[self.current_word_index]
             guessed_word = current_word.guessed_word
             word_feedback = current_word.get_feedback()
-            internal_word_feedback = current_word.get_internal_feedback()
 
             update = False
             for i in reversed(range(len(self.total_llm_guesses))):
@@ -678,17 +715,19 @@ class GameState:
                     else:
                         llm_guess["accepted"] = False
 
+            # the solver sees what the player sees, lies included
             self.solver.update_guesses(
-                current_word.guessed_word, internal_word_feedback)
+                current_word.guessed_word, word_feedback)
             self.apply_keyboard_feedback(
                 current_word.guessed_word, word_feedback
             )
+            if not self.engine.is_over():
+                self.hint_engine.prepare(self.hint_history(), self.num_lies)
 
-            if self.words[self.current_word_index].word_complete() or \
-                    self.num_of_tries() == self.num_guesses:
+            if self.engine.is_over():
                 self.status = Status.end
 
-                if self.words[self.current_word_index].word_complete():
+                if self.engine.success:
                     self.success = True
 
                 if self.db:
@@ -708,11 +747,25 @@ class GameState:
                 if self.solver_active:
                     self.enter_word_from_solver()
 
-        if self.words[self.current_word_index].handle_check_word():
+        current_word = self.words[self.current_word_index]
+        if current_word.locked or self.engine.is_over():
+            accepted = False
+        elif self.engine.is_valid(current_word.guessed_word):
+            accepted = current_word.handle_check_word(
+                self.engine.guess(current_word.guessed_word))
+        else:
+            # not a word, shakes the row
+            accepted = current_word.handle_check_word()
+
+        if accepted:
             self.was_valid_guess = True
             self.ai_consecutive_invalid_guesses = 0
+            if self.disable_animations:
+                check_correct()
+                return
+
             delay = (FEEDBACK_DIFF_DURATION * 4 +
-                     ANIMATION_DURATION) / 1000 if not self.disable_animations else 0
+                     ANIMATION_DURATION) / 1000
             Timer(
                 delay, check_correct
             ).start()
@@ -0,0 +1,78 @@
+import threading
+from functools import lru_cache
+from math import comb
+
+import numpy as np
+
+from assets.lexicon import GUESS_WORDS
+from classes.Solver import Solver, answer_guess_indexes
+from constants import HINT_CACHE_SIZE, HINT_RANKING_SIZE, WORD_LENGTH
+from utils.patterns import code_to_feedback, hamming_table, partition_counts
+
+
+@lru_cache(maxsize=HINT_CACHE_SIZE)
+def rank_hints(history: tuple[tuple[str, int], ...], num_lies: int):
+    """! Words that can still be the answer, the ones whose feedback tells the most first
+    @param history  (guess, shown feedback code) of every row so far, Ex. (("SOARE", 17),)
+    @param num_lies  Lies in every row of feedback
+    @return  tuple of up to HINT_RANKING_SIZE lowercase words
+    """
+    solver = Solver("random", "candidates", num_lies)
+    for (guess, code) in history:
+        solver.update_guesses(guess, code_to_feedback(code, WORD_LENGTH))
+    answers = solver.answers
+    if len(answers) <= 2:
+        return tuple(GUESS_WORDS[i] for i in answers)
+
+    counts = partition_counts(answers, answer_guess_indexes()[answers]).astype(np.float32)
+    if num_lies > 0:
+        # Feedback as shown, every set of lie positions equally likely
+        counts = counts @ ((hamming_table() == num_lies) / (comb(WORD_LENGTH, num_lies) * 2 ** num_lies)).astype(np.float32)
+    p = counts / len(answers)
+    information = -(p * np.log2(np.where(p > 0, p, 1))).sum(axis=1)
+    order = np.argsort(-information, kind="stable")[:HINT_RANKING_SIZE]
+    return tuple(GUESS_WORDS[answers[i]] for i in order)
+
+
+# Works out hints in the background as soon as feedback arrives, so asking for one never waits
+class HintEngine:
+    def __init__(self):
+        # (history, lies) -> ranked hints, only for states of the current game
+        self.results: dict[tuple, tuple[str, ...]] = {}
+        self.pending: set[tuple] = set()
+        self.lock = threading.Lock()
+
+    def clear(self):
+        with self.lock:
+            self.results.clear()
+            self.pending.clear()
+
+    def prepare(self, history: tuple[tuple[str, int], ...], num_lies: int):
+        """! Starts ranking the hints of a state on a background thread
+        @param self   The object self reference of type HintEngine
+        @param history  (guess, shown feedback code) of every row so far
+        @param num_lies  Lies in every row of feedback
+        """
+        key = (history, num_lies)
+        with self.lock:
+            if key in self.results or key in self.pending:
+                return
+            self.pending.add(key)
+        threading.Thread(target=self.work, args=(key,), daemon=True).start()
+
+    def work(self, key: tuple):
+        ranking = rank_hints(*key)
+        with self.lock:
+            # A game reset while ranking drops the result
+            if key in self.pending:
+                self.pending.discard(key)
+                self.results[key] = ranking
+
+    def ranked(self, history: tuple[tuple[str, int], ...], num_lies: int):
+        # The ranked hints if they are ready, None while they are being worked out
+        with self.lock:
+            return self.results.get((history, num_lies))
+
+    def best(self, history: tuple[tuple[str, int], ...], num_lies: int):
+        ranking = self.ranked(history, num_lies)
+        return ranking[0] if ranking else None
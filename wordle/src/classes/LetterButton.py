@@ -1,7 +1,7 @@
 import pygame
 from classes.Button import Button
 from typing import Callable
-from classes.LetterCell import Feedback
+from classes.Feedback import Feedback
 from constants import *
 
 
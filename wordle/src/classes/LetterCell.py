@@ -1,20 +1,12 @@
-from enum import Enum
-
 import pygame
 
 from classes.AnimationObject import AnimationObject
+from classes.Feedback import Feedback
 from constants import *
 from utils.calculate_dynamic_widths import calculate_dynamic_widths
 from utils.visual_utils import draw_text
 
 
-# enum to hold feedback values for LetterCells
-class Feedback(Enum):
-    incorrect = "incorrect"  # letter is not present in word
-    present = "present"  # letter is present in the word, but in different spot
-    correct = "correct"  # letter is in correct spot in the word
-
-
 # Class to hold the information of every letter typed by user
 class LetterCell(AnimationObject):
     def __init__(self, position: int):
@@ -23,6 +15,8 @@ class LetterCell(AnimationObject):
         self.position = position
         self.feedback: Feedback | None = None
         self.internal_feedback: Feedback | None = None
+        # no valid word starts with the letters typed up to this one
+        self.dead = False
 
     def draw_cell(self, screen: pygame.Surface, verticlePos: int, num_guesses: int):
         # colors used to display LetterCells
@@ -30,6 +24,7 @@ class LetterCell(AnimationObject):
         yellow = (181, 159, 59)
         green = (83, 141, 78)
         white = (255, 255, 255)
+        red = (231, 76, 60)
 
         cell_width, border_offset_x = calculate_dynamic_widths(num_guesses)
 
@@ -67,4 +62,5 @@ class LetterCell(AnimationObject):
         # generate text to display the letters
         draw_text('Franklin Gothic', int(cell_width),
                   self.value if self.value else "",
-                  (x_pos_centered, y_pos_centered + y - 1), white, screen)
+                  (x_pos_centered, y_pos_centered + y - 1),
+                  red if self.dead and self.feedback is None else white, screen)
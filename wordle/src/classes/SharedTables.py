@@ -0,0 +1,71 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Tables this process reads from shared memory, {table name: read only array}
+# Filled by attach_tables in worker processes, empty everywhere else
+ATTACHED: dict[str, np.ndarray] = {}
+# The blocks behind ATTACHED, kept open for as long as the process uses the arrays
+_blocks: list[shared_memory.SharedMemory] = []
+
+
+def shared_table(name: str):
+    # The attached table, None if this process reads its own copy
+    return ATTACHED.get(name)
+
+
+def attach_tables(specs: dict[str, tuple[str, tuple[int, ...], str]]):
+    """! Maps the tables published by a SharedTables into this process, read only
+    @param specs  SharedTables.specs of the parent process
+    @return  {table name: array}
+    """
+    for name, (block_name, shape, dtype) in specs.items():
+        if name in ATTACHED: continue
+        block = shared_memory.SharedMemory(block_name)
+        array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        array.flags.writeable = False
+        _blocks.append(block)
+        ATTACHED[name] = array
+    return ATTACHED
+
+
+# Copies tables into shared memory once, so worker processes all read the same pages instead of
+# each loading its own copy, Ex.
+#   with SharedTables() as tables:
+#       tables.publish("patterns", pattern_matrix())
+#       Pool(workers, initializer=attach_tables, initargs=(tables.specs,))
+# The blocks are freed when the with block ends, workers must be done by then
+class SharedTables:
+    def __init__(self):
+        # {table name: (block name, shape, dtype)}, small enough to send to every worker
+        self.specs: dict[str, tuple[str, tuple[int, ...], str]] = {}
+        self.blocks: dict[str, shared_memory.SharedMemory] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def publish(self, name: str, array: np.ndarray):
+        """! Copies an array into a new shared memory block
+        @param self   The object self reference of type SharedTables
+        @param name  What workers look the table up by, Ex. "patterns"
+        @param array  Any numpy array, Ex. the memory mapped pattern matrix
+        """
+        if name in self.blocks:
+            raise ValueError(f"Table {name} is already published")
+        array = np.ascontiguousarray(array)
+        # A block can't be empty, so an empty table still takes a byte
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        self.blocks[name] = block
+        self.specs[name] = (block.name, array.shape, array.dtype.str)
+
+    def close(self):
+        # Frees every block, safe to call more than once
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+        self.blocks.clear()
+        self.specs.clear()
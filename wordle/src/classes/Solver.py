@@ -1,44 +1,120 @@
 import random
+from functools import lru_cache
 
-from assets.guess_words import GUESS_WORDS
-from classes.LetterCell import Feedback
-from constants import WORD_LENGTH
+import numpy as np
+
+from assets.lexicon import GUESS_WORDS, VALID_WORDS
+from classes.Feedback import Feedback
+from classes.SolverState import SolverState, answer_array, initial_state
+from classes.WordIndex import word_index
+from constants import SOLVER_GUESS_POOL, SOLVER_LOOKAHEAD, SOLVER_STRATEGY
+from utils.decision_tree import load_tree, tree_child, tree_guess
+from utils.opening_book import load_opening_book
+from utils.patterns import (ALL_CORRECT, bucket_sizes, consistent_answers, feedback_to_code, guess_entropies,
+                            guess_indexes, hamming_table, pattern_matrix, worst_buckets)
+from utils.posterior import prior, shown_entropies, update_posterior
+
+STRATEGIES = ["random", "entropy", "minimax", "tree", "posterior"]
+# Guesses the minimax lookahead plays a second guess after, by their largest bucket,
+# and the guesses it tries as that second guess
+LOOKAHEAD_WIDTH = 8
+LOOKAHEAD_POOL = 100
+# Guesses the minimax strategy scores, by their information about the true feedback
+MINIMAX_POOL = 500
+# Guesses the posterior strategy scores, by their information about the true feedback
+POSTERIOR_POOL = 500
+GUESS_POOLS = ["candidates", "all"]
 
 
 class Solver:
-    def __init__(self):
-        self.possible_guesses = GUESS_WORDS
-        self.starting_guess = "arise"
-        self.possible_letters: list[str] = [
-            "QWERTYUIOPASDFGHJKLZXCVBNM" for _ in range(WORD_LENGTH)
-        ]
-        self.present_letters = ""
-
-    @staticmethod
-    def filter_guesses(possible_guess: str, possible_letters: list[str], present_letters: str):
-        for i in range(len(possible_guess)):
-            if possible_guess[i] not in possible_letters[i]:
-                return False
-
-        for i in range(len(present_letters)):
-            if present_letters[i] not in possible_guess:
-                return False
-
-        return True
+    def __init__(self, strategy: str = SOLVER_STRATEGY, guess_pool: str = SOLVER_GUESS_POOL, num_lies: int = 0,
+                 lookahead: bool = SOLVER_LOOKAHEAD, num_guesses: int = 6):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown solver strategy: {strategy}")
+        if guess_pool not in GUESS_POOLS:
+            raise ValueError(f"Unknown guess pool: {guess_pool}")
+        self.strategy = strategy
+        self.guess_pool = guess_pool
+        self.lookahead = lookahead
+        # Positions of each row of feedback that lie (Fibble), feedback is taken as shown
+        self.num_lies = num_lies
+        # Guess limit of the game, minimax only guesses words that can be the answer near the end
+        self.num_guesses = num_guesses
+        # Openings per number of lies, the first guess and the second for each feedback shown
+        self.opening_book = load_opening_book()
+        # Everything the feedback so far says, replaced (never changed) by update_guesses
+        self.state = self.initial_state()
+
+    def initial_state(self):
+        if self.strategy == "posterior":
+            return initial_state(weights=prior(len(GUESS_WORDS), self.num_lies))
+        return initial_state(load_tree() if self.strategy == "tree" and self.num_lies == 0 else None)
+
+    @property
+    def answers(self):
+        # Indexes of GUESS_WORDS that can still be the answer, sorted
+        return self.state.answers
+
+    @property
+    def candidates(self):
+        # True for each of GUESS_WORDS that can still be the answer
+        return self.state.mask()
+
+    @property
+    def constraints(self):
+        return self.state.constraints
+
+    @property
+    def tree_node(self):
+        return self.state.tree_node
+
+    @property
+    def opening_reply(self):
+        return self.state.opening_reply
+
+    def answer_probabilities(self):
+        # P(answer) of each of self.answers in the posterior strategy, lie positions summed out
+        return self.state.weights.sum(axis=1)
+
+    @property
+    def possible_guesses(self):
+        # Words that can still be the answer
+        return [GUESS_WORDS[i] for i in self.answers]
+
+    @property
+    def starting_guess(self):
+        # The book opening for the number of lies, "arise" without a book
+        book = self.opening_book.get(self.num_lies)
+        return book["first"] if book else "arise"
+
+    @property
+    def possible_letters(self):
+        # Letters still allowed at each position, Ex. ["QWERTY...", "A", ...]
+        return self.constraints.possible_letters()
+
+    @property
+    def present_letters(self):
+        # Letters in the answer whose position is not known yet, Ex. "EA"
+        return self.constraints.present_letters()
 
     def reason_guess(self, guess: str):
+        # A guess the constraints allow has nothing to explain, one bit test on the index
+        if word_index(VALID_WORDS).has(word_index(VALID_WORDS).matching(self.constraints), guess):
+            return []
+
         reasons = []
         guess = guess.upper()
+        possible_letters = self.possible_letters
 
         for i, guess_letter in enumerate(guess):
-            if len(self.possible_letters[i]) == 1 and \
-                    guess_letter not in self.possible_letters[i]:
+            if len(possible_letters[i]) == 1 and \
+                    guess_letter not in possible_letters[i]:
                 reasons.append(
-                    ("SBC", guess_letter, self.possible_letters[i])
+                    ("SBC", guess_letter, possible_letters[i])
                 )
-            elif guess_letter not in self.possible_letters[i]:
+            elif guess_letter not in possible_letters[i]:
                 reasons.append(
-                    ("NP", guess_letter, self.possible_letters[i])
+                    ("NP", guess_letter, possible_letters[i])
                 )
 
         for present_letter in self.present_letters:
@@ -48,52 +124,201 @@ class Solver:
         return reasons
 
     def num_possible_guesses(self):
-        return len(self.possible_guesses)
+        return self.state.num_answers()
+
+    def guesses_left(self):
+        return self.num_guesses - self.state.tries
+
+    def snapshot(self):
+        """! Everything update_guesses changes, to go back to with restore(). States are never
+        changed, so this copies nothing and any number of snapshots can be kept
+        @param self   The object self reference of type Solver
+        @return  SolverState
+        """
+        return self.state
+
+    def restore(self, snapshot: SolverState):
+        self.state = snapshot
 
     def reset(self):
-        self.possible_guesses = GUESS_WORDS
-        self.possible_letters = [
-            "QWERTYUIOPASDFGHJKLZXCVBNM" for _ in range(WORD_LENGTH)
-        ]
-        self.present_letters = ""
+        self.state = self.initial_state()
 
     def get_guess(self):
-        if len(self.possible_guesses) > 0:
-            if len(self.possible_guesses) == len(GUESS_WORDS):
+        num_candidates = self.num_possible_guesses()
+        if num_candidates > 0:
+            if self.tree_node is not None:
+                return tree_guess(self.tree_node)
+
+            if num_candidates == len(GUESS_WORDS):
                 return self.starting_guess
 
+            if self.opening_reply is not None and self.strategy in ("entropy", "tree", "posterior") \
+                    and self.guess_pool == "all":
+                return self.opening_reply
+
+            # The tree strategy continues with entropy once off the tree
+            if self.strategy in ("entropy", "tree"):
+                return self.get_entropy_guess()
+
+            if self.strategy == "minimax":
+                return self.get_minimax_guess()
+
+            if self.strategy == "posterior":
+                return self.get_posterior_guess()
+
             return random.choice(self.possible_guesses)
 
         raise Exception("No Possible Words")
 
+    def get_entropy_guess(self):
+        """! The guess whose feedback patterns split the remaining words most evenly
+        @param self   The object self reference of type Solver
+        @return  str - guessed word
+        """
+        answers = self.answers
+        if len(answers) <= 2:
+            return GUESS_WORDS[answers[0]]
+
+        own = answer_guess_indexes()[answers]
+        if self.guess_pool == "candidates":
+            scores = guess_entropies(answers, own)
+            return GUESS_WORDS[answers[int(np.argmax(scores))]]
+
+        scores = guess_entropies(answers)
+        # On a tie prefer a word that can still be the answer
+        scores[own] += 1e-9
+        return VALID_WORDS[int(np.argmax(scores))]
+
+    def get_minimax_guess(self):
+        """! The guess whose largest group of words left after its feedback is smallest, out of
+        the words that can still be the answer and (guess pool "all") the MINIMAX_POOL words of
+        most entropy. Once the words left after one of the first can be guessed one by one in
+        the guesses left, or on the last guess, only those words are guessed
+        @param self   The object self reference of type Solver
+        @return  str - guessed word
+        """
+        answers = self.answers
+        if len(answers) <= 2:
+            return GUESS_WORDS[answers[0]]
+
+        own = answer_guess_indexes()[answers]
+        own_worst = worst_buckets(answers, own, self.num_lies)
+        guesses_left = self.guesses_left()
+        if self.guess_pool == "candidates" or guesses_left <= 1 or own_worst.min() < guesses_left:
+            (guesses, worst) = (own, own_worst)
+        else:
+            top = np.argsort(-guess_entropies(answers), kind="stable")[:MINIMAX_POOL]
+            guesses = np.union1d(top, own)
+            worst = worst_buckets(answers, guesses, self.num_lies)
+        # A word that can't be the answer spends a guess it can't win with, it has to leave a
+        # third fewer words in the worst case: three times the worst case for it, twice less one
+        # (the tie break) for a word that can be the answer
+        can_win = np.isin(guesses, own)
+        scores = np.where(can_win, 2 * worst - 1, 3 * worst)
+        if not self.lookahead:
+            return VALID_WORDS[int(guesses[int(np.argmin(scores))])]
+
+        order = np.argsort(scores, kind="stable")
+        second_guesses = guesses[order[:LOOKAHEAD_POOL]]
+        best = (float("inf"), order[0])
+        for choice in order[:LOOKAHEAD_WIDTH]:
+            value = self.lookahead_worst(answers, int(guesses[choice]), second_guesses, best[0])
+            if value < best[0]: best = (value, choice)
+        return VALID_WORDS[int(guesses[best[1]])]
+
+    def get_posterior_guess(self):
+        """! The guess whose feedback as shown, lies included, tells the most about the
+        (answer, lie positions) posterior; with two answers left, the more likely one
+        @param self   The object self reference of type Solver
+        @return  str - guessed word
+        """
+        answers = self.answers
+        probabilities = self.answer_probabilities()
+        if len(answers) <= 2:
+            return GUESS_WORDS[answers[int(np.argmax(probabilities))]]
+
+        own = answer_guess_indexes()[answers]
+        if self.guess_pool == "candidates":
+            guesses = own
+        else:
+            top = np.argsort(-guess_entropies(answers), kind="stable")[:POSTERIOR_POOL]
+            guesses = np.union1d(top, own)
+        scores = shown_entropies(answers, self.state.weights, guesses, self.num_lies)
+        # On a tie the likeliest answer, guessing it may win
+        chance = np.zeros(len(VALID_WORDS))
+        chance[own] = probabilities
+        scores += 1e-9 * chance[guesses]
+        return VALID_WORDS[int(guesses[int(np.argmax(scores))])]
+
+    def lookahead_worst(self, answers: np.ndarray, guess: int, guesses: np.ndarray, bound: float):
+        """! Words left in the worst case after guess and the best of guesses that follows,
+        stops once it reaches bound
+        @return  number of words, or bound if it is not below bound
+        """
+        sizes = bucket_sizes(answers, np.array([guess]), self.num_lies)[0]
+        codes = pattern_matrix()[answers, guess]
+        if self.num_lies > 0:
+            # (shown, answer) answer stays, guess itself would have won
+            near = (hamming_table()[:, codes] == self.num_lies) & (codes != ALL_CORRECT)
+        worst = 0
+        # Biggest buckets first, a bucket no bigger than the worst so far can not raise it
+        for shown in np.argsort(-sizes, kind="stable"):
+            if sizes[shown] <= worst: break
+            if sizes[shown] <= 2:
+                # Guess one of them, the other is left
+                worst = max(worst, sizes[shown] - 1)
+                continue
+            bucket = answers[near[shown]] if self.num_lies > 0 else answers[codes == shown]
+            worst = max(worst, int(worst_buckets(bucket, guesses, self.num_lies).min()))
+            if worst >= bound: return bound
+        return worst
+
     def update_guesses(self, word: str, feedback_list: list[Feedback]):
-        for i in range(len(word)):
-            match feedback_list[i]:
-                case Feedback.correct:
-                    self.possible_letters[i] = word[i]
-                case Feedback.present:
-                    self.possible_letters[i] = self.possible_letters[i].replace(
-                        word[i].upper(), ""
-                    )
-                    if self.present_letters.find(word[i].upper()) == -1:
-                        self.present_letters += word[i].upper()
-                case Feedback.incorrect:
-                    self.possible_letters[i] = self.possible_letters[i].replace(
-                        word[i].upper(), ""
-                    )
-                    letters_present = False
-                    for j in range(len(word)):
-                        if word[i] == word[j] and feedback_list[j] == Feedback.present:
-                            letters_present = True
-                            break
-
-                    if not letters_present:
-                        for j in range(len(word)):
-                            if word[j] != word[i]:
-                                self.possible_letters[j] = self.possible_letters[j].replace(
-                                    word[i].upper(), ""
-                                )
-
-        self.possible_guesses = list(filter(lambda x: self.filter_guesses(
-            x.upper(), self.possible_letters, self.present_letters), self.possible_guesses)
-        )
+        self.state = self.next_state(self.state, word, feedback_list)
+
+    def next_state(self, state: SolverState, word: str, feedback_list: list[Feedback]):
+        """! The state after feedback to a guess, state itself is left as it is, so a search can
+        try many feedbacks from one state, Ex. solver.next_state(solver.state, "SOARE", feedback)
+        @param self   The object self reference of type Solver
+        @param state   The state before the guess
+        @param word   The guessed word
+        @param feedback_list   The feedback shown for the guess
+        @return  SolverState
+        """
+        code = feedback_to_code(feedback_list)
+        book = self.opening_book.get(self.num_lies)
+        opening_reply = None
+        if book and state.num_answers() == len(GUESS_WORDS) and word.lower() == book["first"]:
+            opening_reply = book["second"].get(str(code))
+
+        tree_node = state.tree_node
+        if tree_node is not None:
+            tree_node = tree_child(tree_node, code) if word.lower() == tree_guess(tree_node) else None
+
+        if self.strategy == "posterior":
+            (answers, weights) = update_posterior(state.answers, state.weights, word, code, self.num_lies)
+            constraints = state.constraints
+            if self.num_lies == 0:
+                constraints = constraints.copy()
+                constraints.update(word, feedback_list)
+            return SolverState(answer_array(answers), constraints, tree_node, opening_reply, weights, state.tries + 1)
+
+        if self.num_lies > 0:
+            # Keeps the words whose true feedback differs from the feedback shown in exactly
+            # num_lies positions. Letter constraints are not kept, any single letter may be a lie
+            keep = consistent_answers(state.answers, word, code, self.num_lies)
+            return SolverState(answer_array(state.answers[keep]), state.constraints, tree_node, opening_reply,
+                               tries=state.tries + 1)
+
+        constraints = state.constraints.copy()
+        constraints.update(word, feedback_list)
+        index = word_index(GUESS_WORDS)
+        allowed = index.to_mask(index.matching(constraints))
+        return SolverState(answer_array(state.answers[allowed[state.answers]]), constraints, tree_node, opening_reply,
+                           tries=state.tries + 1)
+
+
+@lru_cache(maxsize=None)
+def answer_guess_indexes():
+    # Index in VALID_WORDS of each of GUESS_WORDS
+    return np.array([guess_indexes()[word.upper()] for word in GUESS_WORDS])
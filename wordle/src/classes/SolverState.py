@@ -0,0 +1,48 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from assets.lexicon import GUESS_WORDS
+from classes.Constraints import Constraints
+from constants import WORD_LENGTH
+
+# Smallest type that holds an index of GUESS_WORDS
+ANSWER_DTYPE = np.uint16 if len(GUESS_WORDS) <= np.iinfo(np.uint16).max else np.uint32
+
+
+def answer_array(answers):
+    # Read only, so states can share it instead of copying
+    answers = np.asarray(answers, dtype=ANSWER_DTYPE)
+    answers.flags.writeable = False
+    return answers
+
+
+# What the solver knows after some rows of feedback. A state is never changed once made:
+# feedback makes a new state, so keeping an old one is all it takes to go back to it
+class SolverState(NamedTuple):
+    # Sorted indexes of GUESS_WORDS that can still be the answer
+    answers: np.ndarray
+    # What the true feedback so far says, Ex. Constraints.possible_letters()
+    constraints: Constraints
+    # Current node of the decision tree in the tree strategy, None once off the tree
+    tree_node: list | str | None
+    # Book second guess after the book first guess was played, None otherwise
+    opening_reply: str | None
+    # (answers, lie positions) posterior of the posterior strategy, see utils/posterior.py
+    weights: np.ndarray | None = None
+    # Rows of feedback so far
+    tries: int = 0
+
+    def num_answers(self):
+        return len(self.answers)
+
+    def mask(self):
+        # True for each of GUESS_WORDS that can still be the answer
+        candidates = np.zeros(len(GUESS_WORDS), dtype=bool)
+        candidates[self.answers] = True
+        return candidates
+
+
+def initial_state(tree_node: list | str | None = None, weights: np.ndarray | None = None):
+    # Before any feedback, every answer is possible
+    return SolverState(answer_array(np.arange(len(GUESS_WORDS))), Constraints(WORD_LENGTH), tree_node, None, weights)
@@ -0,0 +1,151 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+
+from assets.lexicon import Lexicon
+from classes.Constraints import Constraints
+from classes.WordIndex import word_index
+
+
+# Prefix tree of a word list, stored as arrays. The words are sorted so every node covers
+# a range of them, Ex. the node of "CR" covers every word starting with CR
+class Trie:
+    def __init__(self, words: Lexicon):
+        self.words = words
+        letters = np.asarray(words.letters)
+        self.word_length = letters.shape[1]
+        # order[k] is the index in words of the kth word in sorted order
+        self.order = np.lexsort(letters.T[::-1])
+        ordered = letters[self.order]
+
+        # Nodes by depth, the root is node 0 covering every word
+        starts = [0]
+        ends = [len(ordered)]
+        children = [np.full(26, -1, dtype=np.int32)]
+        level = np.array([0])   # first node of each range of the previous depth
+        level_starts = np.array([0])
+        for depth in range(self.word_length):
+            changed = np.any(ordered[1:, :depth + 1] != ordered[:-1, :depth + 1], axis=1)
+            new_starts = np.flatnonzero(np.r_[True, changed])
+            new_ends = np.r_[new_starts[1:], len(ordered)]
+            first = len(starts)
+            parents = level[np.searchsorted(level_starts, new_starts, side="right") - 1]
+            for k, (start, parent) in enumerate(zip(new_starts, parents)):
+                children[parent][ordered[start, depth]] = first + k
+                children.append(np.full(26, -1, dtype=np.int32))
+            starts.extend(new_starts.tolist())
+            ends.extend(new_ends.tolist())
+            level = np.arange(first, first + len(new_starts))
+            level_starts = new_starts
+        self.children = np.array(children)
+        self.starts = np.array(starts)
+        self.ends = np.array(ends)
+        # cumulative count of allowed words in sorted order, for the last constraints seen
+        self.allowed_key = None
+        self.allowed_counts = None
+
+    def node(self, prefix: str):
+        """! The node of a prefix, walking one letter at a time
+        @return  int - node id, -1 if no word starts with the prefix
+        """
+        node = 0
+        for letter in prefix.upper():
+            index = ord(letter) - ord("A")
+            if not 0 <= index < 26: return -1
+            node = int(self.children[node, index])
+            if node < 0: return -1
+        return node
+
+    def is_prefix(self, prefix: str):
+        # Whether some word starts with prefix, Ex. "CRA" -> True, "CRX" -> False
+        return len(prefix) <= self.word_length and self.node(prefix) >= 0
+
+    def prefix_words(self, prefix: str):
+        # Indexes in words of every word starting with prefix
+        node = self.node(prefix)
+        if node < 0: return np.array([], dtype=np.int64)
+        return self.order[self.starts[node]:self.ends[node]]
+
+    def allowed_in_order(self, constraints: Constraints):
+        # Running count of the words constraints allow, in sorted order
+        key = (constraints.allowed, constraints.packed_min, constraints.packed_max)
+        if key != self.allowed_key:
+            index = word_index(self.words)
+            allowed = index.to_mask(index.matching(constraints))[self.order]
+            self.allowed_counts = np.r_[0, np.cumsum(allowed)]
+            self.allowed_key = key
+        return self.allowed_counts
+
+    def completions(self, prefix: str, constraints: Constraints | None = None):
+        """! How many words start with prefix
+        @param constraints  Only count words these allow, Ex. Solver.constraints
+        @return  int
+        """
+        node = self.node(prefix)
+        if node < 0 or len(prefix) > self.word_length: return 0
+        if constraints is None: return int(self.ends[node] - self.starts[node])
+        counts = self.allowed_in_order(constraints)
+        return int(counts[self.ends[node]] - counts[self.starts[node]])
+
+    def within(self, letters: str, changes: int):
+        # Sorted positions of the words that differ from letters in exactly changes places
+        found = []
+
+        def search(node: int, depth: int, budget: int):
+            if depth == self.word_length:
+                if budget == 0: found.append(int(self.starts[node]))
+                return
+            target = ord(letters[depth]) - ord("A")
+            for index in np.flatnonzero(self.children[node] >= 0):
+                cost = 0 if index == target else 1
+                if cost <= budget:
+                    search(int(self.children[node, index]), depth + 1, budget - cost)
+
+        search(0, 0, changes)
+        return sorted(found)
+
+    def snap(self, text: str, constraints: Constraints | None = None, max_changes: int = 2):
+        """! The word closest to a partial or garbled guess, Ex. "My guess: CRANE" -> "crane",
+        "CRAMEE" -> "crame", "CRXTE" -> "crate". Words the constraints allow are preferred
+        when several are as close
+        @param text  Any text, a word in it wins, otherwise its last long enough run of letters
+        @param max_changes  Most letters that may be replaced
+        @return  str - lowercase word, None if nothing is close enough
+        """
+        tokens = re.findall(r"[A-Z]+", text.upper())
+        allowed = self.allowed_in_order(constraints) if constraints is not None else None
+
+        def pick(positions):
+            if allowed is not None:
+                for position in positions:
+                    if allowed[position + 1] > allowed[position]:
+                        return self.words[int(self.order[position])]
+            return self.words[int(self.order[positions[0]])] if len(positions) else None
+
+        # Answers are usually at the end, Ex. "My guess is CRANE"
+        for token in reversed(tokens):
+            if len(token) == self.word_length and self.node(token) >= 0:
+                return pick([int(self.starts[self.node(token)])])
+        long_tokens = [token for token in tokens if len(token) >= self.word_length]
+        if not long_tokens:
+            # A partial word, the first word it starts
+            node = self.node(max(tokens, key=len)) if tokens else -1
+            return pick(range(self.starts[node], self.ends[node])) if node > 0 else None
+
+        letters = long_tokens[-1]
+        for start in range(len(letters) - self.word_length + 1):
+            node = self.node(letters[start:start + self.word_length])
+            if node >= 0: return pick([int(self.starts[node])])
+
+        letters = letters[:self.word_length]
+        for changes in range(1, max_changes + 1):
+            positions = self.within(letters, changes)
+            if positions: return pick(positions)
+        return None
+
+
+@lru_cache(maxsize=None)
+def word_trie(words: Lexicon):
+    # One trie per word list, built on first use
+    return Trie(words)
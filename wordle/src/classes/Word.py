@@ -1,11 +1,13 @@
 import random
-from collections import defaultdict
 from threading import Timer
 
 import pygame
 
-from assets.valid_words import VALID_WORDS
-from classes.LetterCell import Feedback, LetterCell
+from assets.lexicon import VALID_WORDS
+from classes.Engine import add_lies, score_word
+from classes.Feedback import Feedback
+from classes.LetterCell import LetterCell
+from classes.Trie import word_trie
 from constants import *
 
 
@@ -25,62 +27,36 @@ class Word:
         for letter in self.letters:
             letter.draw_cell(screen, self.position, num_guesses)
 
-    def check_word(self):
+    def check_word(self, feedback: tuple[list[Feedback], list[Feedback]] | None = None):
+        """! Shows feedback for the guessed word, Engine rules unless feedback is given
+        @param self   The object self reference of type Word
+        @param feedback  (shown feedback, true feedback), Ex. from Engine.guess
+        @return void
+        """
         # function that is used to dispatch the feedback asynchronously
-        def apply_feedback(letter: LetterCell, feedback: Feedback, internal_feedback: Feedback):
-            letter.feedback = feedback
+        def apply_feedback(letter: LetterCell, shown_feedback: Feedback, internal_feedback: Feedback):
+            letter.feedback = shown_feedback
             letter.internal_feedback = internal_feedback
             if not self.disable_animation:
                 letter.start_jump_animation(
                     ANIMATION_JUMP_HEIGHT, ANIMATION_DURATION
                 )
 
-        # create frequency map of letters from user inputted word
-        freq_map = defaultdict(int)
-        for letter in self.actual_word:
-            freq_map[letter] += 1
+        if feedback is None:
+            internal = score_word(self.guessed_word, self.actual_word)
+            feedback = (add_lies(internal, self.lie_indexes, random), internal)
+        (shown, internal) = feedback
 
-        # loop through all user inputted letters and set feedback accordingly
         for i in range(self.word_length):
-            letter = self.letters[i]
-            internal_feedback: Feedback | None = None
-
-            if freq_map[letter.value] > 0:
-                # letter is in correct position
-                if letter.value == self.actual_word[i]:
-                    internal_feedback = Feedback.correct
-                    freq_map[letter.value] -= 1
-                else:
-                    num_future_correct = 0
-
-                    # check future positions for correctness to take precedence
-                    for j in range(i + 1, self.word_length):
-                        future_letter = self.letters[j]
-
-                        if future_letter.value == self.actual_word[j] and future_letter.value == letter.value:
-                            num_future_correct += 1
-
-                    if freq_map[letter.value] > num_future_correct:  # letter is present
-                        internal_feedback = Feedback.present
-                        freq_map[letter.value] -= 1
-                    else:  # letter is present, but correct for every letter to the right of it -> show incorrect
-                        internal_feedback = Feedback.incorrect
-            else:
-                internal_feedback = Feedback.incorrect
-
-            if i in self.lie_indexes:
-                possible_feedbacks = [Feedback.incorrect,
-                                      Feedback.present, Feedback.correct]
-                possible_feedbacks.remove(internal_feedback)
-                temp_feedback = random.choice(possible_feedbacks)
-            else:
-                temp_feedback = internal_feedback
+            if self.disable_animation:
+                apply_feedback(self.letters[i], shown[i], internal[i])
+                continue
 
             # create and run timer to dispatch feedback asynchronously
-            delay = FEEDBACK_DIFF_DURATION / 1000 * i if not self.disable_animation else 0
+            delay = FEEDBACK_DIFF_DURATION / 1000 * i
             Timer(
                 delay,
-                apply_feedback, (letter, temp_feedback, internal_feedback)
+                apply_feedback, (self.letters[i], shown[i], internal[i])
             ).start()
 
     def length(self):
@@ -123,13 +99,13 @@ class Word:
 
         return self.guessed_word == self.actual_word
 
-    def handle_check_word(self):
+    def handle_check_word(self, feedback: tuple[list[Feedback], list[Feedback]] | None = None):
         if self.locked:
             return False
 
         # check that word is in english dictionary
         if self.guessed_word.lower() in VALID_WORDS:
-            self.check_word()
+            self.check_word(feedback)
             self.locked = True
 
             return True
@@ -152,8 +128,18 @@ class Word:
         if self.length() < self.word_length and not self.locked:
             self.letters[self.length()].value = key_pressed.upper()
             self.guessed_word += key_pressed.upper()
+            self.mark_dead_prefix()
 
     def delete_letter(self):
         if self.length() > 0 and not self.locked:
             self.letters[self.length() - 1].value = None
             self.guessed_word = self.guessed_word[0:len(self.guessed_word) - 1]
+            self.mark_dead_prefix()
+
+    def mark_dead_prefix(self):
+        # flag typed letters from the first one no valid word continues
+        trie = word_trie(VALID_WORDS)
+        dead = False
+        for i, letter in enumerate(self.letters):
+            dead = dead or (i < self.length() and not trie.is_prefix(self.guessed_word[:i + 1]))
+            letter.dead = dead and i < self.length()
@@ -0,0 +1,110 @@
+from functools import lru_cache
+
+import numpy as np
+
+from assets.lexicon import Lexicon
+from classes.Constraints import ALL_LETTERS, Constraints
+
+
+def letter_index(letter: str):
+    return ord(letter.upper()) - ord("A")
+
+
+def set_bits(mask: int):
+    # Positions of the set bits, Ex. 0b101 -> 0, 2
+    while mask:
+        yield (mask & -mask).bit_length() - 1
+        mask &= mask - 1
+
+
+# Inverted index of a word list, every set of words is a Python int with bit i set for word i
+# Ex. index.at[1][letter_index("R")] has the bit of every word with R as its second letter
+class WordIndex:
+    def __init__(self, words: Lexicon):
+        self.words = words
+        letters = np.asarray(words.letters)
+        (self.size, self.word_length) = letters.shape
+        self.all = (1 << self.size) - 1
+        # at[position][letter]: words with the letter at the position
+        self.at = [[self.to_bits(letters[:, i] == letter) for letter in range(26)]
+                   for i in range(self.word_length)]
+        # at_least[letter][n]: words with n or more copies of the letter, at_least[letter][0] is every word
+        counts = np.zeros((self.size, 26), dtype=np.int8)
+        for i in range(self.word_length):
+            counts[np.arange(self.size), letters[:, i]] += 1
+        self.at_least = [[self.to_bits(counts[:, letter] >= n) for n in range(self.word_length + 2)]
+                         for letter in range(26)]
+
+    def to_bits(self, mask: np.ndarray):
+        # bool array -> set of words
+        return int.from_bytes(np.packbits(mask, bitorder="little").tobytes(), "little")
+
+    def to_mask(self, bits: int):
+        # set of words -> bool array
+        data = np.frombuffer(bits.to_bytes((self.size + 7) // 8, "little"), dtype=np.uint8)
+        return np.unpackbits(data, bitorder="little")[:self.size].astype(bool)
+
+    def ids(self, bits: int):
+        """! Indexes of the words in a set
+        @return  int array, Ex. VALID_WORDS[ids[0]]
+        """
+        return np.flatnonzero(self.to_mask(bits))
+
+    def count(self, bits: int):
+        return bits.bit_count()
+
+    def has(self, bits: int, word: str):
+        # Whether a word is in a set, False for words not in the list
+        i = self.words.indexes().get(word.lower())
+        return i is not None and bool(bits >> i & 1)
+
+    def query(self, at: dict[int, str] | None = None, not_at: dict[int, str] | None = None, contains: str = "",
+              excludes: str = ""):
+        """! Words matching simple constraints
+        Ex. R second, an E anywhere, no S: query(at={1: "R"}, contains="E", excludes="S")
+        @param at  {position: letter} letters known in place
+        @param not_at  {position: letters} letters that are not at the position
+        @param contains  Letters in the word, a letter given twice needs two copies
+        @param excludes  Letters not in the word
+        @return  int - set of words, see ids() and count()
+        """
+        bits = self.all
+        for i, letter in (at or {}).items():
+            bits &= self.at[i][letter_index(letter)]
+        for i, letters in (not_at or {}).items():
+            for letter in letters:
+                bits &= ~self.at[i][letter_index(letter)]
+        for letter in set(contains):
+            bits &= self.at_least[letter_index(letter)][contains.count(letter)]
+        for letter in set(excludes):
+            bits &= ~self.at_least[letter_index(letter)][1]
+        return bits
+
+    def matching(self, constraints: Constraints):
+        """! Words allowed by constraints, the same words as Constraints.allows
+        @return  int - set of words
+        """
+        bits = self.all
+        for i, mask in enumerate(constraints.position_masks):
+            if mask == ALL_LETTERS: continue
+            # OR the allowed letters or ANDNOT the others, whichever is fewer
+            if mask.bit_count() <= 13:
+                allowed = 0
+                for letter in set_bits(mask):
+                    allowed |= self.at[i][letter]
+                bits &= allowed
+            else:
+                for letter in set_bits(ALL_LETTERS & ~mask):
+                    bits &= ~self.at[i][letter]
+        for letter in range(26):
+            if constraints.min_counts[letter] > 0:
+                bits &= self.at_least[letter][constraints.min_counts[letter]]
+            if constraints.max_counts[letter] < self.word_length:
+                bits &= ~self.at_least[letter][constraints.max_counts[letter] + 1]
+        return bits
+
+
+@lru_cache(maxsize=None)
+def word_index(words: Lexicon):
+    # One index per word list, built on first use (a few milliseconds)
+    return WordIndex(words)
@@ -1,4 +1,8 @@
-from openai.types.chat_model import ChatModel
+from typing import TYPE_CHECKING
+
+# only needed for type hints, the game engine and solver do not depend on openai
+if TYPE_CHECKING:
+    from openai.types.chat_model import ChatModel
 
 # Originally used in AnimationObject. Imported to gameloop
 DEFAULT_FRAMERATE = 60
@@ -49,10 +53,25 @@ LETTERS = [
 # hint constants
 MIN_NUM_GUESSES = 5
 MIN_LETTERS_TO_ADD = 3
+# hints kept per game state, and game states whose hints are remembered (classes/HintEngine.py)
+HINT_RANKING_SIZE = 10
+HINT_CACHE_SIZE = 256
+
+# Solver configuration
+# "random" picks any remaining word, "entropy" picks the guess that splits the
+# remaining words into the most even feedback patterns, "minimax" picks the guess
+# whose largest group of remaining words is smallest, "tree" follows the
+# precomputed decision tree in assets/decision_tree.json (see utils/decision_tree.py)
+# and "posterior" weighs every (answer, lie positions) pair (see utils/posterior.py)
+SOLVER_STRATEGY = "random"
+# Words the entropy and minimax strategies may guess: "candidates" (remaining words only) or "all" (VALID_WORDS)
+SOLVER_GUESS_POOL = "all"
+# Minimax looks one more guess ahead, slower but fewer guesses in the worst case
+SOLVER_LOOKAHEAD = False
 
 # LLM Configuration
 # Change these to use different models for each platform
-LLM_MODEL: ChatModel = "gpt-3.5-turbo"  # OpenAI model
+LLM_MODEL: "ChatModel" = "gpt-3.5-turbo"  # OpenAI model
 OLLAMA_MODEL = "gemma3:latest"  # Ollama model
 
 # OpenRouter Configuration
@@ -76,4 +95,6 @@ DEEPSEEK_MODEL = "deepseek-chat"
 
 LLM_PLATFORM = "gemini"
 LOG_LLM_MESSAGES = False
+# Replace an LLM response that is not a valid word with the closest valid word (classes/Trie.py)
+SNAP_LLM_GUESSES = False
 ERROR_MESSAGE_VISIBLE_TIME = 5
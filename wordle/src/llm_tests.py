@@ -1,11 +1,13 @@
+import argparse
 import time
 import json
 
 from pathlib import Path
 
 from classes.GameState import GameState, Status
-from classes.LetterCell import Feedback
+from classes.Feedback import Feedback
 from constants import LLM_MODEL, MAX_LLM_CONTINUOUS_CALLS
+from utils.scenarios import load_scenarios, shard, unfinished
 
 LOG_DIR = Path("benchmarks/gemini_logs")
 LOG_DIR.mkdir(parents=True, exist_ok=True)
@@ -14,9 +16,13 @@ NUM_RUNS = 1
 
 
 # Modify run_game to append per-game stats
-def run_game(game: GameState, run_id: int, total_tries: int, total_success: int, total_bad_guesses: int, total_latency: float, results_dict=None):
+def run_game(game: GameState, run_id: int, total_tries: int, total_success: int, total_bad_guesses: int, total_latency: float, results_dict=None, scenario=None):
     print(f"Starting run {run_id + 1}")
-    game.reset()
+    if scenario is not None:
+        # Same answer, lie positions, lies and guess limit on every run of the scenario file
+        game.reset(scenario["answer"], scenario["lie_indexes"], scenario["num_guesses"], scenario["seed"])
+    else:
+        game.reset()
     total_completion = 0
     completion = 0
     game_start_time = time.time()
@@ -32,9 +38,8 @@ def run_game(game: GameState, run_id: int, total_tries: int, total_success: int,
         if game.ai_timeout:
             print("AI request timed out. Ending game.")
             break
-        # get the feedback
-        offset = 0 if game.status == Status.end else 1
-        feedback = game.words[game.current_word_index - offset].get_feedback()
+        # get the feedback of the last accepted guess
+        feedback = game.engine.feedback[-1] if game.engine.feedback else []
 
         # check completion
         completion = 0
@@ -69,30 +74,41 @@ def run_game(game: GameState, run_id: int, total_tries: int, total_success: int,
     print()
    
     if results_dict is not None:
-        results_dict["games"].append({
+        result = {
             "run_id": run_id + 1,
+            "answer": game.actual_word.lower(),
+            "lie_indexes": list(game.lie_indexes),
             "average_game_completion": avg_game_completion,
+            "num_guesses": game.num_guesses,
             "tries": game.num_of_tries(),
             "success": game.success,
             "latency": game_latency,
-            "bad_guesses": total_bad_guesses
-        })
+            "bad_guesses": total_bad_guesses,
+            # False when the LLM struck out or timed out, --rerun plays these again
+            "completed": not (game.ai_strikeout or game.ai_timeout)
+        }
+        if scenario is not None:
+            result["scenario_id"] = scenario["id"]
+        results_dict["games"].append(result)
 
     return total_tries, total_success, total_bad_guesses, total_latency
 
 
 
-def test_games(lies: int = 0):
-    LOG_FILE = LOG_DIR / f"benchmark_llm_{LLM_MODEL.replace(':', '_')}_fibble{lies}.json"
+def test_games(lies: int = 0, scenarios=None, log_suffix: str = ""):
+    LOG_FILE = LOG_DIR / f"benchmark_llm_{LLM_MODEL.replace(':', '_')}_fibble{lies}{log_suffix}.json"
     game = GameState(show_window=False, logging=False)
     game.num_lies = lies
+    # NUM_RUNS random games, or one per scenario
+    runs = scenarios if scenarios is not None else [None] * NUM_RUNS
+    num_runs = len(runs)
     total_success = 0
     total_tries = 0
     total_bad_guesses = 0
     total_latency = 0.0
 
     results = {
-        "num_runs": NUM_RUNS,
+        "num_runs": num_runs,
         "LLM_MODEL": LLM_MODEL,
         "MAX_LLM_CONTINUOUS_CALLS": MAX_LLM_CONTINUOUS_CALLS,
         "games": [],
@@ -101,15 +117,15 @@ def test_games(lies: int = 0):
 
     print(f"Playing with {lies} lies...")
 
-    for i in range(NUM_RUNS):
-        total_tries, total_success, total_bad_guesses, total_latency = run_game(game, i, total_tries, total_success, total_bad_guesses, total_latency, results)
-        if i < NUM_RUNS - 1:
+    for i, scenario in enumerate(runs):
+        total_tries, total_success, total_bad_guesses, total_latency = run_game(game, i, total_tries, total_success, total_bad_guesses, total_latency, results, scenario)
+        if i < num_runs - 1:
             time.sleep(0.5)
 
     # Calculate final averages
-    win_rate = total_success / NUM_RUNS
-    avg_tries = total_tries / NUM_RUNS
-    avg_latency = total_latency / NUM_RUNS
+    win_rate = total_success / num_runs
+    avg_tries = total_tries / num_runs
+    avg_latency = total_latency / num_runs
 
     # Save the results
     results["total_bad_guesses"] = total_bad_guesses
@@ -123,26 +139,51 @@ def test_games(lies: int = 0):
     print(f"\n{'='*50}")
     print(f"FINAL RESULTS:")
     print(f"{'='*50}")
-    print(f"Win Rate: {win_rate:.2%} ({total_success}/{NUM_RUNS})")
+    print(f"Win Rate: {win_rate:.2%} ({total_success}/{num_runs})")
     print(f"Average Tries: {avg_tries:.2f}")
     print(f"Average Latency: {avg_latency:.2f}s")
     print(f"Total Bad Guesses: {total_bad_guesses}")
     print(f"{'='*50}")
     print(f"\nSaved benchmark results to {LOG_FILE}")
     
-def all_fibble_variants():
-    test_games(lies=0)
-    time.sleep(20)
-    test_games(lies=1)
-    time.sleep(20)
-    test_games(lies=2)
-    time.sleep(20)
-    test_games(lies=3)
-    time.sleep(20)
-    test_games(lies=4)
-    time.sleep(20)
-    test_games(lies=5)
+def all_fibble_variants(scenarios=None, log_suffix: str = ""):
+    played = False
+    for lies in range(6):
+        # Only the variants the scenario file has
+        runs = None if scenarios is None else [scenario for scenario in scenarios if scenario["lies"] == lies]
+        if runs == []:
+            continue
+        if played:
+            time.sleep(20)
+        test_games(lies, runs, log_suffix)
+        played = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the LLM on every Fibble variant")
+    parser.add_argument("--scenarios", type=Path, default=None,
+                        help="Play the games of a scenario file (python -m utils.scenarios) instead of random ones")
+    parser.add_argument("--shard", type=int, default=0, help="Which part of the scenarios to play")
+    parser.add_argument("--num-shards", type=int, default=1, help="Parts the scenarios are split into")
+    parser.add_argument("--rerun", type=Path, nargs="*", default=None,
+                        help="Result files of an earlier run, only play the scenarios missing or unfinished in them")
+    args = parser.parse_args()
+
+    if args.scenarios is None:
+        all_fibble_variants()
+        return
+
+    scenarios = shard(load_scenarios(args.scenarios), args.shard, args.num_shards)
+    log_suffix = f"_shard{args.shard}of{args.num_shards}" if args.num_shards > 1 else ""
+    if args.rerun is not None:
+        games = []
+        for path in args.rerun:
+            with open(path) as f:
+                games.extend(json.load(f)["games"])
+        scenarios = unfinished(scenarios, games)
+        log_suffix += "_rerun"
+    all_fibble_variants(scenarios, log_suffix)
 
 
 if __name__ == "__main__":
-    all_fibble_variants()
+    main()
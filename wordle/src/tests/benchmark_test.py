@@ -0,0 +1,26 @@
+from benchmark import play_game, run_benchmark
+from classes.Engine import Engine
+from classes.Solver import Solver
+
+
+def test_play_game_repeats():
+    engine = Engine(6, 2)
+    solver = Solver("entropy", "candidates", 2)
+    (first, _) = play_game(engine, solver, "crate", 5)
+    (second, _) = play_game(engine, solver, "crate", 5)
+    # Everything but the timing
+    first.pop("latency")
+    second.pop("latency")
+    assert first == second
+    assert len(first["lie_indexes"]) == 2
+
+
+def test_run_benchmark():
+    results = run_benchmark("entropy", "candidates", lies=[0, 1], guesses=[6, 9], num_answers=6, workers=2)
+    assert sorted(results) == [(0, 6), (0, 9), (1, 6), (1, 9)]
+    for (lies, guesses), result in results.items():
+        assert result["lies"] == lies and result["num_guesses"] == guesses
+        assert [game["run_id"] for game in result["games"]] == list(range(1, 7))
+        assert sum(result["guess_distribution"].values()) == result["num_runs"] == 6
+        assert result["decision_time_p95"] >= 0
+    assert results[(0, 6)]["win_rate"] == 1
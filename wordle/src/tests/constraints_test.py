@@ -0,0 +1,52 @@
+import random
+
+from assets.lexicon import GUESS_WORDS, VALID_WORDS
+from classes.Constraints import Constraints, word_masks
+from classes.Feedback import Feedback
+from utils.patterns import code_to_feedback, pattern
+
+
+def test_word_masks():
+    (letters, counts) = word_masks("abba")
+    assert letters == (1 << 0) | (1 << 27) | (1 << 53) | (1 << 78)
+    assert counts == 2 | (2 << 4)
+
+
+def test_duplicate_letters():
+    # SPEED against ABIDE: one E is present, the other is not, so exactly one E
+    constraints = Constraints()
+    constraints.update("SPEED", code_to_feedback(pattern("speed", "abide")))
+    assert constraints.min_counts[4] == 1
+    assert constraints.max_counts[4] == 1
+    assert constraints.allows("ABIDE")
+    assert not constraints.allows("EERIE")
+    assert constraints.present_letters() == "ED"
+
+
+def test_correct_letter():
+    constraints = Constraints()
+    constraints.update("CRANE", [Feedback.correct] + [Feedback.incorrect] * 4)
+    assert constraints.possible_letters()[0] == "C"
+    assert "C" not in constraints.present_letters()
+
+
+def test_matches_feedback_exactly():
+    # The words allowed are exactly those that would have given the same feedback
+    rng = random.Random(0)
+    for _ in range(20):
+        answer = rng.choice(GUESS_WORDS)
+        constraints = Constraints()
+        guesses = rng.sample(VALID_WORDS, 3)
+        for guess in guesses:
+            constraints.update(guess, code_to_feedback(pattern(guess, answer)))
+        expected = [w for w in GUESS_WORDS if all(pattern(g, w) == pattern(g, answer) for g in guesses)]
+        assert [w for w in GUESS_WORDS if constraints.allows(w)] == expected
+
+
+def test_allows_all():
+    from utils.patterns import encode_words, letter_counts
+    constraints = Constraints()
+    constraints.update("SPEED", code_to_feedback(pattern("speed", "abide")))
+    letters = encode_words(GUESS_WORDS)
+    allowed = constraints.allows_all(letters, letter_counts(letters))
+    assert [w for w, a in zip(GUESS_WORDS, allowed) if a] == [w for w in GUESS_WORDS if constraints.allows(w)]
@@ -0,0 +1,22 @@
+from assets.lexicon import GUESS_WORDS
+from utils.decision_tree import MAX_GUESSES, load_tree, tree_child, tree_guess, tree_stats
+from utils.patterns import pattern
+
+
+def test_saved_tree_is_current():
+    # Rebuild with `python -m utils.decision_tree` after changing the word lists
+    assert load_tree() is not None
+
+
+def test_saved_tree_solves_every_answer():
+    stats = tree_stats(load_tree())
+    assert sum(stats.values()) == len(GUESS_WORDS)
+    assert max(stats) <= MAX_GUESSES
+    assert sum(n * count for n, count in stats.items()) / len(GUESS_WORDS) < 3.45
+
+
+def test_tree_walk():
+    tree = load_tree()
+    node = tree_child(tree, pattern(tree_guess(tree), "crate"))
+    assert node is not None
+    assert tree_child("crate", 0) is None
@@ -0,0 +1,31 @@
+from classes.Feedback import Feedback
+from utils.difftest import fuzz_feedback, reference_feedback, shrink
+
+
+def naive_feedback(guess, answer):
+    # Ignores letter counts, the classic duplicate letter bug
+    return [Feedback.correct if g == a else Feedback.present if g in answer else Feedback.incorrect
+            for g, a in zip(guess, answer)]
+
+
+def test_reference_feedback():
+    (shown, internal) = reference_feedback("SPEED", "ABIDE")
+    assert internal == [Feedback.incorrect, Feedback.incorrect,
+                        Feedback.present, Feedback.incorrect, Feedback.present]
+    assert shown == internal
+
+
+def test_reference_feedback_lies():
+    (shown, internal) = reference_feedback("CRANE", "CRATE", [1, 3])
+    assert [i for i in range(5) if shown[i] != internal[i]] == [1, 3]
+
+
+def test_shrink():
+    assert shrink(list(range(20)), lambda case: 3 in case and 7 in case) == [3, 7]
+
+
+def test_finds_duplicate_letter_bug():
+    report = fuzz_feedback(naive_feedback, budget=5, seed=0)
+    assert not report
+    # Shrunk to the answer and a single guess
+    assert len(report.case) == 2
@@ -0,0 +1,77 @@
+import pytest
+
+from classes.Engine import Engine, score_word
+from classes.Feedback import Feedback
+from utils.difftest import fuzz_feedback
+from utils.patterns import code_to_feedback, pattern
+
+C = Feedback.correct
+P = Feedback.present
+I = Feedback.incorrect
+
+
+def test_score_word():
+    assert score_word("crate", "crate") == [C, C, C, C, C]
+    assert score_word("speed", "abide") == [I, I, P, I, P]
+    # The in place copy is matched first, the other copy is incorrect
+    assert score_word("geese", "those") == [I, I, I, C, C]
+    assert score_word("lever", "eerie") == [I, C, I, P, P]
+
+
+def test_score_word_matches_patterns():
+    for guess, answer in [("salet", "crate"), ("mamma", "madam"), ("eerie", "there"), ("jazzy", "pizza")]:
+        assert score_word(guess, answer) == code_to_feedback(pattern(guess, answer))
+
+
+def test_score_word_fuzz():
+    # Against the original Word.check_word rules
+    report = fuzz_feedback(score_word, budget=1, seed=0)
+    assert report, report
+
+
+def test_win():
+    engine = Engine(seed=0)
+    engine.reset("crate")
+    (shown, internal) = engine.guess("salet")
+    assert shown == internal
+    assert not engine.is_over()
+    engine.guess("crate")
+    assert engine.success and engine.is_over()
+    assert engine.guesses == ["SALET", "CRATE"]
+
+
+def test_out_of_guesses():
+    engine = Engine(num_guesses=2, seed=0)
+    engine.reset("crate")
+    engine.guess("salet")
+    engine.guess("mound")
+    assert engine.is_over() and not engine.success
+    with pytest.raises(ValueError):
+        engine.guess("crate")
+
+
+def test_invalid_guess():
+    engine = Engine(seed=0)
+    with pytest.raises(ValueError):
+        engine.guess("xxxxx")
+    with pytest.raises(ValueError):
+        engine.guess("cat")
+    assert engine.num_of_tries() == 0
+
+
+def test_lies():
+    engine = Engine(num_lies=2, seed=1)
+    engine.reset("crate", lie_indexes=[0, 3])
+    for guess in ["salet", "crate", "mound"]:
+        engine.reset("crate", lie_indexes=[0, 3])
+        (shown, internal) = engine.guess(guess)
+        assert [i for i in range(5) if shown[i] != internal[i]] == [0, 3]
+
+
+def test_seeded_games_repeat():
+    def play(seed: int):
+        engine = Engine(num_lies=1, seed=seed)
+        return (engine.answer, engine.lie_indexes, engine.guess("salet")[0])
+
+    assert play(7) == play(7)
+    assert len(set(play(seed)[0] for seed in range(10))) > 1
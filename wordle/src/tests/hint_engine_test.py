@@ -0,0 +1,48 @@
+import time
+
+from classes.HintEngine import HintEngine, rank_hints
+from classes.Solver import Solver
+from constants import HINT_RANKING_SIZE
+from utils.patterns import code_to_feedback, pattern
+
+
+def wait_for(engine: HintEngine, history: tuple, num_lies: int):
+    for _ in range(500):
+        if engine.ranked(history, num_lies) is not None:
+            return engine.ranked(history, num_lies)
+        time.sleep(0.01)
+    raise TimeoutError
+
+
+def test_rank_hints_are_candidates():
+    history = (("SOARE", pattern("soare", "crate")),)
+    solver = Solver("random", "candidates")
+    solver.update_guesses("SOARE", code_to_feedback(history[0][1]))
+    hints = rank_hints(history, 0)
+    assert 0 < len(hints) <= HINT_RANKING_SIZE
+    assert set(hints) <= set(solver.possible_guesses)
+
+
+def test_rank_hints_is_cached():
+    history = (("CRANE", pattern("crane", "mamma")),)
+    rank_hints(history, 1)
+    hits = rank_hints.cache_info().hits
+    assert rank_hints(history, 1) == rank_hints(history, 1)
+    assert rank_hints.cache_info().hits == hits + 2
+
+
+def test_background_hints():
+    engine = HintEngine()
+    history = (("SOARE", pattern("soare", "mamma")),)
+    assert engine.best(history, 0) is None
+    engine.prepare(history, 0)
+    assert wait_for(engine, history, 0) == rank_hints(history, 0)
+    assert engine.best(history, 0) == rank_hints(history, 0)[0]
+    engine.clear()
+    assert engine.ranked(history, 0) is None
+
+
+def test_last_words():
+    # Once few words are left the answer is among the hints
+    history = tuple((guess, pattern(guess, "crate")) for guess in ["soare", "clint"])
+    assert "crate" in rank_hints(history, 0)
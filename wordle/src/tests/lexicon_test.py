@@ -0,0 +1,67 @@
+import os
+import random
+
+import numpy as np
+import pytest
+
+from assets.lexicon import GUESS_WORDS, VALID_WORDS, Lexicon, lexicon, save_lexicon
+from utils.patterns import encode_words, pattern_table
+
+
+def test_word_lists():
+    assert len(VALID_WORDS) == 12972 and len(GUESS_WORDS) == 2315
+    assert VALID_WORDS[0] == "cigar" and GUESS_WORDS[-1] == GUESS_WORDS[len(GUESS_WORDS) - 1]
+    assert all(word in VALID_WORDS for word in GUESS_WORDS)
+    assert "xxxxx" not in VALID_WORDS and "CIGAR" not in VALID_WORDS
+
+
+def test_letters_are_the_letter_matrix():
+    assert VALID_WORDS.letters.shape == (12972, 5)
+    assert (VALID_WORDS.letters[:50] == encode_words(VALID_WORDS[:50])).all()
+
+
+def test_list_operations():
+    assert VALID_WORDS.index(GUESS_WORDS[10]) == list(VALID_WORDS).index(GUESS_WORDS[10])
+    with pytest.raises(ValueError):
+        VALID_WORDS.index("xxxxx")
+    assert len(random.Random(0).sample(VALID_WORDS, 3)) == 3
+    assert GUESS_WORDS[:2] == [GUESS_WORDS[0], GUESS_WORDS[1]]
+
+
+def test_save_lexicon(tmp_path):
+    path = str(tmp_path / "words.bin")
+    save_lexicon(["Crate", "abide", "crate"], path)
+    lexicon = Lexicon(path)
+    assert list(lexicon) == ["crate", "abide", "crate"]
+    assert lexicon.index("crate") == 0 and lexicon.index("crate", 1) == 2
+    with pytest.raises(ValueError):
+        save_lexicon(["cat"], path)
+
+
+def write_sources(path):
+    (path / "valid_words.txt").write_text("cat\nDOGS\nbirds\nplanet\nsquare\nstreet\ncrate\n")
+    (path / "guess_words.txt").write_text("planet\nsquare\ndogs\n")
+
+
+def test_lexicon_per_length(tmp_path):
+    write_sources(tmp_path)
+    cache = tmp_path / "cache"
+    six = lexicon("valid_words", 6, str(tmp_path), str(cache))
+    assert list(six) == ["planet", "square", "street"]
+    assert lexicon("valid_words", 6, str(tmp_path), str(cache)) is six
+    assert list(lexicon("valid_words", 4, str(tmp_path), str(cache))) == ["dogs"]
+    # Only the lengths asked for are packed
+    assert sorted(name.split("-")[1] for name in os.listdir(cache)) == ["4", "6"]
+    with pytest.raises(ValueError):
+        lexicon("valid_words", 8, str(tmp_path), str(cache))
+    with pytest.raises(FileNotFoundError):
+        lexicon("valid_words", 6, str(tmp_path / "missing"), str(cache))
+
+
+def test_pattern_table_per_length(tmp_path):
+    write_sources(tmp_path)
+    table = pattern_table(6, str(tmp_path), str(tmp_path / "cache"))
+    assert table.shape == (2, 3) and table.dtype == np.uint16
+    # planet against planet is all correct, 3 ** 6 - 1
+    assert table[0, 0] == 728 and table[1, 1] == 728
+    assert table[0, 1] == pattern_table(6, str(tmp_path), str(tmp_path / "cache"))[0, 1]
@@ -0,0 +1,32 @@
+import numpy as np
+
+from assets.lexicon import GUESS_WORDS
+from utils.opening_book import lie_masks, lie_table, load_opening_book, shown_entropies
+from utils.patterns import guess_entropies
+
+
+def test_saved_book_is_current():
+    # Rebuild with `python -m utils.opening_book` after changing the word lists
+    assert load_opening_book()
+
+
+def test_lie_table():
+    assert lie_masks(2) == [3, 5, 6, 9, 10, 12, 17, 18, 20, 24]
+    for mask in [0, 1, 6, 31]:
+        assert np.allclose(lie_table(mask).sum(axis=1), 1)
+    # Two lies in the first two positions, correct shows as incorrect or present
+    assert lie_table(3)[242].nonzero()[0].tolist() == [234, 235, 237, 238]
+    assert np.allclose(lie_table(3)[242, [234, 235, 237, 238]], 0.25)
+
+
+def test_shown_entropies_without_lies():
+    answers = np.arange(0, len(GUESS_WORDS), 7)
+    guesses = np.arange(0, 3000, 13)
+    assert np.allclose(shown_entropies({0: answers}, guesses), guess_entropies(answers, guesses))
+
+
+def test_lies_add_noise():
+    answers = np.arange(0, len(GUESS_WORDS), 7)
+    guesses = np.arange(0, 3000, 13)
+    one_lie = shown_entropies({mask: answers for mask in lie_masks(1)}, guesses)
+    assert (one_lie > guess_entropies(answers, guesses)).all()
@@ -0,0 +1,104 @@
+import numpy as np
+
+from assets.lexicon import GUESS_WORDS
+from classes.Feedback import Feedback
+from utils.difftest import fuzz_feedback, reference_feedback
+from utils.patterns import (ALL_CORRECT, answer_indexes, bucket_sizes, build_pattern_matrix, code_to_feedback,
+                            consistent_answers, encode_words, entropies, feedback_to_code, guess_entropies,
+                            hamming_table, letter_counts, load_pattern_matrix, partition_counts, pattern,
+                            score_guess, worst_buckets)
+
+ANSWERS = ["abide", "speed", "crate", "geese", "mamma"]
+GUESSES = ["speed", "erase", "eerie", "mamma", "abide", "crane", "geese"]
+
+
+def test_feedback_codes():
+    feedback = [Feedback.correct, Feedback.incorrect, Feedback.present, Feedback.incorrect, Feedback.incorrect]
+    assert feedback_to_code(feedback) == 11
+    assert code_to_feedback(11) == feedback
+    assert feedback_to_code([Feedback.correct] * 5) == 242
+
+
+def test_encode_words():
+    assert encode_words(["abide"]).tolist() == [[0, 1, 8, 3, 4]]
+
+
+def test_score_guess():
+    answers = encode_words(ANSWERS)
+    for guess in GUESSES:
+        expected = [feedback_to_code(reference_feedback(guess, answer)[1]) for answer in ANSWERS]
+        assert score_guess(encode_words([guess])[0], answers).tolist() == expected
+        assert score_guess(encode_words([guess])[0], answers, letter_counts(answers)).tolist() == expected
+
+
+def test_score_guess_fuzz():
+    def candidate(guess, answer):
+        return code_to_feedback(int(score_guess(encode_words([guess])[0], encode_words([answer]))[0]))
+    report = fuzz_feedback(candidate, budget=1, seed=0)
+    assert report, report
+
+
+def test_matrix_matches_check_word():
+    matrix = build_pattern_matrix(ANSWERS, GUESSES)
+    for a, answer in enumerate(ANSWERS):
+        for g, guess in enumerate(GUESSES):
+            assert matrix[a, g] == feedback_to_code(reference_feedback(guess, answer)[1])
+
+
+def test_matrix_cache(tmp_path):
+    matrix = load_pattern_matrix(str(tmp_path), ANSWERS, GUESSES)
+    assert len(list(tmp_path.glob("patterns-*.npy"))) == 1
+    cached = load_pattern_matrix(str(tmp_path), ANSWERS, GUESSES)
+    assert isinstance(cached, np.memmap)
+    assert np.array_equal(matrix, cached)
+    # A different word list gets its own file
+    load_pattern_matrix(str(tmp_path), ANSWERS[:2], GUESSES)
+    assert len(list(tmp_path.glob("patterns-*.npy"))) == 2
+
+
+def test_entropies():
+    counts = np.zeros((3, 243), dtype=np.int32)
+    counts[0, 0] = 4                 # One bucket: no information
+    counts[1, :4] = 1                # Four even buckets: 2 bits
+    counts[2, :2] = [2, 1]
+    assert np.allclose(entropies(counts), [0, 2, 0.9182958])
+
+
+def test_guess_entropies():
+    rng = np.random.default_rng(0)
+    for size in [10, 200]:
+        answers = rng.choice(2315, size, replace=False)
+        guesses = rng.choice(12972, 500, replace=False)
+        assert np.allclose(guess_entropies(answers, guesses), entropies(partition_counts(answers, guesses)))
+
+
+def test_hamming_table():
+    table = hamming_table()
+    assert table[0, 0] == 0
+    assert table[0, 242] == 5
+    assert table[11, 2] == 1  # Only position 2 differs
+
+
+def test_consistent_answers():
+    answers = np.arange(2315)
+    crate = answer_indexes()["CRATE"]
+    shown = pattern("crane", "crate")
+    assert consistent_answers(answers, "crane", shown)[crate]
+    # The first letter lies: correct shown as incorrect
+    lied = shown - 2
+    assert not consistent_answers(answers, "crane", lied)[crate]
+    possible = consistent_answers(answers, "crane", lied, 1)
+    assert possible[crate]
+    assert all(hamming_table()[pattern("crane", GUESS_WORDS[a]), lied] == 1 for a in np.flatnonzero(possible))
+
+
+def test_bucket_sizes():
+    answers = np.arange(0, len(GUESS_WORDS), 5)
+    guesses = np.arange(0, 2000, 37)
+    sizes = bucket_sizes(answers, guesses)
+    counts = partition_counts(answers, guesses)
+    assert (sizes[:, :ALL_CORRECT] == counts[:, :ALL_CORRECT]).all() and (sizes[:, ALL_CORRECT] == 0).all()
+    # With one lie an answer stays for each of the 10 patterns one position away from its own,
+    # but a guess that is the answer wins and is in no bucket
+    assert (bucket_sizes(answers, guesses, 1).sum(axis=1) == 10 * (len(answers) - counts[:, ALL_CORRECT])).all()
+    assert (worst_buckets(answers, guesses, 1) == bucket_sizes(answers, guesses, 1).max(axis=1)).all()
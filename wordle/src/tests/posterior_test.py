@@ -0,0 +1,54 @@
+import numpy as np
+
+from assets.lexicon import GUESS_WORDS
+from classes.Engine import Engine
+from classes.Solver import Solver
+from utils import opening_book
+from utils.patterns import answer_indexes, code_to_feedback, feedback_to_code, guess_indexes, pattern
+from utils.posterior import mask_array, prior, shown_entropies, update_posterior
+
+
+def test_update_keeps_the_true_pair():
+    engine = Engine(9, 2, seed=3)
+    engine.reset("crate", [1, 4])
+    answers = np.arange(len(GUESS_WORDS))
+    weights = prior(len(answers), 2)
+    assert weights.shape == (2315, 10) and np.isclose(weights.sum(), 1)
+    for guess in ["soare", "clint"]:
+        (shown, _) = engine.guess(guess)
+        (answers, weights) = update_posterior(answers, weights, guess, feedback_to_code(shown), 2)
+        assert np.isclose(weights.sum(), 1)
+    row = list(answers).index(answer_indexes()["CRATE"])
+    column = list(mask_array(2)).index(0b10010)
+    assert weights[row, column] > 0
+    assert len(answers) < 100
+
+
+def test_shown_entropies_match_the_opening_book():
+    answers = np.arange(len(GUESS_WORDS))
+    guesses = np.array([guess_indexes()[word] for word in ["SOARE", "ROATE", "FUZZY"]])
+    groups = {int(mask): answers for mask in mask_array(1)}
+    expected = opening_book.shown_entropies(groups, guesses)
+    assert np.allclose(shown_entropies(answers, prior(len(answers), 1), guesses, 1), expected, atol=1e-4)
+
+
+def test_posterior_solver_wins_with_lies():
+    solver = Solver("posterior", "all", num_lies=3)
+    engine = Engine(9, 3, seed=1)
+    engine.reset("mamma")
+    while not engine.is_over():
+        guess = solver.get_guess()
+        (shown, _) = engine.guess(guess)
+        if not engine.is_over():
+            solver.update_guesses(guess.upper(), shown)
+    assert engine.success
+    assert np.isclose(solver.answer_probabilities().sum(), 1)
+
+
+def test_no_lies_matches_the_other_strategies():
+    posterior = Solver("posterior", "candidates")
+    entropy = Solver("entropy", "candidates")
+    for solver in (posterior, entropy):
+        solver.update_guesses("ARISE", code_to_feedback(pattern("arise", "crate")))
+    assert posterior.possible_guesses == entropy.possible_guesses
+    assert np.allclose(posterior.answer_probabilities(), 1 / posterior.num_possible_guesses())
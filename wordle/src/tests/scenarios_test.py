@@ -0,0 +1,52 @@
+import pytest
+
+from benchmark import run_benchmark
+from utils.scenarios import load_scenarios, make_scenarios, save_scenarios, shard, unfinished
+
+
+def test_make_scenarios_repeats():
+    scenarios = make_scenarios(seed=3, lies=[0, 2], guesses=[6], num_games=5)
+    assert scenarios == make_scenarios(seed=3, lies=[0, 2], guesses=[6], num_games=5)
+    assert scenarios != make_scenarios(seed=4, lies=[0, 2], guesses=[6], num_games=5)
+    assert [scenario["id"] for scenario in scenarios] == list(range(1, 11))
+    assert all(len(scenario["lie_indexes"]) == scenario["lies"] for scenario in scenarios)
+    assert len(make_scenarios(lies=[1], guesses=[6, 7])) == 2 * 2315
+
+
+def test_save_and_shard(tmp_path):
+    path = str(tmp_path / "scenarios.json")
+    scenarios = make_scenarios(seed=1, lies=[1], guesses=[6, 9], num_games=5)
+    save_scenarios(scenarios, path, 1)
+    assert load_scenarios(path) == scenarios
+    parts = [shard(scenarios, i, 3) for i in range(3)]
+    assert sorted(s["id"] for part in parts for s in part) == list(range(1, 11))
+    with pytest.raises(ValueError):
+        shard(scenarios, 3, 3)
+
+
+def test_unfinished():
+    scenarios = make_scenarios(seed=1, lies=[0], guesses=[6], num_games=4)
+    games = [{"scenario_id": 1}, {"scenario_id": 2, "completed": False}, {"scenario_id": 4, "completed": True}]
+    assert [s["id"] for s in unfinished(scenarios, games)] == [2, 3]
+
+
+def test_unfinished_without_scenario_ids():
+    # Games of a run without a scenario file, mixed with games of one
+    scenarios = make_scenarios(seed=1, lies=[0], guesses=[6], num_games=4)
+    games = [{"run_id": 1, "answer": "crate"}, {"scenario_id": 3}, {"run_id": 2, "completed": False}]
+    assert [s["id"] for s in unfinished(scenarios, games)] == [1, 2, 4]
+
+
+def test_benchmark_plays_the_scenarios():
+    scenarios = make_scenarios(seed=2, lies=[2], guesses=[7], num_games=4)
+    first = run_benchmark("entropy", "candidates", workers=1, scenarios=scenarios)
+    # Split in two, the same games as one run
+    halves = [run_benchmark("entropy", "candidates", workers=1, scenarios=shard(scenarios, i, 2))[(2, 7)]["games"]
+              for i in range(2)]
+    games = first[(2, 7)]["games"]
+    assert sorted(first) == [(2, 7)] and len(games) == 4
+    for game, scenario in zip(games, scenarios):
+        assert game["scenario_id"] == scenario["id"] and game["answer"] == scenario["answer"]
+        assert game["lie_indexes"] == scenario["lie_indexes"]
+    by_id = {game["scenario_id"]: game["tries"] for half in halves for game in half}
+    assert by_id == {game["scenario_id"]: game["tries"] for game in games}
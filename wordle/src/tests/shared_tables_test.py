@@ -0,0 +1,31 @@
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+import pytest
+
+from classes.SharedTables import SharedTables, attach_tables, shared_table
+
+
+def table_sum(specs: dict):
+    table = attach_tables(specs)["numbers"]
+    return int(table.sum()), table.flags.writeable
+
+
+def test_workers_read_the_shared_table():
+    numbers = np.arange(12, dtype=np.uint16).reshape(3, 4)
+    with SharedTables() as tables:
+        tables.publish("numbers", numbers)
+        (block_name, shape, dtype) = tables.specs["numbers"]
+        assert shape == (3, 4) and np.dtype(dtype) == np.uint16
+        with Pool(2) as pool:
+            assert pool.map(table_sum, [tables.specs] * 2) == [(66, False)] * 2
+        with pytest.raises(ValueError):
+            tables.publish("numbers", numbers)
+    # Freed with the with block
+    assert tables.specs == {}
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(block_name)
+
+
+def test_not_attached():
+    assert shared_table("missing") is None
@@ -0,0 +1,147 @@
+import random
+
+import numpy as np
+import pytest
+
+from assets.lexicon import GUESS_WORDS
+from benchmark import play_game
+from classes.Engine import Engine
+from classes.Feedback import Feedback
+from classes.Solver import Solver
+from utils.opening_book import MAX_LIES, load_opening_book
+from utils.patterns import code_to_feedback, pattern
+
+
+def play(solver: Solver, answer: str):
+    for tries in range(1, 20):
+        guess = solver.get_guess()
+        if guess.upper() == answer.upper():
+            return tries
+        solver.update_guesses(guess.upper(), code_to_feedback(pattern(guess, answer)))
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError):
+        Solver("greedy")
+
+
+@pytest.mark.parametrize("guess_pool", ["candidates", "all"])
+def test_entropy_strategy(guess_pool):
+    for answer in ["crate", "mamma", "jazzy", "eerie"]:
+        assert play(Solver("entropy", guess_pool), answer) <= 6
+
+
+def test_opening_book():
+    book = load_opening_book()
+    assert sorted(book) == list(range(MAX_LIES + 1))
+    for num_lies in range(MAX_LIES + 1):
+        solver = Solver("entropy", num_lies=num_lies)
+        first = solver.get_guess()
+        assert first == book[num_lies]["first"]
+        feedback = code_to_feedback(pattern(first, "crate"))
+        solver.update_guesses(first.upper(), feedback)
+        if num_lies == 0:
+            assert solver.get_guess() == book[0]["second"][str(pattern(first, "crate"))]
+
+
+def test_tree_strategy():
+    solver = Solver("tree")
+    assert solver.get_guess() == "salet"
+    for answer in ["crate", "mamma", "jazzy", "eerie"]:
+        solver.reset()
+        assert play(solver, answer) <= 5
+
+
+def test_tree_strategy_off_tree():
+    # A guess the tree did not make falls back to entropy
+    solver = Solver("tree")
+    solver.update_guesses("CRANE", code_to_feedback(pattern("crane", "mamma")))
+    assert solver.tree_node is None
+    assert play(solver, "mamma") <= 6
+
+
+def test_lies_keep_answer():
+    # One lie in every row, at position 0
+    solver = Solver("entropy", "candidates", num_lies=1)
+    for guess in ["arise", "could", "nymph"]:
+        feedback = code_to_feedback(pattern(guess, "mamma"))
+        feedback[0] = Feedback.present if feedback[0] != Feedback.present else Feedback.correct
+        solver.update_guesses(guess.upper(), feedback)
+        assert "mamma" in solver.possible_guesses
+    assert solver.num_possible_guesses() < 100
+
+
+def test_snapshot_restore():
+    solver = Solver("entropy")
+    solver.update_guesses("ARISE", code_to_feedback(pattern("arise", "crate")))
+    snapshot = solver.snapshot()
+    remaining = solver.possible_guesses
+    # Branch on a guess, then go back
+    solver.update_guesses("COUNT", code_to_feedback(pattern("count", "crate")))
+    assert solver.num_possible_guesses() < len(remaining)
+    solver.restore(snapshot)
+    assert solver.possible_guesses == remaining
+    assert "crate" in remaining
+
+
+def test_reset_keeps_word_list():
+    from assets.lexicon import GUESS_WORDS
+    size = len(GUESS_WORDS)
+    solver = Solver()
+    solver.update_guesses("ARISE", code_to_feedback(pattern("arise", "crate")))
+    solver.reset()
+    assert len(GUESS_WORDS) == size
+    assert solver.num_possible_guesses() == size
+
+
+@pytest.mark.parametrize("guess_pool", ["candidates", "all"])
+@pytest.mark.parametrize("lookahead", [False, True])
+def test_minimax_strategy(guess_pool, lookahead):
+    for answer in ["crate", "mamma", "jazzy", "eerie"]:
+        assert play(Solver("minimax", guess_pool, lookahead=lookahead), answer) <= 6
+
+
+def test_minimax_guess_minimizes_worst_bucket():
+    from utils.patterns import answer_indexes, guess_indexes, worst_buckets
+    solver = Solver("minimax", "all")
+    solver.update_guesses("SOARE", code_to_feedback(pattern("soare", "crate")))
+    answers = np.flatnonzero(solver.candidates)
+    worst = worst_buckets(answers)
+    assert worst[guess_indexes()[solver.get_guess().upper()]] == worst.min()
+    assert answer_indexes()["CRATE"] in answers
+
+
+def test_minimax_last_guess_can_win():
+    # With one guess left a word that can't be the answer is never worth it
+    solver = Solver("minimax", "all", num_lies=2, num_guesses=2)
+    solver.update_guesses("ARISE", code_to_feedback(pattern("arise", "crate")))
+    assert solver.guesses_left() == 1
+    assert solver.get_guess() in solver.possible_guesses
+
+
+def test_minimax_beats_random_with_lies():
+    # The same seeded games for both, random draws its guesses from a seeded random too
+    engine = Engine(6, 2)
+    wins = {}
+    for strategy in ["random", "minimax"]:
+        solver = Solver(strategy, "all", 2, num_guesses=6)
+        wins[strategy] = 0
+        for i in range(30):
+            random.seed(i)
+            (game, _) = play_game(engine, solver, GUESS_WORDS[i * 37 % len(GUESS_WORDS)], i)
+            wins[strategy] += game["success"]
+    assert wins["minimax"] >= wins["random"], wins
+
+
+def test_next_state_branches():
+    solver = Solver("entropy")
+    solver.update_guesses("ARISE", code_to_feedback(pattern("arise", "crate")))
+    state = solver.state
+    assert state.answers.dtype == np.uint16 and not state.answers.flags.writeable
+    # Every feedback to one guess from the same state, the state is left as it is
+    branches = {answer: solver.next_state(state, "COUNT", code_to_feedback(pattern("count", answer)))
+                for answer in solver.possible_guesses}
+    assert solver.state is state and solver.possible_guesses == [GUESS_WORDS[i] for i in state.answers]
+    assert sum(branch.num_answers() for branch in branches.values()) > len(branches)
+    assert all(answer in [GUESS_WORDS[i] for i in branch.answers] for answer, branch in branches.items())
+    assert (solver.candidates.nonzero()[0] == state.answers).all()
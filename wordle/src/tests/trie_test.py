@@ -0,0 +1,38 @@
+from assets.lexicon import VALID_WORDS
+from classes.Constraints import Constraints
+from classes.Trie import word_trie
+from utils.patterns import code_to_feedback, pattern
+
+
+def test_is_prefix():
+    trie = word_trie(VALID_WORDS)
+    assert trie.is_prefix("") and trie.is_prefix("cra") and trie.is_prefix("CRATE")
+    assert not trie.is_prefix("crx") and not trie.is_prefix("crates") and not trie.is_prefix("c4")
+    assert all(trie.is_prefix(word) for word in VALID_WORDS[:500])
+
+
+def test_completions():
+    trie = word_trie(VALID_WORDS)
+    assert trie.completions("") == len(VALID_WORDS)
+    assert trie.completions("cr") == sum(word.startswith("cr") for word in VALID_WORDS)
+    assert sorted(VALID_WORDS[i] for i in trie.prefix_words("cra")) == \
+        sorted(word for word in VALID_WORDS if word.startswith("cra"))
+
+    constraints = Constraints()
+    constraints.update("CRANE", code_to_feedback(pattern("crane", "crate")))
+    assert trie.completions("cr", constraints) == \
+        sum(word.startswith("cr") and constraints.allows(word) for word in VALID_WORDS)
+    assert trie.completions("sl", constraints) == 0
+
+
+def test_snap():
+    trie = word_trie(VALID_WORDS)
+    assert trie.snap("My guess: CRANE") == "crane"
+    assert trie.snap("CRAMEE") == "crame"
+    assert trie.snap("crxte") == "crate"
+    assert trie.snap("cra").startswith("cra")
+    assert trie.snap("!!") is None
+
+    constraints = Constraints()
+    constraints.update("CRANE", code_to_feedback(pattern("crane", "crate")))
+    assert constraints.allows(trie.snap("cra", constraints))
@@ -0,0 +1,42 @@
+import random
+
+from assets.lexicon import GUESS_WORDS, VALID_WORDS
+from classes.Constraints import Constraints
+from classes.Solver import Solver
+from classes.WordIndex import word_index
+from utils.patterns import code_to_feedback, pattern
+
+
+def test_query():
+    index = word_index(VALID_WORDS)
+    bits = index.query(at={1: "R"}, contains="E", excludes="S")
+    expected = [w for w in VALID_WORDS if w[1] == "r" and "e" in w and "s" not in w]
+    assert [VALID_WORDS[i] for i in index.ids(bits)] == expected
+    assert index.count(bits) == len(expected)
+
+
+def test_query_counts_and_not_at():
+    index = word_index(GUESS_WORDS)
+    bits = index.query(not_at={0: "E", 4: "E"}, contains="EE")
+    expected = [w for w in GUESS_WORDS if w.count("e") >= 2 and w[0] != "e" and w[4] != "e"]
+    assert [GUESS_WORDS[i] for i in index.ids(bits)] == expected
+    assert index.has(bits, expected[0].upper()) and not index.has(bits, "xxxxx")
+
+
+def test_matching_same_as_constraints():
+    index = word_index(VALID_WORDS)
+    rng = random.Random(3)
+    for _ in range(50):
+        answer = rng.choice(GUESS_WORDS)
+        constraints = Constraints()
+        for guess in rng.sample(VALID_WORDS, 3):
+            constraints.update(guess, code_to_feedback(pattern(guess, answer)))
+        assert list(index.ids(index.matching(constraints))) == \
+            [i for i, w in enumerate(VALID_WORDS) if constraints.allows(w)]
+
+
+def test_reason_guess_allowed():
+    solver = Solver("random")
+    solver.update_guesses("CRANE", code_to_feedback(pattern("crane", "crate")))
+    assert solver.reason_guess("crate") == []
+    assert ("SBC", "S", "C") in solver.reason_guess("slate")
@@ -73,3 +73,18 @@ def test_word_delete_letter():
 
     # Sees that the char was deleted off the string.
     assert word_obj.guessed_word == "HAPP"
+
+
+def test_word_dead_prefix():
+    # Tests that letters no valid word continues are flagged
+    word_obj = Word("happy", [], 0)
+
+    for letter in "crxa":
+        word_obj.add_letter(letter)
+
+    assert [letter.dead for letter in word_obj.letters] == [False, False, True, True, False]
+
+    word_obj.delete_letter()
+    word_obj.delete_letter()
+
+    assert not any(letter.dead for letter in word_obj.letters)
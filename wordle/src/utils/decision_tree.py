@@ -0,0 +1,162 @@
+import argparse
+import json
+import os
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from assets.lexicon import GUESS_WORDS, VALID_WORDS
+from utils.patterns import ALL_CORRECT, guess_entropies, pattern, pattern_matrix, word_list_hash
+
+# Decision tree for Wordle with the default 6 guesses, built offline by build_tree()
+# A node is [guess, {pattern code: child node}] and a leaf is the answer itself,
+# Ex. ["salet", {"0": ["courd", {...}], "170": "sweet", ...}]
+# Pattern codes are from utils/patterns.py, the all correct pattern has no child
+TREE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "assets", "decision_tree.json")
+MAX_GUESSES = 6
+
+# Guesses tried at each node, by expected information, the deeper the fewer
+BEAM_WIDTHS = [24, 10, 6, 4, 3, 2]
+# Answers still possible that are also tried, they can win right away
+CANDIDATE_WIDTH = 2
+
+
+class Tree_Builder:
+    # Beam search over guesses minimizing the total number of guesses to solve every
+    # answer, no answer may take more than max_guesses
+    def __init__(self, max_guesses: int = MAX_GUESSES, widths: list[int] = BEAM_WIDTHS):
+        self.matrix = np.asarray(pattern_matrix())
+        self.max_guesses = max_guesses
+        self.widths = widths
+        self.guess_of_answer = np.array([VALID_WORDS.index(word) for word in GUESS_WORDS])
+        self.memo = {}
+        self.nodes = 0
+
+    def choices(self, answers: np.ndarray, depth: int):
+        scores = guess_entropies(answers)
+        width = self.widths[min(depth, len(self.widths) - 1)]
+        own = self.guess_of_answer[answers]
+        # The last guess left must be an answer
+        if depth == self.max_guesses - 1:
+            return own
+        choices = list(np.argsort(-scores, kind="stable")[:width])
+        for guess in own[np.argsort(-scores[own], kind="stable")[:CANDIDATE_WIDTH]]:
+            if guess not in choices: choices.append(guess)
+        return choices
+
+    def lower_bound(self, size: int):
+        # Total guesses of a node with size answers: one can be solved with the next
+        # guess, the others need at least two
+        return 2 * size - 1
+
+    def solve(self, answers: np.ndarray, depth: int = 0):
+        """! Best (total guesses, guess) for a sorted array of answer indexes, depth
+        guesses already made. Total is inf if some answer can not be solved in time
+        """
+        if depth >= self.max_guesses: return (float("inf"), None)
+        if len(answers) == 1: return (1, self.guess_of_answer[answers[0]])
+        if depth == self.max_guesses - 1: return (float("inf"), None)
+        if len(answers) == 2: return (3, self.guess_of_answer[answers[0]])
+        key = (answers.tobytes(), depth)
+        if key in self.memo: return self.memo[key]
+        self.nodes += 1
+
+        best = (float("inf"), None)
+        for guess in self.choices(answers, depth):
+            codes = self.matrix[answers, guess]
+            order = np.argsort(codes, kind="stable")
+            (patterns, starts) = np.unique(codes[order], return_index=True)
+            if len(patterns) == 1 and patterns[0] != ALL_CORRECT: continue  # Learns nothing
+            groups = np.split(answers[order], starts[1:])
+            # Bigger groups first, they decide whether the guess can beat the best
+            groups = sorted(((p, g) for p, g in zip(patterns, groups) if p != ALL_CORRECT), key=lambda x: -len(x[1]))
+            total = len(answers) + sum(self.lower_bound(len(g)) for _, g in groups)
+            for (_, group) in groups:
+                if total >= best[0]: break
+                total += self.solve(np.sort(group), depth + 1)[0] - self.lower_bound(len(group))
+            if total < best[0]:
+                best = (total, guess)
+                if total == self.lower_bound(len(answers)): break  # Can not be beaten
+        self.memo[key] = best
+        return best
+
+    def tree(self, answers: np.ndarray, depth: int = 0):
+        # The solved tree of a node, as described at the top of the file
+        if len(answers) == 1: return GUESS_WORDS[answers[0]]
+        (_, guess) = self.solve(answers, depth)
+        if guess is None: raise ValueError(f"No tree solves every answer in {self.max_guesses} guesses")
+        codes = self.matrix[answers, guess]
+        children = {}
+        for code in np.unique(codes):
+            if code == ALL_CORRECT: continue
+            children[str(int(code))] = self.tree(np.sort(answers[codes == code]), depth + 1)
+        return [VALID_WORDS[guess], children]
+
+
+def tree_stats(tree):
+    """! Guesses each answer takes when the tree is followed
+    @return  {number of guesses: number of answers}
+    """
+    stats = {}
+    for answer in GUESS_WORDS:
+        (node, tries) = (tree, 1)
+        while tree_guess(node) != answer:
+            node = tree_child(node, pattern(tree_guess(node), answer))
+            tries += 1
+        stats[tries] = stats.get(tries, 0) + 1
+    return stats
+
+
+def build_tree(max_guesses: int = MAX_GUESSES, widths: list[int] = BEAM_WIDTHS):
+    builder = Tree_Builder(max_guesses, widths)
+    answers = np.arange(len(GUESS_WORDS))
+    tree = builder.tree(answers)
+    return {"word_lists": word_list_hash(), "max_guesses": max_guesses, "tree": tree}
+
+
+def save_tree(data: dict, path: str = TREE_PATH):
+    with open(path, "w") as file:
+        json.dump(data, file, separators=(",", ":"))
+
+
+@lru_cache(maxsize=None)
+def load_tree(path: str = TREE_PATH):
+    """! The saved tree, or None if it is missing or was built for other word lists
+    """
+    if not os.path.exists(path): return None
+    with open(path) as file:
+        data = json.load(file)
+    if data.get("word_lists") != word_list_hash(): return None
+    return data["tree"]
+
+
+def tree_guess(node):
+    # The guess of a node, Ex. ["salet", {...}] -> "salet", "sweet" -> "sweet"
+    return node if isinstance(node, str) else node[0]
+
+
+def tree_child(node, code: int):
+    # The node after the feedback code to the node's guess, None if the tree has no such branch
+    if isinstance(node, str): return None
+    return node[1].get(str(code))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the Wordle decision tree used by the solver's tree strategy")
+    parser.add_argument("--output", default=TREE_PATH)
+    parser.add_argument("--widths", type=int, nargs="*", default=BEAM_WIDTHS,
+                        help="Guesses tried at each depth, more is slower but closer to optimal")
+    args = parser.parse_args()
+
+    start = time.time()
+    data = build_tree(widths=args.widths)
+    save_tree(data, args.output)
+    stats = tree_stats(data["tree"])
+    total = sum(n * count for n, count in stats.items())
+    print(f"Built in {time.time() - start:.0f}s, starts with {tree_guess(data['tree'])}")
+    print(f"Average guesses {total / len(GUESS_WORDS):.4f}, distribution {dict(sorted(stats.items()))}")
+
+
+if __name__ == "__main__":
+    main()
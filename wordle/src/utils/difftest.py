@@ -0,0 +1,115 @@
+import os
+import random
+import sys
+from collections import defaultdict
+
+from assets.lexicon import GUESS_WORDS, VALID_WORDS
+from classes.Feedback import Feedback
+
+# Code shared by the game projects lives in common/ at the root of the repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from common.difftest import fuzz, shrink
+
+# Fuzzes feedback implementations against the original Word.check_word rules, see common/difftest.py
+
+
+def reference_feedback(guess: str, answer: str, lie_indexes: list[int] | None = None):
+    """! Feedback by the original Word.check_word algorithm, kept as it was so the fast
+    engines (Engine.score_word, the pattern matrix, ...) are checked against independent rules
+    @param guess  The guessed word
+    @param answer  The word being guessed
+    @param lie_indexes  Positions where the shown feedback lies
+    @return  (shown feedback, internal feedback), as lists of Feedback
+    """
+    (guess, answer) = (guess.upper(), answer.upper())
+    lie_indexes = lie_indexes if lie_indexes is not None else []
+    shown: list[Feedback] = []
+    internal: list[Feedback] = []
+
+    # create frequency map of letters from user inputted word
+    freq_map = defaultdict(int)
+    for letter in answer:
+        freq_map[letter] += 1
+
+    # loop through all user inputted letters and set feedback accordingly
+    for i in range(len(answer)):
+        letter = guess[i]
+        internal_feedback: Feedback | None = None
+
+        if freq_map[letter] > 0:
+            # letter is in correct position
+            if letter == answer[i]:
+                internal_feedback = Feedback.correct
+                freq_map[letter] -= 1
+            else:
+                num_future_correct = 0
+
+                # check future positions for correctness to take precedence
+                for j in range(i + 1, len(answer)):
+                    future_letter = guess[j]
+
+                    if future_letter == answer[j] and future_letter == letter:
+                        num_future_correct += 1
+
+                if freq_map[letter] > num_future_correct:  # letter is present
+                    internal_feedback = Feedback.present
+                    freq_map[letter] -= 1
+                else:  # letter is present, but correct for every letter to the right of it -> show incorrect
+                    internal_feedback = Feedback.incorrect
+        else:
+            internal_feedback = Feedback.incorrect
+
+        if i in lie_indexes:
+            possible_feedbacks = [Feedback.incorrect,
+                                  Feedback.present, Feedback.correct]
+            possible_feedbacks.remove(internal_feedback)
+            temp_feedback = random.choice(possible_feedbacks)
+        else:
+            temp_feedback = internal_feedback
+
+        shown.append(temp_feedback)
+        internal.append(internal_feedback)
+    return (shown, internal)
+
+
+def feedback_generator(length: int = 10):
+    # Random cases [answer, guess, guess, ...] biased towards repeated letters:
+    # anagrams of the answer, guesses repeating the answer's letters and real words
+    def generate(rng: random.Random):
+        answer = rng.choice(GUESS_WORDS).upper()
+        case = [answer]
+        for _ in range(rng.randrange(1, length)):
+            roll = rng.random()
+            if roll < 0.3:
+                guess = "".join(rng.sample(answer, len(answer)))
+            elif roll < 0.6:
+                letters = rng.sample(answer, 2) + [chr(ord("A") + rng.randrange(26))]
+                guess = "".join(rng.choice(letters) for _ in answer)
+            elif roll < 0.65:
+                guess = answer
+            else:
+                guess = rng.choice(VALID_WORDS).upper()
+            case.append(guess)
+        return case
+    return generate
+
+
+def feedback_checker(candidate, reference=lambda guess, answer: reference_feedback(guess, answer)[1]):
+    # candidate(guess, answer) -> list of Feedback, compared with the true (internal) feedback
+    def check(case: list[str]):
+        answer = case[0]
+        for guess in case[1:]:
+            (expected, actual) = (reference(guess, answer), candidate(guess, answer))
+            if list(expected) != list(actual):
+                return f"{guess} / {answer}: reference {[f.value for f in expected]}, candidate {[f.value for f in actual]}"
+        return None
+    return check
+
+
+def shrink_guesses(case: list[str], fails):
+    # Shrinks the guesses of a case, keeping its answer
+    return [case[0]] + shrink(case[1:], lambda guesses: fails([case[0]] + guesses))
+
+
+def fuzz_feedback(candidate, budget: float = 5.0, seed: int | None = None):
+    return fuzz(feedback_generator(), feedback_checker(candidate), budget, seed, minimize=shrink_guesses)
@@ -0,0 +1,138 @@
+import argparse
+import json
+import os
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from assets.lexicon import GUESS_WORDS, VALID_WORDS
+from utils.patterns import (NUM_PATTERNS, difference_table, guess_entropies, guess_indexes, partition_counts,
+                            pattern_matrix, word_list_hash)
+
+# Best first guess, and best second guess for each feedback shown to the first, per number of lies
+# Ex. {"1": {"first": "...", "second": {"0": "...", "13": "...", ...}}, ...}
+# Guesses maximize the information in the feedback as shown, lies included. Lie positions are the
+# same in every row, so after the first row each answer can only have lied where its true
+# feedback differs from what was shown. The guess limit does not change these guesses, so one
+# entry serves every number of guesses
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "assets", "opening_book.json")
+MAX_LIES = 5
+# Second guesses with lies are picked from the guesses with the most information about the true feedback
+SECOND_POOL = 500
+
+
+def lie_table(lie_mask: int):
+    """! How each true pattern shows when the positions in lie_mask lie, each lie being one
+    of the two wrong values at random
+    @return  (243, 243) probability of each shown pattern (columns) for each true pattern (rows)
+    """
+    lies = bin(lie_mask).count("1")
+    return (difference_table() == lie_mask) / 2 ** lies
+
+
+def shown_entropies(groups: dict[int, np.ndarray], guesses: np.ndarray | None = None):
+    """! Expected information (bits) in the shown feedback of each guess
+    @param groups  {lie positions bitmask: answer indexes}, every (answer, lie positions) pair equally likely
+    @param guesses  Column indexes of pattern_matrix, None for all
+    @return  (G,) entropies
+    """
+    shown = 0
+    for lie_mask, answers in groups.items():
+        shown = shown + partition_counts(answers, guesses) @ lie_table(lie_mask)
+    total = shown.sum(axis=1, keepdims=True)
+    p = shown / np.maximum(total, 1e-12)
+    return -(p * np.log2(np.where(p > 0, p, 1))).sum(axis=1)
+
+
+def lie_masks(num_lies: int, length: int = 5):
+    # Every set of num_lies positions as a bitmask
+    return [mask for mask in range(1 << length) if bin(mask).count("1") == num_lies]
+
+
+def best_guess(scores: np.ndarray, answers: np.ndarray, guesses: np.ndarray | None = None):
+    # Highest score, a word that can still be the answer wins a tie
+    own = answer_guesses()[answers]
+    scores = scores.astype(float)
+    if guesses is None:
+        scores[own] += 1e-9
+        return VALID_WORDS[int(np.argmax(scores))]
+    scores[np.isin(guesses, own)] += 1e-9
+    return VALID_WORDS[int(guesses[int(np.argmax(scores))])]
+
+
+@lru_cache(maxsize=None)
+def answer_guesses():
+    return np.array([guess_indexes()[word.upper()] for word in GUESS_WORDS])
+
+
+def build_book(num_lies: int):
+    """! The opening of one number of lies
+    @return  {"first": word, "second": {shown pattern code: word}}
+    """
+    answers = np.arange(len(GUESS_WORDS))
+    if num_lies == 0:
+        first = best_guess(guess_entropies(answers), answers)
+    else:
+        # Before any feedback every set of lie positions is equally likely
+        groups = {mask: answers for mask in lie_masks(num_lies)}
+        first = best_guess(shown_entropies(groups), answers)
+
+    codes = np.asarray(pattern_matrix())[:, guess_indexes()[first.upper()]]
+    second = {}
+    for shown in range(NUM_PATTERNS):
+        if num_lies == 0:
+            group = answers[codes == shown]
+            if len(group) == 0: continue
+            choice = GUESS_WORDS[group[0]] if len(group) <= 2 else best_guess(guess_entropies(group), group)
+        else:
+            # Each answer has one set of lie positions that shows this pattern
+            masks = difference_table()[codes, shown]
+            possible = np.array([bin(mask).count("1") == num_lies for mask in range(32)])[masks]
+            group = answers[possible]
+            if len(group) == 0: continue
+            pool = np.argsort(-guess_entropies(group), kind="stable")[:SECOND_POOL]
+            pool = np.union1d(pool, answer_guesses()[group])
+            groups = {int(mask): group[masks[possible] == mask] for mask in np.unique(masks[possible])}
+            choice = best_guess(shown_entropies(groups, pool), group, pool)
+        second[str(shown)] = choice
+    return {"first": first, "second": second}
+
+
+def build_opening_book(max_lies: int = MAX_LIES):
+    books = {str(num_lies): build_book(num_lies) for num_lies in range(max_lies + 1)}
+    return {"word_lists": word_list_hash(), "books": books}
+
+
+def save_opening_book(data: dict, path: str = BOOK_PATH):
+    with open(path, "w") as file:
+        json.dump(data, file, separators=(",", ":"))
+
+
+@lru_cache(maxsize=None)
+def load_opening_book(path: str = BOOK_PATH):
+    """! {number of lies: opening}, empty if the book is missing or was built for other word lists
+    """
+    if not os.path.exists(path): return {}
+    with open(path) as file:
+        data = json.load(file)
+    if data.get("word_lists") != word_list_hash(): return {}
+    return {int(num_lies): book for num_lies, book in data["books"].items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the opening book the solver starts every game with")
+    parser.add_argument("--output", default=BOOK_PATH)
+    parser.add_argument("--max-lies", type=int, default=MAX_LIES)
+    args = parser.parse_args()
+
+    start = time.time()
+    data = build_opening_book(args.max_lies)
+    save_opening_book(data, args.output)
+    for num_lies, book in data["books"].items():
+        print(f"{num_lies} lies: opens with {book['first']}, {len(book['second'])} second guesses")
+    print(f"Built in {time.time() - start:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
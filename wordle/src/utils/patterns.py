@@ -0,0 +1,269 @@
+import hashlib
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from assets.lexicon import ASSETS_DIR, GUESS_WORDS, VALID_WORDS, Lexicon, lexicon
+from classes.Feedback import Feedback
+from classes.SharedTables import shared_table
+
+# Feedback patterns encoded in base 3, position i has weight 3 ** i
+# Ex. [correct, incorrect, present, incorrect, incorrect] -> 2 + 1 * 9 = 11
+FEEDBACK_CODES = {Feedback.incorrect: 0, Feedback.present: 1, Feedback.correct: 2}
+NUM_PATTERNS = 3 ** 5
+ALL_CORRECT = NUM_PATTERNS - 1
+
+# Patterns of every (answer, guess) pair are saved here, one file per version of the word lists
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "pattern_cache")
+
+
+def encode_words(words: list[str]):
+    """! Letters of each word as 0-25
+    @param words  Words of the same length
+    @return  (N, length) uint8 array
+    """
+    if isinstance(words, Lexicon): return np.asarray(words.letters)
+    return (np.array([list(word.upper().encode()) for word in words], dtype=np.uint8).reshape(len(words), -1)
+            - ord("A"))
+
+
+def feedback_to_code(feedback: list[Feedback]):
+    return sum(FEEDBACK_CODES[f] * 3 ** i for i, f in enumerate(feedback))
+
+
+def code_to_feedback(code: int, length: int = 5):
+    feedback = []
+    for _ in range(length):
+        feedback.append([Feedback.incorrect, Feedback.present, Feedback.correct][code % 3])
+        code //= 3
+    return feedback
+
+
+def pattern_dtype(length: int):
+    # Smallest type that holds every pattern code of a word length, uint16 from 6 letters
+    return np.uint8 if 3 ** length <= 256 else np.uint16
+
+
+def letter_counts(answers: np.ndarray):
+    # (N, 26) copies of each letter in each answer
+    counts = np.zeros((answers.shape[0], 26), dtype=np.int8)
+    for i in range(answers.shape[1]):
+        counts[np.arange(answers.shape[0]), answers[:, i]] += 1
+    return counts
+
+
+def score_guess(guess: np.ndarray, answers: np.ndarray, counts: np.ndarray | None = None):
+    """! Pattern of one guess against every answer, with the rules of Word.check_word:
+    correct letters first, then present letters left to right while the answer has unused copies
+    @param guess  (length,) uint8 letters, see encode_words
+    @param answers  (N, length) uint8 letter matrix
+    @param counts  letter_counts(answers), pass it in when scoring many guesses against the same answers
+    @return  (N,) pattern codes, uint8 up to 5 letters, see pattern_dtype
+    """
+    length = guess.shape[0]
+    if counts is None: counts = letter_counts(answers)
+    correct = answers == guess
+    same = guess[:, None] == guess[None, :]
+    # unused[n, i]: copies of guess letter i in answer n that are not matched in place
+    unused = counts[:, guess] - correct.astype(np.int8) @ same.astype(np.int8)
+    # earlier[n, i]: copies of guess letter i further left in the guess that are not
+    # in place, each one takes an unused copy first
+    before = same & np.tri(length, k=-1, dtype=bool)
+    earlier = (~correct).astype(np.int8) @ before.T.astype(np.int8)
+    present = ~correct & (earlier < unused)
+    dtype = pattern_dtype(length)
+    weights = (3 ** np.arange(length)).astype(dtype)
+    return ((2 * correct + present).astype(dtype) * weights).sum(axis=1, dtype=dtype)
+
+
+def word_list_hash(answers: list[str] = GUESS_WORDS, guesses: list[str] = VALID_WORDS):
+    # Changes whenever either word list changes, so stale caches are never read
+    digest = hashlib.sha1()
+    for words in (answers, guesses):
+        digest.update("\n".join(words).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def build_pattern_matrix(answers: list[str] = GUESS_WORDS, guesses: list[str] = VALID_WORDS):
+    """! Patterns of every guess against every answer, a guess at a time
+    @return  (len(answers), len(guesses)) array of pattern_dtype, Ex. matrix[answer index, guess index]
+    """
+    answer_letters = encode_words(answers)
+    counts = letter_counts(answer_letters)
+    # Filled a guess per row, then flipped so each answer's patterns are contiguous
+    matrix = np.empty((len(guesses), len(answers)), dtype=pattern_dtype(answer_letters.shape[1]))
+    for g, guess in enumerate(encode_words(guesses)):
+        matrix[g] = score_guess(guess, answer_letters, counts)
+    return np.ascontiguousarray(matrix.T)
+
+
+def load_pattern_matrix(cache_dir: str = CACHE_DIR, answers: list[str] = GUESS_WORDS, guesses: list[str] = VALID_WORDS):
+    """! The answers x guesses pattern matrix, built once per word list version and
+    memory mapped from cache_dir afterwards
+    @return  (len(answers), len(guesses)) array of pattern_dtype, Ex. matrix[answer index, guess index]
+    """
+    path = os.path.join(cache_dir, f"patterns-{word_list_hash(answers, guesses)}.npy")
+    if os.path.exists(path):
+        return np.load(path, mmap_mode="r")
+
+    matrix = build_pattern_matrix(answers, guesses)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Written under another name first so a half written file is never loaded
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as file:
+            np.save(file, matrix)
+        os.replace(temp_path, path)
+    except OSError:
+        # Read only install, keep the matrix in memory
+        return matrix
+    return np.load(path, mmap_mode="r")
+
+
+@lru_cache(maxsize=None)
+def pattern_matrix():
+    # GUESS_WORDS x VALID_WORDS, loaded once per process or read from shared memory in workers
+    shared = shared_table("patterns")
+    return shared if shared is not None else load_pattern_matrix()
+
+
+@lru_cache(maxsize=None)
+def pattern_table(length: int, source_dir: str = ASSETS_DIR, cache_dir: str = CACHE_DIR):
+    """! The pattern matrix of any word length, built and cached to disk on first use
+    @return  (answers, guesses) array of pattern_dtype(length), rows and columns follow
+             lexicon("guess_words", length) and lexicon("valid_words", length)
+    """
+    if length == 5 and source_dir == ASSETS_DIR and cache_dir == CACHE_DIR: return pattern_matrix()
+    answers = lexicon("guess_words", length, source_dir, cache_dir)
+    guesses = lexicon("valid_words", length, source_dir, cache_dir)
+    return load_pattern_matrix(cache_dir, answers, guesses)
+
+
+@lru_cache(maxsize=None)
+def answer_indexes():
+    return {word.upper(): i for i, word in enumerate(GUESS_WORDS)}
+
+
+@lru_cache(maxsize=None)
+def guess_indexes():
+    return {word.upper(): i for i, word in enumerate(VALID_WORDS)}
+
+
+@lru_cache(maxsize=None)
+def hamming_table():
+    # (243, 243) number of positions where two patterns differ
+    digits = (np.arange(NUM_PATTERNS)[:, None] // 3 ** np.arange(5)) % 3
+    return (digits[:, None, :] != digits[None, :, :]).sum(axis=2).astype(np.uint8)
+
+
+@lru_cache(maxsize=None)
+def difference_table():
+    # (243, 243) bitmask of the positions where two patterns differ, bit i for position i
+    digits = (np.arange(NUM_PATTERNS)[:, None] // 3 ** np.arange(5)) % 3
+    return ((digits[:, None, :] != digits[None, :, :]) * (1 << np.arange(5))).sum(axis=2).astype(np.uint8)
+
+
+def consistent_answers(answers: np.ndarray, guess: str, shown: int, num_lies: int = 0):
+    """! Which answers could have shown a pattern for a guess, when exactly num_lies
+    positions of every row of feedback lie (Fibble)
+    @param answers  Row indexes of pattern_matrix (GUESS_WORDS)
+    @param shown  Pattern code of the feedback shown
+    @return  bool array, True where the answer is still possible
+    """
+    codes = pattern_matrix()[answers, guess_indexes()[guess.upper()]]
+    return hamming_table()[codes, shown] == num_lies
+
+
+def pattern(guess: str, answer: str):
+    """! Pattern code of a guess against an answer, both must be in the word lists
+    @return  int 0-242
+    """
+    return int(pattern_matrix()[answer_indexes()[answer.upper()], guess_indexes()[guess.upper()]])
+
+
+def partition_counts(answers: np.ndarray, guesses: np.ndarray | None = None, block: int = 2048):
+    """! How many of the answers give each pattern, for every guess
+    @param answers  Row indexes of pattern_matrix (GUESS_WORDS)
+    @param guesses  Column indexes of pattern_matrix (VALID_WORDS), None for all
+    @return  (G, 243) counts
+    """
+    matrix = pattern_matrix()
+    # Only the columns asked for are copied
+    rows = matrix[answers] if guesses is None else matrix[np.ix_(answers, guesses)]
+    num_guesses = rows.shape[1]
+    counts = np.empty((num_guesses, NUM_PATTERNS), dtype=np.int32)
+    for start in range(0, num_guesses, block):
+        chunk = rows[:, start:start + block]
+        # Offset each guess's patterns so one bincount counts every column at once
+        offsets = np.arange(chunk.shape[1], dtype=np.int32) * NUM_PATTERNS
+        flat = (chunk.astype(np.int32) + offsets).ravel()
+        counts[start:start + chunk.shape[1]] = np.bincount(
+            flat, minlength=chunk.shape[1] * NUM_PATTERNS).reshape(-1, NUM_PATTERNS)
+    return counts
+
+
+@lru_cache(maxsize=None)
+def n_log_n(size: int):
+    # n * log2(n) for n = 0..size, looked up instead of computed per bucket
+    n = np.arange(size + 1)
+    return n * np.log2(np.maximum(n, 1))
+
+
+def entropies(counts: np.ndarray):
+    """! Expected information (bits) of each guess from its partition_counts
+    H = log2(N) - sum(n * log2(n)) / N
+    """
+    total = np.maximum(counts.sum(axis=1), 1)
+    return np.log2(total) - n_log_n(int(counts.max()))[counts].sum(axis=1) / total
+
+
+def guess_entropies(answers: np.ndarray, guesses: np.ndarray | None = None, block: int = 4096):
+    """! entropies(partition_counts(answers, guesses)) without building the (G, 243) counts,
+    only the non empty buckets are summed
+    """
+    matrix = pattern_matrix()
+    # Only the columns asked for are copied
+    rows = matrix[answers] if guesses is None else matrix[np.ix_(answers, guesses)]
+    total = max(len(answers), 1)
+    table = n_log_n(len(answers))
+    num_guesses = rows.shape[1]
+    if len(answers) < 64:
+        # Few answers: sorting (guess, pattern) keys beats clearing 243 buckets per guess
+        keys = np.sort((rows.T.astype(np.int32) + (np.arange(num_guesses, dtype=np.int32) * NUM_PATTERNS)[:, None]).ravel())
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        sizes = np.diff(np.r_[starts, keys.size])
+        sums = np.bincount(keys[starts] // NUM_PATTERNS, weights=table[sizes], minlength=num_guesses)
+        return np.log2(total) - sums / total
+
+    sums = np.empty(num_guesses)
+    for start in range(0, num_guesses, block):
+        chunk = rows[:, start:start + block]
+        offsets = np.arange(chunk.shape[1], dtype=np.int32) * NUM_PATTERNS
+        counts = np.bincount((chunk.astype(np.int32) + offsets).ravel(), minlength=chunk.shape[1] * NUM_PATTERNS)
+        buckets = np.flatnonzero(counts)
+        sums[start:start + chunk.shape[1]] = np.bincount(
+            buckets // NUM_PATTERNS, weights=table[counts[buckets]], minlength=chunk.shape[1])
+    return np.log2(total) - sums / total
+
+
+def bucket_sizes(answers: np.ndarray, guesses: np.ndarray | None = None, num_lies: int = 0):
+    """! How many of the answers stay possible after each feedback shown, for every guess
+    With lies an answer stays for every shown pattern num_lies positions away from its own
+    @param answers  Row indexes of pattern_matrix (GUESS_WORDS)
+    @param guesses  Column indexes of pattern_matrix (VALID_WORDS), None for all
+    @return  (G, 243) sizes, a guess that is the answer wins, so it is in no bucket
+    """
+    counts = partition_counts(answers, guesses)
+    counts[:, ALL_CORRECT] = 0
+    if num_lies == 0:
+        return counts
+    # float32 so the product runs on BLAS, exact for counts below 2 ** 24
+    near = (hamming_table() == num_lies).astype(np.float32)
+    return (counts.astype(np.float32) @ near).round().astype(np.int32)
+
+
+def worst_buckets(answers: np.ndarray, guesses: np.ndarray | None = None, num_lies: int = 0):
+    # Largest bucket_sizes of each guess, the answers left in the worst case
+    return bucket_sizes(answers, guesses, num_lies).max(axis=1)
@@ -0,0 +1,82 @@
+from functools import lru_cache
+
+import numpy as np
+
+from utils.opening_book import lie_masks, lie_table
+from utils.patterns import NUM_PATTERNS, difference_table, guess_indexes, pattern_matrix
+
+# The answer and the lie positions are unknown, the lie positions are the same in every row.
+# The posterior is a weight for every (answer, set of lie positions) pair, Ex. weights[a, m] is
+# P(answer = answers[a], lie positions = lie_masks(num_lies)[m] | feedback so far)
+
+
+@lru_cache(maxsize=None)
+def mask_array(num_lies: int):
+    # lie_masks as an array, the columns of the weights
+    return np.array(lie_masks(num_lies), dtype=np.uint8)
+
+
+@lru_cache(maxsize=None)
+def stacked_lie_tables(num_lies: int):
+    """! lie_table of every set of lie positions, one under the other
+    @return  (masks * 243, 243) float32, row m * 243 + true pattern, column shown pattern
+    """
+    return np.vstack([lie_table(int(mask)) for mask in mask_array(num_lies)]).astype(np.float32)
+
+
+def prior(num_answers: int, num_lies: int):
+    # Every answer and every set of lie positions equally likely, as the game picks them
+    masks = len(mask_array(num_lies))
+    return np.full((num_answers, masks), 1 / (num_answers * masks))
+
+
+def likelihood(codes: np.ndarray, shown: int, num_lies: int):
+    """! P(shown pattern | answer, lie positions) for a guess
+    @param codes  True pattern of the guess for each answer
+    @return  (answers, masks): each lying position shows one of its two wrong values, so a
+             pair whose lie positions are exactly where its pattern and the shown one differ
+             has likelihood 1 / 2 ** num_lies, any other pair 0
+    """
+    return (difference_table()[codes, shown][:, None] == mask_array(num_lies)) / 2 ** num_lies
+
+
+def update_posterior(answers: np.ndarray, weights: np.ndarray, guess: str, shown: int, num_lies: int):
+    """! Bayes' rule for one row of feedback
+    @param answers  Row indexes of pattern_matrix (GUESS_WORDS) with weight left
+    @param weights  (answers, masks) posterior so far
+    @return  (answers, weights) of the pairs that can still be true, weights summing to 1
+    """
+    codes = pattern_matrix()[answers, guess_indexes()[guess.upper()]]
+    weights = weights * likelihood(codes, shown, num_lies)
+    alive = weights.any(axis=1)
+    total = weights.sum()
+    if total == 0:
+        # Feedback no pair explains, not from this game
+        return (answers[:0], weights[:0])
+    return (answers[alive], weights[alive] / total)
+
+
+def shown_entropies(answers: np.ndarray, weights: np.ndarray, guesses: np.ndarray, num_lies: int,
+                    block: int = 512):
+    """! Entropy (bits) of the feedback each guess would show, under the posterior
+    The lies add the same num_lies bits to every guess, so the guess that maximizes this
+    minimizes the expected entropy of the posterior after it
+    @param guesses  Column indexes of pattern_matrix (VALID_WORDS)
+    @return  (G,) entropies
+    """
+    masks = weights.shape[1]
+    tables = stacked_lie_tables(num_lies)
+    matrix = pattern_matrix()
+    result = np.empty(len(guesses))
+    for start in range(0, len(guesses), block):
+        chunk = guesses[start:start + block]
+        rows = matrix[np.ix_(answers, chunk)].astype(np.int32)   # (A, G) true patterns
+        # Weight of every (guess, lie positions, true pattern) in one bincount
+        keys = (np.arange(len(chunk), dtype=np.int32)[None, :, None] * (masks * NUM_PATTERNS)
+                + np.arange(masks, dtype=np.int32)[None, None, :] * NUM_PATTERNS + rows[:, :, None])
+        true = np.bincount(keys.ravel(), weights=np.broadcast_to(weights[:, None, :], keys.shape).ravel(),
+                           minlength=len(chunk) * masks * NUM_PATTERNS)
+        p = true.reshape(len(chunk), masks * NUM_PATTERNS).astype(np.float32) @ tables
+        p /= np.maximum(p.sum(axis=1, keepdims=True), 1e-12)
+        result[start:start + len(chunk)] = -(p * np.log2(np.where(p > 0, p, 1))).sum(axis=1)
+    return result
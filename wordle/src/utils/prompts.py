@@ -2,7 +2,7 @@ from collections.abc import Iterable
 
 from openai.types.chat import ChatCompletionMessageParam
 
-from classes.LetterCell import Feedback
+from classes.Feedback import Feedback
 from constants import WORD_LENGTH
 
 default_prompt: ChatCompletionMessageParam = {
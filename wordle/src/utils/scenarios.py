@@ -0,0 +1,92 @@
+import argparse
+import json
+import random
+
+from assets.lexicon import GUESS_WORDS
+from utils.patterns import word_list_hash
+
+# A scenario fixes everything random about one game, so runs can be compared game by game,
+# split across machines and rerun in part. Ex.
+# {"id": 7, "answer": "crate", "lies": 2, "lie_indexes": [1, 4], "num_guesses": 6, "seed": 1234}
+# seed picks which wrong feedback each lie shows, the same scenario always plays the same game
+LIES = range(0, 6)
+GUESSES = range(6, 10)
+
+
+def make_scenarios(seed: int = 0, lies: list[int] = LIES, guesses: list[int] = GUESSES,
+                   num_games: int | None = None, length: int = 5):
+    """! Scenarios for every number of lies and guesses
+    @param seed  The same seed gives the same file
+    @param num_games  Answers drawn per variant, None for every answer in order
+    @return  list of scenario dicts, ids 1, 2, ... in order
+    """
+    rng = random.Random(seed)
+    scenarios = []
+    for num_lies in lies:
+        for num_guesses in guesses:
+            answers = list(GUESS_WORDS) if num_games is None else rng.sample(list(GUESS_WORDS), num_games)
+            for answer in answers:
+                scenarios.append({
+                    "id": len(scenarios) + 1,
+                    "answer": answer,
+                    "lies": num_lies,
+                    "lie_indexes": sorted(rng.sample(range(length), num_lies)),
+                    "num_guesses": num_guesses,
+                    "seed": rng.getrandbits(32),
+                })
+    return scenarios
+
+
+def save_scenarios(scenarios: list[dict], path: str, seed: int | None = None):
+    with open(path, "w") as file:
+        json.dump({"word_lists": word_list_hash(), "seed": seed, "scenarios": scenarios}, file, separators=(",", ":"))
+
+
+def load_scenarios(path: str):
+    """! The scenarios of a file saved by save_scenarios
+    @return  list of scenario dicts
+    """
+    with open(path) as file:
+        data = json.load(file)
+    if data.get("word_lists") != word_list_hash():
+        raise ValueError(f"{path} was made for other word lists")
+    for scenario in data["scenarios"]:
+        if len(scenario["lie_indexes"]) != scenario["lies"]:
+            raise ValueError(f"Scenario {scenario['id']} has {scenario['lies']} lies "
+                             f"but lie positions {scenario['lie_indexes']}")
+    return data["scenarios"]
+
+
+def shard(scenarios: list[dict], index: int, count: int):
+    # One of count equal parts, round robin so each part gets every variant
+    if not 0 <= index < count:
+        raise ValueError(f"Shard {index} does not exist out of {count}")
+    return scenarios[index::count]
+
+
+def unfinished(scenarios: list[dict], games: list[dict]):
+    """! The scenarios to rerun: missing from games or not played to the end
+    @param games  The "games" of earlier result files, games of runs without a scenario file
+                  have no "scenario_id" and are skipped
+    @return  list of scenario dicts
+    """
+    done = {game.get("scenario_id") for game in games if game.get("completed", True)} - {None}
+    return [scenario for scenario in scenarios if scenario["id"] not in done]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Make a scenario file for reproducible benchmarks")
+    parser.add_argument("output", help="Ex. benchmarks/scenarios/seed0.json")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--lies", type=int, nargs="*", default=list(LIES))
+    parser.add_argument("--guesses", type=int, nargs="*", default=list(GUESSES))
+    parser.add_argument("--games", type=int, default=None, help="Answers drawn per variant, every answer by default")
+    args = parser.parse_args()
+
+    scenarios = make_scenarios(args.seed, args.lies, args.guesses, args.games)
+    save_scenarios(scenarios, args.output, args.seed)
+    print(f"Saved {len(scenarios)} scenarios to {args.output}")
+
+
+if __name__ == "__main__":
+    main()